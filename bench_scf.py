@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Benchmark - Ukur performa SCF Parser v2 pada file SCF berukuran besar
+Bandingkan engine baru dengan implementasi lama (per byte)
+"""
+
+import gc
+import random
+import sys
+import time
+
+from scf_parser_v2 import SCFParserV2, scan_segments, segment_bounds, splice_chunks
+from scf_tm import TranslationMemory
+import scf_codec
+
+
+SAMPLE_LINES = [
+    "最初から始める",
+    "ロードする",
+    "ＣＧモード",
+    "サウンドモード",
+    "シーン回想",
+    "「おはよう、今日もいい天気だね」",
+    "彼女は静かに笑った。",
+]
+
+
+def print_header(text):
+    """Print header"""
+    print("\n" + "="*70)
+    print(f"  {text}")
+    print("="*70)
+
+
+def make_scf(size: int, seed: int = 0) -> bytes:
+    """
+    Buat data SCF sintetis: campuran opcode/binary noise dan
+    text Shift-JIS null-terminated, mirip isi SCN*.SCF
+    """
+    rng = random.Random(seed)
+    lines = [line.encode('shift_jis') + b'\x00' for line in SAMPLE_LINES]
+    noise = [0x00, 0x00, 0x00, 0x01, 0x02, 0x10, 0x20, 0x40, 0x81, 0x82, 0xff]
+    out = bytearray()
+
+    while len(out) < size:
+        if rng.random() < 0.5:
+            out += rng.choice(lines)
+        else:
+            out += bytes(rng.choice(noise) for _ in range(rng.randint(1, 16)))
+
+    return bytes(out[:size])
+
+
+def legacy_scan(data: bytes) -> list:
+    """Scanner lama dari SCFParserV2.parse (per byte, append ke bytearray)"""
+    result = []
+    i = 0
+
+    while i < len(data):
+        start = i
+        segment = bytearray()
+
+        while i < len(data) and data[i] != 0x00:
+            segment.append(data[i])
+            i += 1
+
+        if i < len(data) and data[i] == 0x00:
+            segment.append(0x00)
+            i += 1
+
+        if len(segment) > 1:
+            result.append((start, len(segment)))
+
+    return result
+
+
+def legacy_rebuild(data: bytes, segments: list, new_texts: list, encoding: str) -> bytes:
+    """Rebuild lama dari SCFParserV2.rebuild (del + insert per byte, mundur)"""
+    data = bytearray(data)
+
+    for i in range(min(len(segments), len(new_texts)) - 1, -1, -1):
+        seg = segments[i]
+        new_bytes = new_texts[i].encode(encoding) + b'\x00'
+
+        offset = seg['offset']
+        del data[offset:offset + seg['length']]
+
+        for j, byte in enumerate(new_bytes):
+            data.insert(offset + j, byte)
+
+    return bytes(data)
+
+
+def timed(func, *args, repeat: int = 3):
+    """Jalankan func beberapa kali dan return (hasil, detik terbaik)"""
+    best = float('inf')
+
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func(*args)
+        best = min(best, time.perf_counter() - start)
+
+    return result, best
+
+
+def bench_scan(data: bytes, min_speedup: float) -> bool:
+    """Benchmark scanner segment: lama vs scan_segments()"""
+    print_header(f"Segment scanner ({len(data) // 1024}KB)")
+
+    old, old_time = timed(legacy_scan, data)
+    # Scan baru cuma ~0.1s, lebih sensitif ke noise (page fault, scheduler):
+    # ambil waktu terbaik dari lebih banyak run
+    (offsets, lengths), new_time = timed(scan_segments, data, repeat=9)
+    new = list(zip(offsets, lengths))
+
+    if old != new:
+        print("  ❌ Output berbeda dengan scanner lama!")
+        return False
+
+    speedup = old_time / new_time if new_time else float('inf')
+    print(f"  Segments: {len(new)}")
+    print(f"  Lama:     {old_time:.3f}s")
+    print(f"  Baru:     {new_time:.3f}s")
+    print(f"  Speedup:  {speedup:.1f}x")
+
+    if speedup < min_speedup:
+        print(f"  ❌ Speedup di bawah target ({min_speedup:.0f}x)")
+        return False
+
+    print(f"  ✅ Offsets dan lengths identik")
+    return True
+
+
+def bench_rebuild(data: bytes) -> bool:
+    """Benchmark rebuild: insert per byte lama vs splice_chunks()"""
+    scf = SCFParserV2()
+    segments = list(scf.iter_segments(data))
+    new_texts = [f"Baris terjemahan nomor {i}" for i in range(len(segments))]
+
+    print_header(f"Rebuild ({len(data) // 1024}KB, {len(segments)} segments)")
+
+    def splice():
+        replacements = scf.encode_texts(segments, new_texts)
+        return b''.join(splice_chunks(data, *segment_bounds(segments), replacements))
+
+    old, old_time = timed(legacy_rebuild, data, segments, new_texts, scf.encoding, repeat=1)
+    new, new_time = timed(splice)
+
+    if old != new:
+        print("  ❌ Output berbeda dengan rebuild lama!")
+        return False
+
+    speedup = old_time / new_time if new_time else float('inf')
+    print(f"  Lama:     {old_time:.3f}s")
+    print(f"  Baru:     {new_time:.3f}s")
+    print(f"  Speedup:  {speedup:.1f}x")
+    print(f"  ✅ Output byte-identical")
+    return True
+
+
+def make_tm_lines(count: int, seed: int = 0, words: int = 200) -> list:
+    """
+    Baris sintetis dengan distribusi kata miring (Zipf) seperti text game:
+    sedikit kata/akhiran kana yang sangat sering muncul, banyak kata jarang
+    """
+    rng = random.Random(seed)
+    kana = [chr(code) for code in range(0x3041, 0x3094)]
+    kanji = [c for c in ''.join(SAMPLE_LINES) if '\u4e00' <= c <= '\u9fff']
+    kanji += [chr(0x4e00 + i) for i in range(300)]
+    pool = kana * 3 + kanji
+
+    vocabulary = [''.join(rng.choice(pool) for _ in range(rng.randint(1, 3))) for _ in range(words)]
+    weights = [1 / (rank + 1) for rank in range(words)]
+    endings = ['。', 'です。', 'ました。', '……', '！', '？', 'ね', 'よ']
+
+    return [''.join(rng.choices(vocabulary, weights, k=rng.randint(3, 10))) + rng.choice(endings)
+            for _ in range(count)]
+
+
+def bench_tm(pairs: int, seed: int = 0, queries: int = 2000) -> bool:
+    """Benchmark lookup translation memory (exact + fuzzy) per baris"""
+    rng = random.Random(seed)
+    tm = TranslationMemory()
+
+    for i, line in enumerate(make_tm_lines(pairs, seed)):
+        tm.add(line, f"Terjemahan {i}")
+
+    print_header(f"Translation memory ({len(tm)} pasangan)")
+
+    # Query = source yang sudah ada dengan satu karakter diganti
+    lines = [tm.sources[rng.randrange(len(tm))] for _ in range(queries)]
+    fuzzy_lines = [line[:3] + '。' + line[4:] for line in lines]
+
+    _, exact_time = timed(lambda: [tm.get(line) for line in lines])
+    found, fuzzy_time = timed(lambda: sum(bool(tm.fuzzy(line)) for line in fuzzy_lines))
+
+    print(f"  Exact:    {exact_time / queries * 1e6:.1f}µs/baris")
+    print(f"  Fuzzy:    {fuzzy_time / queries * 1e3:.3f}ms/baris ({found}/{queries} match)")
+
+    if fuzzy_time / queries >= 1e-3:
+        print(f"  ❌ Fuzzy lookup di atas 1ms/baris")
+        return False
+
+    print(f"  ✅ Lookup di bawah 1ms/baris")
+    return True
+
+
+def bench_codec(lines: int = 200000) -> bool:
+    """Benchmark encode per baris: shift_jis vs codec remap (scf_codec.py)"""
+    texts = (SAMPLE_LINES * (lines // len(SAMPLE_LINES) + 1))[:lines]
+    remapped = [f"Dia tersenyum \u2014 \u201chalo\u201d, caf\u00e9 {i}" for i in range(lines)]
+
+    print_header(f"Codec remap ({lines} baris)")
+
+    def encode_all(items, encoding):
+        return [text.encode(encoding) for text in items]
+
+    old, old_time = timed(encode_all, texts, 'shift_jis')
+    new, new_time = timed(encode_all, texts, scf_codec.DEFAULT_NAME)
+    _, remap_time = timed(encode_all, remapped, scf_codec.DEFAULT_NAME)
+
+    if old != new:
+        print("  ❌ Output berbeda dengan shift_jis!")
+        return False
+
+    print(f"  shift_jis:        {old_time:.3f}s")
+    print(f"  sjis_remap:       {new_time:.3f}s ({new_time / old_time:.2f}x)")
+    print(f"  sjis_remap remap: {remap_time:.3f}s (baris yang perlu diganti)")
+    print(f"  ✅ Output identik untuk text Shift-JIS")
+    return True
+
+
+def main():
+    """CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark SCF Parser v2')
+    parser.add_argument('--size', type=float, default=4,
+                        help='Ukuran SCF sintetis dalam MB (default: 4)')
+    parser.add_argument('--rebuild-size', type=float, default=256,
+                        help='Ukuran SCF untuk benchmark rebuild dalam KB (default: 256).'
+                             ' Rebuild lama kuadratik, jadi jangan terlalu besar')
+    parser.add_argument('--tm-size', type=int, default=200000,
+                        help='Jumlah pasangan translation memory (default: 200000)')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed')
+    parser.add_argument('--min-speedup', type=float, default=10,
+                        help='Minimal speedup yang diharapkan (default: 10)')
+
+    args = parser.parse_args()
+
+    data = make_scf(int(args.size * 1024 * 1024), args.seed)
+
+    results = [
+        bench_scan(data, args.min_speedup),
+        bench_rebuild(make_scf(int(args.rebuild_size * 1024), args.seed)),
+        bench_tm(args.tm_size, args.seed),
+        bench_codec(),
+    ]
+
+    return 0 if all(results) else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+SCF Cache - Cache hasil parse SCF di disk (content-addressed)
+
+Key = SHA-256 isi SCF + versi parser + encoding, jadi SCF yang tidak
+berubah antar run tidak perlu di-parse ulang. Entry disimpan sebagai
+.scfidx (lihat scf_index.py) dan dibuang dengan urutan LRU (mtime)
+jika total ukuran cache melebihi batas.
+"""
+
+import hashlib
+import os
+import struct
+from pathlib import Path
+
+import scf_index
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Saat penuh, evict sampai 90% max_bytes supaya scan directory tidak
+# terjadi lagi di setiap put berikutnya
+EVICT_RATIO = 0.9
+
+
+class ParseCache:
+    """Cache parse SCF di cache_dir dengan batas ukuran + LRU eviction"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.total_bytes = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.evict()  # Hitung total awal + terapkan batas ukuran baru jika max_bytes diubah
+
+    @staticmethod
+    def key(content_sha256: str, parser_version: str, encoding: str) -> str:
+        """Key cache dari hash isi SCF + versi parser + encoding"""
+        return hashlib.sha256(f"{content_sha256}:{parser_version}:{encoding}".encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}{scf_index.EXTENSION}"
+
+    def get(self, key: str):
+        """Return (offsets, lengths, texts) dari cache, atau None jika miss"""
+        path = self._path(key)
+
+        try:
+            with scf_index.SegmentIndex(str(path)) as index:
+                columns = index.columns()
+        except (OSError, ValueError, struct.error):
+            self.misses += 1
+            return None
+
+        os.utime(path)  # Tandai sebagai baru dipakai (LRU)
+        self.hits += 1
+        return columns
+
+    def put(self, key: str, parsed_data: dict):
+        """
+        Simpan hasil parse ke cache lalu evict entry lama jika perlu
+
+        Total ukuran cache diupdate per put, directory hanya di-scan saat
+        total melewati max_bytes.
+        """
+        path = self._path(key)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+
+        try:
+            old_size = path.stat().st_size
+        except OSError:
+            old_size = 0
+
+        scf_index.write_index(str(tmp_path), parsed_data)
+        size = tmp_path.stat().st_size
+        os.replace(tmp_path, path)
+
+        self.total_bytes += size - old_size
+        if self.total_bytes > self.max_bytes:
+            self.evict(int(self.max_bytes * EVICT_RATIO))
+
+    def evict(self, target: int = None):
+        """Hapus entry paling lama tidak dipakai sampai di bawah target (default max_bytes)"""
+        target = self.max_bytes if target is None else target
+        entries = []
+        total = 0
+
+        for path in self.cache_dir.glob(f"*{scf_index.EXTENSION}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                path.unlink()
+            except OSError:
+                continue
+            total -= size
+
+        self.total_bytes = total
+
+    def stats(self) -> str:
+        return f"{self.hits} hit, {self.misses} miss"
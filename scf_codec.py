@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+SCF Codec - Codec Shift-JIS dengan remap glyph untuk translation
+
+Karakter yang tidak ada di Shift-JIS (huruf beraksen, em dash, dll) membuat
+encode('shift_jis') gagal dan rebuild memakai text Jepang original. Codec
+'sjis_remap' mengganti karakter tersebut sebelum encode:
+
+- glyphs: karakter -> text pengganti (mis. 'é' -> 'e', '—' -> '―'),
+  dikompilasi sekali jadi tabel str.translate
+- code_points: karakter -> code point SJIS custom (mis. 'é' -> 0x8540
+  untuk font patch game), disimpan di encode map (dict char -> bytes)
+
+Text yang bisa di-encode codec base langsung di-encode di C, tabel
+translate hanya dipakai untuk text yang gagal (atau yang berisi karakter
+yang sengaja di-remap walaupun ada di codec base). Decode memetakan balik
+code point custom ke karakternya.
+
+Pakai: SCFParserV2(encoding='sjis_remap'), atau register() dengan
+konfigurasi sendiri (lihat load_config untuk format JSON).
+"""
+
+import codecs
+import json
+import re
+import unicodedata
+from typing import Dict
+
+
+DEFAULT_NAME = 'sjis_remap'
+
+# Pengganti default untuk tanda baca yang sering muncul di translation
+DEFAULT_GLYPHS = {
+    '\u2014': '\u2015',  # em dash -> horizontal bar (SJIS 0x815C)
+    '\u2013': '-',       # en dash
+    '\u2012': '-',       # figure dash
+    '\u00a0': ' ',       # no-break space
+    '\u00ab': '"',       # guillemet kiri
+    '\u00bb': '"',       # guillemet kanan
+    '\u201e': '"',       # low double quote
+    '\u2039': '<',
+    '\u203a': '>',
+    '\u2022': '\u30fb',  # bullet -> katakana middle dot
+    '\u20ac': 'EUR',
+}
+
+# Placeholder untuk karakter dengan code point custom: plane 15 (private
+# use), tidak pernah bisa di-encode codec SJIS jadi selalu masuk error handler
+PLACEHOLDER_BASE = 0xf0000
+
+# Huruf Latin beraksen yang diganti huruf dasarnya jika tidak ada di codec
+LATIN_RANGE = range(0x00c0, 0x0180)
+
+_codecs: Dict[str, codecs.CodecInfo] = {}
+_bases: Dict[str, str] = {}
+
+
+def _encodable(text: str, base: str) -> bool:
+    try:
+        text.encode(base)
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def strip_accents(char: str) -> str:
+    """'é' -> 'e' (NFKD tanpa combining mark), '' jika tidak ada huruf dasar"""
+    return ''.join(c for c in unicodedata.normalize('NFKD', char) if not unicodedata.combining(c))
+
+
+def default_glyphs(base: str = 'shift_jis') -> Dict[str, str]:
+    """Huruf beraksen + DEFAULT_GLYPHS yang tidak ada di codec base"""
+    glyphs = {}
+    for code in LATIN_RANGE:
+        char = chr(code)
+        stripped = strip_accents(char)
+        if stripped and stripped != char and _encodable(stripped, base):
+            glyphs[char] = stripped
+    glyphs.update(DEFAULT_GLYPHS)
+    return {char: sub for char, sub in glyphs.items() if not _encodable(char, base)}
+
+
+class RemapCodec:
+    """Encode/decode codec base + tabel translate + encode map code point custom"""
+
+    def __init__(self, name: str, base: str = 'shift_jis', glyphs: Dict[str, str] = None,
+                 code_points: Dict[str, bytes] = None):
+        self.name = name
+        self.base = codecs.lookup(base)
+        glyphs = default_glyphs(base) if glyphs is None else glyphs
+        code_points = code_points or {}
+
+        for char, raw in code_points.items():
+            if len(char) != 1 or not 1 <= len(raw) <= 2:
+                raise ValueError(f"Code point tidak valid untuk {char!r}: {raw.hex()}")
+
+        # Karakter dengan code point custom di-translate ke placeholder,
+        # lalu error handler mengganti placeholder dengan byte dari encode map
+        table = dict(glyphs)
+        self.encode_map = {}
+        for i, (char, raw) in enumerate(code_points.items()):
+            placeholder = chr(PLACEHOLDER_BASE + i)
+            table[char] = placeholder
+            self.encode_map[placeholder] = raw
+
+        self.table = str.maketrans(table)
+        self.decode_map = {raw: char for char, raw in code_points.items()}
+
+        # Remap karakter yang sebenarnya bisa di-encode base: encode langsung
+        # tidak bisa dipakai, text dicek dulu dengan regex (C)
+        overrides = ''.join(c for c in table if _encodable(c, base))
+        self._needs_remap = re.compile('[' + re.escape(overrides) + ']').search if overrides else None
+
+        self._handlers = {}
+
+    def _handler(self, kind: str, errors: str) -> str:
+        """Nama error handler (dibuat sekali per kind + errors) untuk code point custom"""
+        key = (kind, errors)
+        name = self._handlers.get(key)
+        if name:
+            return name
+
+        fallback = codecs.lookup_error(errors)
+        encode_map = self.encode_map
+        decode_map = self.decode_map
+
+        def encode_error(err):
+            run = err.object[err.start:err.end]
+            if all(c in encode_map for c in run):
+                return b''.join(encode_map[c] for c in run), err.end
+            return fallback(err)
+
+        def decode_error(err):
+            pair = bytes(err.object[err.start:err.start + 2])
+            for raw in (pair, pair[:1]):
+                if raw in decode_map:
+                    return decode_map[raw], err.start + len(raw)
+            return fallback(err)
+
+        name = f"{self.name}.{kind}.{errors}"
+        codecs.register_error(name, encode_error if kind == 'encode' else decode_error)
+        self._handlers[key] = name
+        return name
+
+    def encode(self, text: str, errors: str = 'strict'):
+        if self._needs_remap is None or not self._needs_remap(text):
+            # Text tanpa override yang bisa di-encode base (kasus umum) tidak
+            # perlu translate. Gagal: karakter lain tetap lewat tabel glyph
+            try:
+                return self.base.encode(text)
+            except UnicodeEncodeError:
+                pass
+
+        text = text.translate(self.table)
+        if self.encode_map:
+            return self.base.encode(text, self._handler('encode', errors))
+        return self.base.encode(text, errors)
+
+    def decode(self, data, errors: str = 'strict'):
+        if self.decode_map:
+            return self.base.decode(data, self._handler('decode', errors))
+        return self.base.decode(data, errors)
+
+    def codec_info(self) -> codecs.CodecInfo:
+        return codecs.CodecInfo(self.encode, self.decode, name=self.name)
+
+
+def _search(name: str):
+    return _codecs.get(name.replace('-', '_'))
+
+
+codecs.register(_search)
+
+
+def register(name: str = DEFAULT_NAME, base: str = 'shift_jis', glyphs: Dict[str, str] = None,
+             code_points: Dict[str, bytes] = None) -> str:
+    """
+    Register (atau ganti) codec remap, return nama codec
+
+    Args:
+        glyphs: char -> text pengganti. None = default_glyphs(base)
+        code_points: char -> byte SJIS custom (1-2 byte)
+    """
+    name = name.lower().replace('-', '_')
+    codec = RemapCodec(name, base, glyphs, code_points)
+    _codecs[name] = codec.codec_info()
+    _bases[name] = codec.base.name
+
+    # codecs.lookup menyimpan cache per nama, jadi codec lama tidak boleh dipakai lagi
+    if hasattr(codecs, '_forget_codec'):
+        codecs._forget_codec(name)
+
+    return name
+
+
+def base_encoding(name: str) -> str:
+    """Codec base dari codec remap, None jika bukan codec remap"""
+    return _bases.get(name.replace('-', '_'))
+
+
+def load_config(path: str, name: str = DEFAULT_NAME) -> str:
+    """
+    Register codec dari file JSON, return nama codec
+
+    Format:
+        {
+          "base": "shift_jis",
+          "defaults": true,
+          "glyphs": {"ñ": "n", "—": "―"},
+          "code_points": {"é": "8540", "è": "8541"}
+        }
+
+    "defaults": false untuk tidak memakai default_glyphs(). Code point
+    ditulis hex (1-2 byte).
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+
+    base = config.get('base', 'shift_jis')
+    glyphs = default_glyphs(base) if config.get('defaults', True) else {}
+    glyphs.update(config.get('glyphs', {}))
+    code_points = {char: bytes.fromhex(raw) for char, raw in config.get('code_points', {}).items()}
+
+    return register(config.get('name', name), base, glyphs, code_points)
+
+
+register()
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+SCF Dedup - Tabel string unik lintas scene
+
+Banyak baris (nama karakter, pilihan menu, efek suara) muncul berulang di
+banyak scene. Stage ini dijalankan setelah batch-extract: semua text segment
+dikumpulkan jadi satu tabel string unik + referensi (scene, index segment),
+jadi translator cukup translate setiap string sekali. Saat rebuild, setiap
+translation di-encode sekali lalu byte-nya dipakai untuk semua referensi.
+
+File di dedup_dir:
+- strings.json : Tabel string unik + referensi (JANGAN EDIT!)
+- unique.txt   : Satu string unik per baris, untuk ditranslate
+                 (tab/newline di dalam string ditulis sebagai \\t / \\n, lihat scf_tm.escape)
+"""
+
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import scf_disasm
+import scf_index
+import scf_reloc
+from scf_parser_v2 import (PARSER_VERSION, SCFParserV2, find_index, segment_bounds,
+                           splice_chunks)
+from scf_tm import escape, unescape
+
+
+TABLE_VERSION = 1
+TABLE_JSON = 'strings.json'
+UNIQUE_TXT = 'unique.txt'
+
+
+def scene_names(parsed_dir: str) -> List[str]:
+    """Nama scene yang punya hasil parse di parsed_dir"""
+    return sorted({p.stem for p in Path(parsed_dir).iterdir()
+                   if p.suffix in ('.json', '.jsonl', scf_index.EXTENSION)})
+
+
+def build_table(parsed_dir: str) -> dict:
+    """
+    Kumpulkan text semua scene di parsed_dir jadi tabel string unik
+
+    Returns dict dengan 'scenes' (nama, hash SCF, jumlah segment) dan
+    'strings' (text + refs [index scene, index segment]), urut kemunculan
+    pertama.
+    """
+    scenes = []
+    strings = []
+    lookup = {}
+    encoding = None
+
+    for name in scene_names(parsed_dir):
+        parsed = SCFParserV2.load(find_index(parsed_dir, name))
+        segments = parsed['text_segments']
+
+        sha256 = parsed.get('sha256')
+        if sha256 is None:
+            # Schema lama tidak menyimpan hash, hitung dari original_data
+            sha256 = hashlib.sha256(SCFParserV2.load_original(parsed)).hexdigest()
+
+        if encoding is None:
+            encoding = parsed['encoding']
+        elif parsed['encoding'] != encoding:
+            raise ValueError(f"{name}: encoding {parsed['encoding']} berbeda dengan scene lain ({encoding})")
+
+        scene_no = len(scenes)
+        texts = segments.columns()[2] if isinstance(segments, scf_index.SegmentIndex) \
+            else [seg['text'] for seg in segments]
+
+        for seg_no, text in enumerate(texts):
+            string_no = lookup.get(text)
+            if string_no is None:
+                string_no = lookup[text] = len(strings)
+                strings.append({'text': text, 'refs': []})
+            strings[string_no]['refs'].append([scene_no, seg_no])
+
+        scenes.append({'name': name, 'sha256': sha256, 'segments': len(texts)})
+
+        if isinstance(segments, scf_index.SegmentIndex):
+            segments.close()
+
+    return {
+        'version': TABLE_VERSION,
+        'parser_version': PARSER_VERSION,
+        'encoding': encoding or 'shift_jis',
+        'scenes': scenes,
+        'strings': strings
+    }
+
+
+def save_table(table: dict, dedup_dir: str):
+    """Tulis strings.json + unique.txt ke dedup_dir"""
+    os.makedirs(dedup_dir, exist_ok=True)
+
+    with open(os.path.join(dedup_dir, TABLE_JSON), 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+
+    # Escape supaya satu string unik = tepat satu baris
+    with open(os.path.join(dedup_dir, UNIQUE_TXT), 'w', encoding='utf-8', newline='') as f:
+        for entry in table['strings']:
+            f.write(escape(entry['text']) + '\n')
+
+
+def read_unique(txt_path: str) -> List[str]:
+    """Baca unique.txt (original atau translation), satu string per baris (unescaped)"""
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        return [unescape(line.rstrip('\n')) for line in f]
+
+
+def load_table(dedup_dir: str) -> dict:
+    """Load strings.json dari dedup_dir"""
+    with open(os.path.join(dedup_dir, TABLE_JSON), 'r', encoding='utf-8') as f:
+        table = json.load(f)
+
+    if table.get('version') != TABLE_VERSION:
+        raise ValueError(f"Versi {TABLE_JSON} tidak didukung: {table.get('version')}")
+
+    return table
+
+
+def encode_unique(table: dict, new_texts: List[str]) -> List[Dict[int, bytes]]:
+    """
+    Encode setiap translation unik sekali, lalu sebar ke semua referensinya
+
+    String yang tidak berubah atau gagal di-encode tidak dimasukkan
+    (byte original dipakai). Returns per scene: {index segment: byte + null}.
+
+    Jumlah text harus sama persis dengan tabel: satu baris yang hilang atau
+    lebih akan menggeser semua translation setelahnya ke string lain.
+    """
+    strings = table['strings']
+    encoding = table['encoding']
+
+    if len(new_texts) != len(strings):
+        raise ValueError(f"Jumlah baris {len(new_texts)} != jumlah string unik {len(strings)} di {TABLE_JSON}")
+
+    replacements = [{} for _ in table['scenes']]
+
+    for entry, new_text in zip(strings, new_texts):
+        if new_text == entry['text']:
+            continue
+
+        try:
+            new_bytes = new_text.encode(encoding) + b'\x00'
+        except Exception as e:
+            print(f"❌ Error encoding {entry['text']!r} ({len(entry['refs'])} refs): {e}")
+            continue
+
+        for scene_no, seg_no in entry['refs']:
+            replacements[scene_no][seg_no] = new_bytes
+
+    return replacements
+
+
+def rebuild_scenes(table: dict, new_texts: List[str], scf_dir: str, output_dir: str,
+                   parsed_dir: str = None, relocate: bool = False, archive=None,
+                   spec=None) -> int:
+    """
+    Rebuild semua scene di tabel dari SCF original di scf_dir
+
+    Batas segment dibaca dari .scfidx di parsed_dir jika ada, fallback ke
+    scan ulang SCF original. relocate: patch pointer ke segment text yang
+    bergeser (lihat scf_reloc.py). archive: SDKArchive yang sudah open(),
+    SCF original dibaca dari archive (scf_dir tidak dipakai). spec:
+    OpcodeSpec (scf_disasm.py) untuk batas segment + relocation.
+
+    Returns:
+        Jumlah SCF yang ditulis
+    """
+    if table['parser_version'] != PARSER_VERSION:
+        print(f"⚠️  Warning: Tabel dibuat dengan parser {table['parser_version']}, "
+              f"sekarang {PARSER_VERSION}. Jalankan build ulang jika rebuild gagal")
+
+    scf = SCFParserV2(encoding=table['encoding'], spec=spec)
+    replacements = encode_unique(table, new_texts)
+
+    os.makedirs(output_dir, exist_ok=True)
+    rebuilt = 0
+
+    for scene, scene_replacements in zip(table['scenes'], replacements):
+        name = scene['name']
+        if archive:
+            if name not in archive.index:
+                print(f"⚠️  Warning: {name} tidak ada di archive, skip...")
+                continue
+            scf_source = archive.read_entry(name)
+        else:
+            scf_source = os.path.join(scf_dir, f"{name}.SCF")
+            if not os.path.exists(scf_source):
+                print(f"⚠️  Warning: {name}.SCF tidak ditemukan, skip...")
+                continue
+
+        index_path = None
+        if parsed_dir:
+            index_path = os.path.join(parsed_dir, f"{name}{scf_index.EXTENSION}")
+            if not os.path.exists(index_path):
+                index_path = None
+
+        parsed = scf.load_source(scf_source, index_path)
+        if parsed['sha256'] != scene['sha256']:
+            raise ValueError(f"SCF sumber berubah sejak tabel dibuat: {name}")
+
+        segments = parsed['text_segments']
+        if len(segments) != scene['segments']:
+            raise ValueError(f"{name}: jumlah segment {len(segments)} != {scene['segments']} di tabel")
+
+        print(f"🔨 {name} ({len(scene_replacements)} segment diganti)")
+
+        data = segments.buffer
+        offsets, lengths = segment_bounds(segments)
+        if relocate:
+            fields, targets = scf.relocations(data, segments, parsed['source'])
+            chunks = scf_reloc.splice_relocated(data, offsets, lengths, scene_replacements, fields, targets)
+        else:
+            chunks = splice_chunks(data, offsets, lengths, scene_replacements)
+
+        with open(os.path.join(output_dir, f"{name}.SCF"), 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+
+        rebuilt += 1
+
+    return rebuilt
+
+
+def main():
+    """CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='SCF Dedup - Tabel string unik lintas scene',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+1. Build tabel dari hasil batch-extract:
+   python scf_dedup.py build parsed_dir/ dedup_dir/
+
+2. Translate dedup_dir/unique.txt (satu string unik per baris)
+
+3. Rebuild semua scene:
+   python scf_dedup.py rebuild dedup_dir/ unique.txt scf_folder/ output_dir/ [--parsed-dir parsed_dir/]
+   python scf_dedup.py rebuild dedup_dir/ unique.txt - output_dir/ --archive scene.DSK scene.PFT
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    build_parser = subparsers.add_parser('build')
+    build_parser.add_argument('parsed_dir', help='Directory dengan JSON/JSONL/.scfidx hasil batch-extract')
+    build_parser.add_argument('dedup_dir', help='Output directory tabel')
+
+    rebuild_parser = subparsers.add_parser('rebuild')
+    rebuild_parser.add_argument('dedup_dir', help='Directory dengan strings.json')
+    rebuild_parser.add_argument('txt', help='unique.txt yang sudah ditranslate')
+    rebuild_parser.add_argument('scf_dir', help="Directory SCF original ('-' dengan --archive)")
+    rebuild_parser.add_argument('output_dir', help='Output directory untuk SCF')
+    rebuild_parser.add_argument('--parsed-dir', help='Directory .scfidx untuk batas segment (optional)')
+    rebuild_parser.add_argument('--relocate', action='store_true',
+                                help='Patch pointer uint32 ke segment text yang bergeser')
+    rebuild_parser.add_argument('--archive', nargs=2, metavar=('DSK', 'PFT'),
+                                help='Baca SCF original langsung dari archive (tanpa unpack)')
+    rebuild_parser.add_argument('--spec', help='Spec opcode JSON (scf_disasm.py) untuk segment + relocation')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    try:
+        if args.command == 'build':
+            table = build_table(args.parsed_dir)
+            save_table(table, args.dedup_dir)
+
+            total = sum(scene['segments'] for scene in table['scenes'])
+            unique = len(table['strings'])
+            saved = 100 * (1 - unique / total) if total else 0
+            print(f"📊 {len(table['scenes'])} scenes, {total} segments → {unique} string unik ({saved:.1f}% lebih sedikit)")
+            print(f"✅ Output: {os.path.join(args.dedup_dir, UNIQUE_TXT)}")
+
+        elif args.command == 'rebuild':
+            if not os.path.exists(args.txt):
+                raise FileNotFoundError(f"File tidak ditemukan: {args.txt}")
+            new_texts = read_unique(args.txt)
+
+            table = load_table(args.dedup_dir)
+            archive = None
+            if args.archive:
+                from sdk_tools import SDKArchive
+                archive = SDKArchive(*args.archive).open()
+            try:
+                spec = scf_disasm.OpcodeSpec.load(args.spec) if args.spec else None
+                rebuilt = rebuild_scenes(table, new_texts, args.scf_dir, args.output_dir, args.parsed_dir,
+                                         args.relocate, archive, spec)
+            finally:
+                if archive:
+                    archive.close()
+            print(f"\n✅ Rebuilt {rebuilt}/{len(table['scenes'])} files. Output: {args.output_dir}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+SCF Disasm - Disassembler SCF berbasis tabel opcode + index instruksi
+
+SCFParserV2 membaca SCF sebagai blob null-terminated dan menebak mana yang
+text. Disassembler ini mendecode script jadi stream instruksi (offset,
+opcode, panjang) memakai spec opcode dari JSON, jadi text, pilihan (choice)
+dan target jump bisa dicari lewat lookup di index, bukan heuristic.
+
+Format spec (JSON):
+    {
+      "opcode_size": 1,
+      "opcodes": {
+        "0x01": {"name": "msg",    "operands": ["u16", "cstr:text"]},
+        "0x02": {"name": "choice", "operands": ["u8", "cstr:choice"]},
+        "0x10": {"name": "jump",   "operands": ["u32:target"]}
+      }
+    }
+
+Tipe operand: u8, u16, u32, i8, i16, i32, bytes:N, cstr (null-terminated).
+Role (setelah ':'): text, choice (di-extract untuk translation) dan target
+(offset absolut u32 di SCF, di-relocate saat rebuild).
+
+Opcode SCF belum terdokumentasi, jadi tidak ada spec bawaan: spec default
+kosong dan seluruh byte jadi instruksi 'raw'. Byte yang tidak dikenal
+digabung jadi satu instruksi 'raw' sampai opcode dikenal berikutnya.
+
+Pakai: SCFParserV2(spec=OpcodeSpec.load(path)) atau --spec di
+scf_parser_v2.py / scf_dedup.py / workflow.py. Segment text diambil dari
+text_bounds() dan rebuild --relocate memakai relocations(). Index .scfdis
+di samping SCF (hasil command 'index') dipakai jika hash SCF + spec cocok.
+
+Index disimpan sebagai file .scfdis (little-endian):
+- Header 96 byte: magic, versi, jumlah instruksi, SHA-256 SCF, SHA-256 spec
+- offsets (uint32), spans (uint32, termasuk opcode), opcodes (uint16)
+"""
+
+import hashlib
+import json
+import mmap
+import re
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+
+MAGIC = b'SCFDIS\x00\x00'
+VERSION = 1
+EXTENSION = '.scfdis'
+
+# magic, version, opcode_size, count, scf sha256, spec sha256
+HEADER = struct.Struct('<8sHHI32s32s16x')
+
+# Opcode pseudo untuk run byte yang tidak dikenal
+RAW = 0xffff
+
+ROLES = ('text', 'choice', 'target')
+TEXT_ROLES = ('text', 'choice')
+
+_FIXED_TYPES = {
+    'u8': '<B', 'u16': '<H', 'u32': '<I',
+    'i8': '<b', 'i16': '<h', 'i32': '<i',
+}
+
+DEFAULT_SPEC = {'opcode_size': 1, 'opcodes': {}}
+
+
+class Operand:
+    """Satu operand hasil compile spec: tipe, role, ukuran (None = cstr)"""
+
+    __slots__ = ('kind', 'role', 'size', 'struct')
+
+    def __init__(self, text: str):
+        kind, _, role = text.partition(':')
+        self.role = role or None
+        self.struct = None
+
+        if role and role not in ROLES:
+            # 'bytes:N' memakai ':' untuk ukuran, bukan role
+            if kind == 'bytes' and role.isdigit():
+                self.role = None
+            else:
+                raise ValueError(f"Role operand tidak dikenal: {text}")
+
+        if kind in _FIXED_TYPES:
+            self.struct = struct.Struct(_FIXED_TYPES[kind])
+            self.size = self.struct.size
+        elif kind == 'bytes':
+            self.size = int(role)
+        elif kind == 'cstr':
+            self.size = None
+        else:
+            raise ValueError(f"Tipe operand tidak dikenal: {text}")
+
+        self.kind = kind
+        # Target adalah offset absolut di SCF (sama seperti scf_reloc.py)
+        if self.role == 'target' and kind != 'u32':
+            raise ValueError(f"Operand target harus u32: {text}")
+
+
+class OpcodeSpec:
+    """Tabel opcode hasil compile dari spec JSON"""
+
+    def __init__(self, spec: dict = None):
+        spec = spec or DEFAULT_SPEC
+        self.opcode_size = spec.get('opcode_size', 1)
+        if self.opcode_size not in (1, 2):
+            raise ValueError(f"opcode_size harus 1 atau 2: {self.opcode_size}")
+
+        self.sha256 = hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+        self.names: Dict[int, str] = {}
+        self.operands: Dict[int, Tuple[Operand, ...]] = {}
+        # Panjang instruksi tetap (opcode + operand), None jika ada cstr
+        self.fixed: Dict[int, int] = {}
+
+        for key, entry in spec.get('opcodes', {}).items():
+            opcode = int(key, 0)
+            if not 0 <= opcode < RAW:
+                raise ValueError(f"Opcode di luar range: {key}")
+            operands = tuple(Operand(text) for text in entry.get('operands', []))
+            self.names[opcode] = entry.get('name', f"op_{opcode:02x}")
+            self.operands[opcode] = operands
+            if all(op.size is not None for op in operands):
+                self.fixed[opcode] = self.opcode_size + sum(op.size for op in operands)
+
+        self.roles = {opcode: {op.role for op in ops if op.role} for opcode, ops in self.operands.items()}
+
+        # Lompat ke byte opcode dikenal berikutnya (untuk run 'raw')
+        if self.opcode_size == 1 and self.names:
+            first_bytes = bytes(sorted(self.names))
+            self._find_known = re.compile(b'[' + re.escape(first_bytes) + b']').search
+        else:
+            self._find_known = None
+
+    @classmethod
+    def load(cls, path: str) -> 'OpcodeSpec':
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f))
+
+    def read_opcode(self, data, pos: int) -> int:
+        if self.opcode_size == 1:
+            return data[pos]
+        return data[pos] | data[pos + 1] << 8
+
+
+class InstructionIndex:
+    """
+    Index instruksi: kolom offsets, spans, opcodes (array)
+
+    Operand tidak disimpan, di-decode saat diminta (operands(i)).
+    """
+
+    def __init__(self, data, spec: OpcodeSpec, offsets: array = None, spans: array = None,
+                 opcodes: array = None):
+        self.data = data
+        self.spec = spec
+        self.offsets = offsets if offsets is not None else array('I')
+        self.spans = spans if spans is not None else array('I')
+        self.opcodes = opcodes if opcodes is not None else array('H')
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def name(self, i: int) -> str:
+        opcode = self.opcodes[i]
+        return 'raw' if opcode == RAW else self.spec.names[opcode]
+
+    def operands(self, i: int) -> List[tuple]:
+        """Decode operand instruksi ke-i: list (operand, posisi, nilai)"""
+        opcode = self.opcodes[i]
+        if opcode == RAW:
+            return []
+
+        view = memoryview(self.data)
+        pos = self.offsets[i] + self.spec.opcode_size
+        result = []
+
+        for op in self.spec.operands[opcode]:
+            if op.struct:
+                value = op.struct.unpack_from(view, pos)[0]
+                size = op.size
+            elif op.size is not None:
+                value = bytes(view[pos:pos + op.size])
+                size = op.size
+            else:
+                end = self.data.index(b'\x00', pos)
+                value = bytes(view[pos:end])
+                size = end - pos + 1
+            result.append((op, pos, value))
+            pos += size
+
+        return result
+
+    def find(self, role: str) -> Iterator[int]:
+        """Index instruksi yang punya operand dengan role tertentu"""
+        wanted = {opcode for opcode, roles in self.spec.roles.items() if role in roles}
+        return (i for i, opcode in enumerate(self.opcodes) if opcode in wanted)
+
+    def text_bounds(self, roles=TEXT_ROLES) -> Tuple[array, array]:
+        """(offsets, lengths) operand text, length termasuk null (seperti segment)"""
+        wanted = {opcode for opcode, r in self.spec.roles.items() if r & set(roles)}
+        offsets = array('I')
+        lengths = array('I')
+
+        for i, opcode in enumerate(self.opcodes):
+            if opcode not in wanted:
+                continue
+            for op, pos, value in self.operands(i):
+                if op.role in roles:
+                    offsets.append(pos)
+                    lengths.append(len(value) + 1)
+
+        return offsets, lengths
+
+    def relocations(self) -> Tuple[array, array]:
+        """(fields, targets) dari operand 'target', urut posisi (lihat scf_reloc.py)"""
+        fields = array('I')
+        targets = array('I')
+
+        for i in self.find('target'):
+            for op, pos, value in self.operands(i):
+                if op.role == 'target':
+                    fields.append(pos)
+                    targets.append(value)
+
+        return fields, targets
+
+
+def disassemble(data, spec: OpcodeSpec) -> InstructionIndex:
+    """
+    Linear sweep: decode instruksi dari awal sampai akhir data
+
+    Opcode yang tidak dikenal (atau instruksi terpotong di akhir file)
+    jadi bagian dari run 'raw' sampai opcode dikenal berikutnya.
+    """
+    if not isinstance(data, bytes):
+        # memoryview (mis. entry mmap dari DSK) tidak punya find/index
+        data = bytes(data)
+    
+    index = InstructionIndex(data, spec)
+    offsets, spans, opcodes = index.offsets, index.spans, index.opcodes
+    fixed = spec.fixed
+    operand_table = spec.operands
+    find_known = spec._find_known
+    size = len(data)
+    pos = 0
+    raw_start = None
+
+    while pos < size:
+        length = None
+        if pos + spec.opcode_size <= size:
+            opcode = spec.read_opcode(data, pos)
+            length = fixed.get(opcode)
+            if length is None and opcode in operand_table:
+                length = _variable_length(data, pos, spec.opcode_size, operand_table[opcode])
+
+        if length is None or pos + length > size:
+            # Byte tidak dikenal: mulai/lanjutkan run raw
+            if raw_start is None:
+                raw_start = pos
+            if find_known:
+                match = find_known(data, pos + 1)
+                pos = match.start() if match else size
+            else:
+                pos += 1
+            continue
+
+        if raw_start is not None:
+            offsets.append(raw_start)
+            spans.append(pos - raw_start)
+            opcodes.append(RAW)
+            raw_start = None
+
+        offsets.append(pos)
+        spans.append(length)
+        opcodes.append(opcode)
+        pos += length
+
+    if raw_start is not None:
+        offsets.append(raw_start)
+        spans.append(size - raw_start)
+        opcodes.append(RAW)
+
+    return index
+
+
+def _variable_length(data, pos: int, opcode_size: int, operands) -> int:
+    """Panjang instruksi dengan operand cstr, None jika cstr tidak berakhir"""
+    cursor = pos + opcode_size
+    for op in operands:
+        if op.size is not None:
+            cursor += op.size
+            continue
+        end = data.find(b'\x00', cursor)
+        if end < 0:
+            return None
+        cursor = end + 1
+    return cursor - pos
+
+
+def write_index(path: str, index: InstructionIndex):
+    """Simpan index instruksi sebagai .scfdis"""
+    header = HEADER.pack(
+        MAGIC, VERSION, index.spec.opcode_size, len(index),
+        hashlib.sha256(index.data).digest(),
+        bytes.fromhex(index.spec.sha256)
+    )
+
+    columns = [array('I', index.offsets), array('I', index.spans), array('H', index.opcodes)]
+    if sys.byteorder == 'big':
+        for column in columns:
+            column.byteswap()
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        for column in columns:
+            column.tofile(f)
+
+
+def read_index(path: str, data, spec: OpcodeSpec) -> InstructionIndex:
+    """
+    Load .scfdis untuk data + spec ini
+
+    ValueError jika index dibuat dari SCF atau spec yang berbeda.
+    """
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        magic, version, opcode_size, count, scf_digest, spec_digest = HEADER.unpack_from(mm, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"Bukan file {EXTENSION}: {path}")
+        if version != VERSION:
+            raise ValueError(f"Versi {EXTENSION} tidak didukung: {version}")
+        if scf_digest != hashlib.sha256(data).digest():
+            raise ValueError(f"Index {path} bukan untuk SCF ini (hash berbeda)")
+        if spec_digest.hex() != spec.sha256:
+            raise ValueError(f"Index {path} dibuat dengan spec opcode lain")
+
+        pos = HEADER.size
+        columns = []
+        for typecode in ('I', 'I', 'H'):
+            column = array(typecode)
+            end = pos + count * column.itemsize
+            column.frombytes(mm[pos:end])
+            if sys.byteorder == 'big':
+                column.byteswap()
+            columns.append(column)
+            pos = end
+
+    return InstructionIndex(data, spec, *columns)
+
+
+def load_index(data, spec: OpcodeSpec, path: str = None) -> InstructionIndex:
+    """Index dari .scfdis di path jika cocok dengan data + spec, selain itu disassemble()"""
+    if path:
+        try:
+            return read_index(path, data, spec)
+        except (OSError, ValueError, struct.error):
+            pass
+    return disassemble(data, spec)
+
+
+def main():
+    """CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='SCF Disasm - Disassembler SCF berbasis tabel opcode',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+   python scf_disasm.py index input.SCF --spec opcodes.json        (tulis input.scfdis)
+   python scf_disasm.py list input.SCF --spec opcodes.json [--limit 50]
+   python scf_disasm.py texts input.SCF --spec opcodes.json
+        """
+    )
+
+    parser.add_argument('command', choices=['index', 'list', 'texts'])
+    parser.add_argument('scf', help='File SCF')
+    parser.add_argument('--spec', help='Spec opcode JSON (default: kosong, semua raw)')
+    parser.add_argument('--output', help=f'Output {EXTENSION} (default: <scf>{EXTENSION})')
+    parser.add_argument('--limit', type=int, default=50, help='Maksimal baris untuk list (default: 50)')
+    parser.add_argument('--encoding', default='shift_jis', help='Encoding text (default: shift_jis)')
+
+    args = parser.parse_args()
+
+    try:
+        spec = OpcodeSpec.load(args.spec) if args.spec else OpcodeSpec()
+        if not spec.names:
+            print("⚠️  Warning: Spec opcode kosong, semua byte jadi instruksi raw")
+
+        with open(args.scf, 'rb') as f:
+            data = f.read()
+
+        index_path = args.output or str(args.scf).rsplit('.', 1)[0] + EXTENSION
+        index = load_index(data, spec, index_path)
+
+        if args.command == 'index':
+            write_index(index_path, index)
+            raw = sum(1 for opcode in index.opcodes if opcode == RAW)
+            print(f"📋 {len(index)} instruksi ({raw} raw run)")
+            print(f"✅ Index: {index_path}")
+
+        elif args.command == 'list':
+            for i in range(min(len(index), args.limit)):
+                operands = ', '.join(
+                    f"{op.role + '=' if op.role else ''}{value!r}" for op, _, value in index.operands(i))
+                print(f"0x{index.offsets[i]:08x}  {index.name(i):<10} {operands}"
+                      if operands else f"0x{index.offsets[i]:08x}  {index.name(i):<10} ({index.spans[i]} byte)")
+
+        elif args.command == 'texts':
+            offsets, lengths = index.text_bounds()
+            for offset, length in zip(offsets, lengths):
+                text = data[offset:offset + length - 1].decode(args.encoding, 'replace')
+                print(f"0x{offset:08x}  {text}")
+            print(f"\n📋 {len(offsets)} text")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
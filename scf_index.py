@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+SCF Index - Sidecar index biner (.scfidx) untuk hasil parse SCF
+Bisa di-mmap dan lookup segment ke-N dalam O(1) tanpa parse JSON
+
+Format file (little-endian):
+- Header 64 byte: magic, versi, jumlah segment, ukuran SCF, panjang meta,
+  panjang text pool, SHA-256 SCF
+- Meta: path SCF sumber + encoding (UTF-8, dipisah null)
+- Records: (offset, length, text_offset) 3 x uint32 per segment
+- Text pool: semua text segment dalam UTF-8, berurutan
+"""
+
+import mmap
+import struct
+import sys
+from array import array
+from typing import Iterator, List, Tuple
+
+
+MAGIC = b'SCFIDX\x00\x00'
+VERSION = 1
+EXTENSION = '.scfidx'
+
+# magic, version, reserved, count, size, meta_len, pool_len, sha256
+HEADER = struct.Struct('<8sHHIIII32s4x')
+RECORD = struct.Struct('<III')
+
+
+def _align4(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def write_index(path: str, parsed_data: dict):
+    """Tulis hasil parse() (schema 3) sebagai file .scfidx"""
+    segments = parsed_data['text_segments']
+    meta = f"{parsed_data['source']}\x00{parsed_data['encoding']}".encode('utf-8')
+
+    records = bytearray(RECORD.size * len(segments))
+    pool = bytearray()
+
+    for i, seg in enumerate(segments):
+        RECORD.pack_into(records, i * RECORD.size, seg['offset'], seg['length'], len(pool))
+        pool += seg['text'].encode('utf-8')
+
+    header = HEADER.pack(
+        MAGIC, VERSION, 0,
+        len(segments),
+        parsed_data['size'],
+        len(meta),
+        len(pool),
+        bytes.fromhex(parsed_data['sha256'])
+    )
+
+    with open(path, 'wb') as f:
+        f.write(header)
+        f.write(meta.ljust(_align4(len(meta)), b'\x00'))
+        f.write(records)
+        f.write(pool)
+
+
+def is_index(path: str) -> bool:
+    """Check apakah file adalah .scfidx (dari magic, bukan extension)"""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+class SegmentIndex:
+    """
+    Reader .scfidx berbasis mmap
+
+    Bertingkah seperti list of dict segment ({'offset', 'length', 'text'}),
+    jadi bisa langsung dipakai sebagai 'text_segments' untuk rebuild().
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (magic, version, _, self.count, self.size,
+         meta_len, pool_len, digest) = HEADER.unpack_from(self._map, 0)
+
+        if magic != MAGIC:
+            raise ValueError(f"Bukan file {EXTENSION}: {path}")
+        if version != VERSION:
+            raise ValueError(f"Versi {EXTENSION} tidak didukung: {version}")
+
+        meta = self._map[HEADER.size:HEADER.size + meta_len].decode('utf-8')
+        self.source, self.encoding = meta.split('\x00')
+        self.sha256 = digest.hex()
+
+        self._records = HEADER.size + _align4(meta_len)
+        self._pool = self._records + self.count * RECORD.size
+        self._pool_end = self._pool + pool_len
+
+    def __len__(self) -> int:
+        return self.count
+
+    def record(self, i: int):
+        """Return (offset, length, text_offset) segment ke-i"""
+        if not 0 <= i < self.count:
+            raise IndexError(f"Segment index out of range: {i}")
+        return RECORD.unpack_from(self._map, self._records + i * RECORD.size)
+
+    def text(self, i: int) -> str:
+        """Decode text segment ke-i dari text pool"""
+        start = self._pool + self.record(i)[2]
+        if i + 1 < self.count:
+            end = self._pool + self.record(i + 1)[2]
+        else:
+            end = self._pool_end
+        return self._map[start:end].decode('utf-8')
+
+    def __getitem__(self, i: int) -> dict:
+        if i < 0:
+            i += self.count
+        offset, length, _ = self.record(i)
+        return {'offset': offset, 'length': length, 'text': self.text(i)}
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self.count):
+            yield self[i]
+
+    def _read_records(self) -> array:
+        records = array('I')
+        records.frombytes(self._map[self._records:self._pool])
+        if sys.byteorder == 'big':
+            records.byteswap()
+        return records
+
+    def bounds(self) -> Tuple[array, array]:
+        """Baca batas semua segment sekaligus: (offsets, lengths), tanpa text"""
+        records = self._read_records()
+        return records[0::3], records[1::3]
+
+    def columns(self) -> Tuple[array, array, List[str]]:
+        """Baca semua record sekaligus: (offsets, lengths, texts)"""
+        records = self._read_records()
+        offsets, lengths, text_offsets = records[0::3], records[1::3], records[2::3]
+
+        pool = self._map[self._pool:self._pool_end]
+        bounds = list(text_offsets) + [len(pool)]
+        texts = [pool[start:end].decode('utf-8') for start, end in zip(bounds, bounds[1:])]
+
+        return offsets, lengths, texts
+
+    def to_parsed(self) -> dict:
+        """Return struktur seperti SCFParserV2.parse() (schema 3)"""
+        return {
+            'schema': 3,
+            'source': self.source,
+            'sha256': self.sha256,
+            'size': self.size,
+            'encoding': self.encoding,
+            'text_segments': self
+        }
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -4,137 +4,899 @@ SCF Parser v2 - Improved parser untuk .SCF files
 Preserves complete binary structure untuk perfect rebuilds
 """
 
+import codecs
+import hashlib
+import io
 import json
+import mmap
 import os
+import re
+from array import array
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import accumulate, compress, repeat
+from operator import add
 from pathlib import Path
-from typing import List, Tuple
+from typing import Callable, Dict, Iterator, List, Tuple, Union
+
+import scf_codec  # Register codec 'sjis_remap'
+import scf_disasm
+import scf_index
+import scf_reloc
+from scf_tm import escape, unescape
+
+
+# Versi schema output parse(). Schema 3 tidak lagi menyimpan byte original
+# di JSON, cukup path SCF sumber + hash isinya.
+SCHEMA_VERSION = 3
+
+# Ukuran blok baca untuk mode streaming
+CHUNK_SIZE = 64 * 1024
+
+# Versi logic parse (scan + klasifikasi). Naikkan jika hasil parse berubah,
+# supaya entry lama di ParseCache tidak dipakai lagi.
+PARSER_VERSION = '2.3'
+
+# Mode rebuild: 'variable' (panjang text bebas) atau 'fixed' (panjang byte tetap)
+REBUILD_MODES = ('variable', 'fixed')
+FIXED_ALIGNS = ('left', 'center', 'right')
+FIXED_OVERFLOWS = ('truncate', 'error', 'keep')
+
+# Translation sparse: "segment ID<TAB>text" per baris, hanya segment yang diubah.
+# Backslash/tab/newline/CR di text di-escape (lihat scf_tm.escape)
+SPARSE_EXTENSION = '.tsv'
+
+# Source SCF di dalam archive: "<path DSK>|<path PFT>::<nama entry>"
+# (extract tanpa unpack, lihat archive_source)
+ARCHIVE_SEP = '::'
+ARCHIVE_INDEX_SEP = '|'
+
+NULL_BYTE = re.compile(b'\x00')
+
+
+# Codec keluarga Shift-JIS (double-byte) yang bisa diklasifikasi per byte
+SJIS_CODECS = {'shift_jis', 'cp932', 'shift_jis_2004', 'shift_jisx0213'}
+
+# Kelas pasangan (lead, trail) di tabel klasifikasi
+PAIR_INVALID = 0
+PAIR_VALID = 1
+PAIR_JAPANESE = 2
+
+
+def scan_segments(data: bytes) -> Tuple[array, array]:
+    """
+    Cari batas segment null-terminated dengan bulk split (bukan per byte)
+    
+    Returns (offsets, lengths) sebagai array('I') untuk setiap segment
+    yang berisi minimal satu byte non-null. `length` termasuk null
+    terminator, jadi isi text adalah data[offset:offset + length - 1].
+    
+    Catatan: segment terakhir tanpa null terminator tetap mengikuti
+    perilaku parser lama (byte terakhir tidak ikut dianggap text).
+    """
+    if not isinstance(data, bytes):
+        # memoryview (mis. entry mmap dari DSK) tidak punya split: copy satu entry
+        data = bytes(data)
+    
+    # Satu list per run (split), run kosong = null berturut-turut
+    parts = data.split(b'\x00')
+    tail = len(parts.pop())  # Sisa data setelah null terakhir
+    
+    # Run + null terminator, tanpa list perantara untuk panjang run
+    sizes = list(map(add, map(len, parts), repeat(1)))
+    
+    # accumulate/compress langsung ke array, part kosong (falsy) di-skip
+    offsets = array('I', compress(accumulate(sizes, initial=0), parts))
+    lengths = array('I', compress(sizes, parts))
+    tail_start = len(data) - tail
+    
+    if tail > 1:
+        offsets.append(tail_start)
+        lengths.append(tail)
+    
+    return offsets, lengths
+
+
+def has_japanese(text: str) -> bool:
+    """Check apakah text mengandung kana/kanji"""
+    return any('\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff' for c in text)
+
+
+@lru_cache(maxsize=None)
+def build_sjis_tables(encoding: str = 'shift_jis') -> Tuple[bytes, Tuple[bytes, ...]]:
+    """
+    Bangun tabel klasifikasi 256-entry untuk codec double-byte
+    
+    Returns (leads, pairs):
+    - leads[b] = 1 jika b adalah lead byte
+    - pairs[lead][trail] = PAIR_INVALID / PAIR_VALID / PAIR_JAPANESE
+    
+    Tabel dibangun dari codec itu sendiri, jadi hasilnya sama persis
+    dengan decode(errors='ignore') + has_japanese().
+    """
+    leads = bytearray(256)
+    empty = bytes(256)
+    pairs = [empty] * 256
+    
+    for lead in range(0x80, 0x100):
+        try:
+            bytes([lead]).decode(encoding)
+            continue  # Single byte char (mis. half-width kana)
+        except UnicodeDecodeError:
+            pass
+        
+        row = bytearray(256)
+        for trail in range(0x100):
+            try:
+                decoded = bytes([lead, trail]).decode(encoding)
+            except UnicodeDecodeError:
+                continue
+            row[trail] = PAIR_JAPANESE if has_japanese(decoded) else PAIR_VALID
+        
+        if any(row):
+            leads[lead] = 1
+            pairs[lead] = bytes(row)
+    
+    return bytes(leads), tuple(pairs)
+
+
+class SJISClassifier:
+    """
+    Deteksi text Jepang langsung dari byte Shift-JIS tanpa decode
+    
+    Meniru decoder: pasangan (lead, trail) yang valid dibaca 2 byte,
+    byte lain dibaca 1 byte. Segment dianggap Jepang jika ada pasangan
+    yang decode ke range kana/kanji.
+    """
+    
+    def __init__(self, encoding: str = 'shift_jis'):
+        self.encoding = encoding
+        self.leads, self.pairs = build_sjis_tables(encoding)
+        lead_bytes = bytes(b for b in range(256) if self.leads[b])
+        self._find_lead = re.compile(b'[' + re.escape(lead_bytes) + b']').search
+    
+    def __call__(self, content) -> bool:
+        """Return True jika content (bytes/memoryview) berisi text Jepang"""
+        pairs = self.pairs
+        find_lead = self._find_lead
+        last = len(content) - 1
+        
+        # Lompat langsung ke lead byte berikutnya, byte lain selalu 1 byte
+        match = find_lead(content)
+        while match:
+            i = match.start()
+            if i >= last:
+                return False
+            
+            kind = pairs[content[i]][content[i + 1]]
+            if kind == PAIR_JAPANESE:
+                return True
+            
+            match = find_lead(content, i + 2 if kind else i + 1)
+        
+        return False
+
+
+def decode_classifier(encoding: str) -> Callable:
+    """Classifier fallback untuk codec non Shift-JIS: decode lalu check"""
+    def classify(content) -> bool:
+        return has_japanese(str(content, encoding, 'ignore'))
+    return classify
+
+
+def default_classifier(encoding: str) -> Callable:
+    """Pilih classifier tercepat yang cocok dengan encoding"""
+    name = codecs.lookup(encoding).name.replace('-', '_')
+    if name in SJIS_CODECS:
+        return SJISClassifier(encoding)
+    
+    # Codec remap: klasifikasi pakai codec base, supaya batas segment sama
+    # persis dengan hasil extract memakai codec base
+    base = scf_codec.base_encoding(name)
+    if base and base.replace('-', '_') in SJIS_CODECS:
+        return SJISClassifier(base)
+    
+    return decode_classifier(encoding)
+
+
+class SegmentTable:
+    """
+    Tabel segment text berbasis kolom (pengganti list of dict)
+    
+    Offset dan length disimpan di array('I'), text di list, dan byte
+    original diambil sebagai memoryview slice dari buffer SCF (tanpa copy).
+    Indexing table[i] tetap return dict {'offset', 'length', 'text'}
+    supaya extract_texts() dan rebuild() tidak perlu tahu bedanya.
+    
+    Text yang masih None (parse lazy) di-decode saat pertama kali diakses
+    lalu di-cache.
+    """
+    
+    __slots__ = ('buffer', 'offsets', 'lengths', 'texts', 'encoding')
+    
+    def __init__(self, buffer=None, offsets: array = None, lengths: array = None,
+                 texts: List[str] = None, encoding: str = 'shift_jis'):
+        self.buffer = memoryview(buffer) if buffer is not None else None
+        self.offsets = offsets if offsets is not None else array('I')
+        self.lengths = lengths if lengths is not None else array('I')
+        self.texts = texts if texts is not None else [None] * len(self.offsets)
+        self.encoding = encoding
+    
+    def append(self, offset: int, length: int, text: str = None):
+        self.offsets.append(offset)
+        self.lengths.append(length)
+        self.texts.append(text)
+    
+    def raw(self, i: int) -> memoryview:
+        """Byte original segment ke-i (termasuk null terminator)"""
+        offset = self.offsets[i]
+        return self.buffer[offset:offset + self.lengths[i]]
+    
+    def text(self, i: int) -> str:
+        """Text segment ke-i, decode saat pertama diakses"""
+        text = self.texts[i]
+        if text is None:
+            offset = self.offsets[i]
+            content = self.buffer[offset:offset + self.lengths[i] - 1]  # Exclude null
+            text = self.texts[i] = str(content, self.encoding, 'ignore')
+        return text
+    
+    def __len__(self) -> int:
+        return len(self.offsets)
+    
+    def __getitem__(self, i: int) -> dict:
+        return {'offset': self.offsets[i], 'length': self.lengths[i], 'text': self.text(i)}
+    
+    def __iter__(self):
+        for i in range(len(self.offsets)):
+            yield self[i]
+
+
+def segment_bounds(segments) -> Tuple[array, array]:
+    """Ambil kolom (offsets, lengths) dari SegmentTable, SegmentIndex atau list of dict"""
+    if isinstance(segments, SegmentTable):
+        return segments.offsets, segments.lengths
+    if isinstance(segments, scf_index.SegmentIndex):
+        return segments.bounds()
+    return (array('I', [seg['offset'] for seg in segments]),
+            array('I', [seg['length'] for seg in segments]))
+
+
+def splice_chunks(data, offsets, lengths, replacements: Dict[int, bytes]) -> Iterator:
+    """
+    Rakit output rebuild dalam satu pass maju
+    
+    Yields potongan output secara berurutan: span original (memoryview,
+    tanpa copy) di antara segment yang diganti, lalu byte pengganti.
+    Cost sebanding dengan jumlah segment yang diganti, bukan ukuran file.
+    
+    Args:
+        data: Byte original SCF
+        offsets, lengths: Batas segment (urut berdasarkan offset)
+        replacements: {index segment: byte baru termasuk null terminator}
+    """
+    view = memoryview(data)
+    pos = 0
+    
+    for i in sorted(replacements):
+        offset = offsets[i]
+        if offset > pos:
+            yield view[pos:offset]
+        yield replacements[i]
+        pos = offset + lengths[i]
+    
+    if pos < len(view):
+        yield view[pos:]
+
+
+def _json_default(obj):
+    """json.dump hook: serialize SegmentTable/SegmentIndex sebagai list"""
+    if isinstance(obj, (SegmentTable, scf_index.SegmentIndex)):
+        return list(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
 
 
 class SCFParserV2:
     """Parser yang preserves complete binary structure"""
     
-    def __init__(self, encoding='shift_jis'):
+    def __init__(self, encoding='shift_jis', classify: Callable = None, cache=None,
+                 spec: 'scf_disasm.OpcodeSpec' = None):
+        """
+        Args:
+            encoding: Encoding text di SCF
+            classify: Optional hook classify(content) -> bool untuk memilih
+                segment text. Default: SJISClassifier (tanpa decode)
+            cache: Optional ParseCache (scf_cache.py). Hanya dipakai dengan
+                classifier default, karena hook custom tidak masuk key cache
+            spec: Optional OpcodeSpec (scf_disasm.py). Segment text diambil
+                dari operand text/choice dan pointer relocation dari operand
+                target hasil disassemble, bukan scan + heuristic
+        """
         self.encoding = encoding
+        self.classify = classify or default_classifier(encoding)
+        self.cache = cache if classify is None else None
+        self.spec = spec
+        
+        # Hasil parse dengan spec berbeda tidak boleh berbagi entry cache
+        self.parser_version = PARSER_VERSION
+        if spec:
+            self.parser_version += f"+{spec.sha256[:16]}"
     
-    def parse(self, filepath: str) -> dict:
+    def parse(self, filepath: str, lazy: bool = False) -> dict:
         """
         Parse file SCF dan extract text dengan mempertahankan struktur
         
+        Args:
+            lazy: Hanya catat batas + klasifikasi segment, text di-decode
+                saat pertama diakses (untuk pass yang cuma butuh offset/length)
+        
         Returns structure untuk perfect rebuild
         """
         with open(filepath, 'rb') as f:
             data = f.read()
         
-        # Extract Japanese text segments with their offsets
-        text_segments = []
-        i = 0
-        
-        while i < len(data):
-            # Look for null-terminated strings
-            start = i
-            segment = bytearray()
-            
-            while i < len(data) and data[i] != 0x00:
-                segment.append(data[i])
-                i += 1
-            
-            # Include null terminator if found
-            if i < len(data) and data[i] == 0x00:
-                segment.append(0x00)
-                i += 1
-            
-            # Try to decode as text
-            if len(segment) > 1:  # More than just null
-                try:
-                    text_content = bytes(segment[:-1])  # Exclude null
-                    if text_content:
-                        decoded = text_content.decode(self.encoding, errors='ignore')
-                        # Check if contains Japanese
-                        if any('\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff' for c in decoded):
-                            text_segments.append({
-                                'offset': start,
-                                'length': len(segment),
-                                'original': list(segment),  # Convert to list for JSON
-                                'text': decoded
-                            })
-                except:
-                    pass
-        
-        return {
-            'original_data': list(data),  # Keep complete original
+        # Original dibaca lagi dari path ini saat rebuild
+        return self.parse_buffer(data, os.path.abspath(filepath), lazy)
+    
+    def parse_buffer(self, data: bytes, source: str = None, lazy: bool = False) -> dict:
+        """Parse SCF yang sudah ada di memory (lihat parse)"""
+        sha256 = hashlib.sha256(data).hexdigest()
+        
+        parsed = {
+            'schema': SCHEMA_VERSION,
+            'source': source,
+            'sha256': sha256,
             'size': len(data),
             'encoding': self.encoding,
-            'text_segments': text_segments
         }
+        
+        # Cache hit: skip scan + klasifikasi sepenuhnya
+        if self.cache:
+            cache_key = self.cache.key(sha256, self.parser_version, self.encoding)
+            cached = self.cache.get(cache_key)
+            if cached:
+                parsed['text_segments'] = SegmentTable(data, *cached, encoding=self.encoding)
+                return parsed
+        
+        # Extract Japanese text segments with their offsets
+        view = memoryview(data)
+        if self.spec:
+            offsets, lengths = self.disassemble(data, source).text_bounds()
+        else:
+            offsets, lengths = self._select_text(view, *scan_segments(data))
+        text_segments = SegmentTable(data, offsets, lengths, encoding=self.encoding)
+        
+        if not lazy or self.cache:
+            text_segments.texts = [
+                str(view[start:start + length - 1], self.encoding, 'ignore')
+                for start, length in zip(text_segments.offsets, text_segments.lengths)
+            ]
+        
+        parsed['text_segments'] = text_segments
+        
+        if self.cache:
+            self.cache.put(cache_key, parsed)
+        
+        return parsed
+    
+    def _select_text(self, view: memoryview, offsets: array, lengths: array) -> Tuple[array, array]:
+        """Classify per byte dulu, return hanya (offsets, lengths) segment text"""
+        classify = self.classify
+        is_text = [classify(view[start:start + length - 1])  # Exclude null
+                   for start, length in zip(offsets, lengths)]
+        
+        return array('I', compress(offsets, is_text)), array('I', compress(lengths, is_text))
+    
+    def iter_segments(self, source, chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+        """
+        Scan SCF secara streaming dan yield segment text satu per satu
+        
+        Args:
+            source: Path SCF, file object binary, atau buffer bytes-like
+            chunk_size: Ukuran blok baca dari file
+        
+        Yields dict {'offset', 'length', 'text'} (sama seperti text_segments).
+        Memory dibatasi oleh chunk_size + segment terpanjang, bukan ukuran file.
+        """
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                yield from self.iter_segments(f, chunk_size)
+            return
+        
+        if not hasattr(source, 'read'):
+            source = io.BytesIO(source)
+        
+        pending = b''  # Run terakhir yang belum ketemu null terminator
+        base = 0       # File offset dari pending[0]
+        
+        while True:
+            chunk = source.read(chunk_size)
+            if not chunk:
+                break
+            
+            data = pending + chunk
+            cut = data.rfind(b'\x00') + 1
+            if not cut:
+                pending = data
+                continue
+            
+            # Semua segment sebelum null terakhir sudah lengkap
+            complete = data[:cut]
+            view = memoryview(complete)
+            for start, length in zip(*self._select_text(view, *scan_segments(complete))):
+                yield {
+                    'offset': base + start,
+                    'length': length,
+                    'text': str(view[start:start + length - 1], self.encoding, 'ignore')
+                }
+            
+            pending = data[cut:]
+            base += cut
+        
+        # Sisa tanpa null terminator di akhir file (perilaku sama dengan parse)
+        if len(pending) > 1 and self.classify(pending[:-1]):
+            yield {
+                'offset': base,
+                'length': len(pending),
+                'text': str(pending[:-1], self.encoding, 'ignore')
+            }
+    
+    @staticmethod
+    def load(json_path: str) -> dict:
+        """
+        Load hasil parse dari JSON (schema 3 atau schema lama) atau .scfidx
+        
+        Schema lama (tanpa field 'schema') masih menyimpan 'original_data'
+        dan tetap bisa di-rebuild seperti biasa.
+        """
+        if scf_index.is_index(json_path):
+            return scf_index.SegmentIndex(json_path).to_parsed()
+        
+        with open(json_path, 'r', encoding='utf-8') as f:
+            if json_path.endswith('.jsonl'):
+                # Baris pertama header, sisanya satu segment per baris
+                parsed_data = json.loads(f.readline())
+                parsed_data['text_segments'] = [json.loads(line) for line in f]
+                return parsed_data
+            
+            parsed_data = json.load(f)
+        
+        parsed_data.setdefault('schema', 1)
+        return parsed_data
+    
+    @staticmethod
+    def load_original(parsed_data: dict, source: str = None) -> bytes:
+        """
+        Ambil byte original SCF untuk rebuild
+        
+        Schema lama: dari 'original_data'. Schema 3: buffer SegmentTable
+        jika masih di memory, atau baca file sumber (atau `source` jika
+        file sudah dipindah) dan cocokkan hash-nya.
+        """
+        if 'original_data' in parsed_data:
+            return bytes(parsed_data['original_data'])
+        
+        buffer = getattr(parsed_data['text_segments'], 'buffer', None)
+        if buffer is not None and source is None:
+            return buffer
+        
+        source = source or parsed_data['source']
+        data = read_source(source)
+        
+        if hashlib.sha256(data).hexdigest() != parsed_data['sha256']:
+            raise ValueError(f"SCF sumber berubah sejak di-parse: {source}")
+        
+        return data
     
     def extract_texts(self, parsed_data: dict) -> List[str]:
         """Extract just the texts for translation"""
         return [seg['text'] for seg in parsed_data['text_segments']]
     
-    def rebuild(self, parsed_data: dict, new_texts: List[str] = None) -> bytes:
+    def rebuild(self, parsed_data: dict, new_texts: List[str] = None, source: str = None,
+                mode: str = 'variable', relocate: bool = False,
+                **policy) -> Union[bytes, bytearray]:
         """
         Rebuild SCF with optional text replacement
         
+        Mode 'variable': output dirakit dalam satu pass maju dari span
+        original yang tidak berubah + byte text baru (lihat splice_chunks),
+        bukan insert per byte.
+        
+        Mode 'fixed': setiap text ditimpa di tempat dengan panjang byte
+        yang sama persis (seperti injector_scf.py), ukuran file tidak berubah.
+        
         Args:
             parsed_data: Data from parse()
             new_texts: Optional list of replacement texts
+            source: Optional path SCF original (override 'source' schema 3)
+            mode: 'variable' atau 'fixed'
+            relocate: Mode 'variable': patch pointer uint32 ke awal segment
+                text sesuai pergeseran offset (lihat scf_reloc.py)
+            **policy: Untuk mode 'fixed': pad, align, overflow (lihat fit_fixed)
         
         Returns:
-            Binary data for SCF file
+            Binary data for SCF file. Mode 'fixed' mengembalikan bytearray
+            hasil timpa (bukan copy): buffer milik caller, tidak berbagi
+            memory dengan parsed_data. Panggil bytes() jika perlu immutable.
         """
+        if mode not in REBUILD_MODES:
+            raise ValueError(f"Mode rebuild tidak dikenal: {mode}")
+        
+        if mode == 'fixed' and new_texts:
+            # Satu buffer dialokasikan sekali, lalu ditimpa per slot
+            output = bytearray(self.load_original(parsed_data, source))
+            segments, new_texts = self.select_edits(output, parsed_data['text_segments'], new_texts)
+            offsets, _ = segment_bounds(segments)
+            for i, content in self.fit_texts(segments, new_texts, **policy).items():
+                output[offsets[i]:offsets[i] + len(content)] = content
+            return output  # Buffer yang sama, tanpa copy ke bytes
+        
+        return b''.join(self.iter_rebuild(parsed_data, new_texts, source, relocate=relocate))
+    
+    def rebuild_into(self, parsed_data: dict, new_texts: List[str], fileobj,
+                     source: str = None, mode: str = 'variable', relocate: bool = False,
+                     **policy) -> int:
+        """
+        Rebuild SCF langsung ke file object, potong demi potong
+        
+        Sama seperti rebuild(), tapi output tidak pernah dirakit jadi satu
+        bytes object: span original ditulis sebagai memoryview dari buffer
+        original, jadi memory puncak ~ ukuran SCF original saja.
+        
+        Returns:
+            Jumlah byte yang ditulis
+        """
+        if mode not in REBUILD_MODES:
+            raise ValueError(f"Mode rebuild tidak dikenal: {mode}")
+        
+        written = 0
+        for chunk in self.iter_rebuild(parsed_data, new_texts, source, mode, relocate, **policy):
+            fileobj.write(chunk)
+            written += len(chunk)
+        
+        return written
+    
+    def iter_rebuild(self, parsed_data: dict, new_texts: List[str] = None, source: str = None,
+                     mode: str = 'variable', relocate: bool = False, **policy) -> Iterator:
+        """Yields potongan output rebuild secara berurutan (lihat splice_chunks)"""
         # Start with original data
-        data = bytearray(parsed_data['original_data'])
+        data = self.load_original(parsed_data, source)
         
         if not new_texts:
             # No replacement, return original
-            return bytes(data)
+            yield memoryview(data)
+            return
+        
+        segments, new_texts = self.select_edits(data, parsed_data['text_segments'], new_texts)
+        offsets, lengths = segment_bounds(segments)
+        
+        if mode == 'fixed':
+            # Isi slot + byte terakhir segment original (null terminator)
+            replacements = {
+                i: content + bytes(data[offsets[i] + len(content):offsets[i] + lengths[i]])
+                for i, content in self.fit_texts(segments, new_texts, **policy).items()
+            }
+        else:
+            replacements = self.encode_texts(segments, new_texts)
+        
+        if relocate and mode == 'variable':
+            fields, targets = self.relocations(data, parsed_data['text_segments'], parsed_data.get('source'))
+            yield from scf_reloc.splice_relocated(data, offsets, lengths, replacements, fields, targets)
+            return
+        
+        yield from splice_chunks(data, offsets, lengths, replacements)
+    
+    def relocations(self, data, segments, source: str = None) -> Tuple[array, array]:
+        """
+        Tabel relocation (fields, targets) untuk splice_relocated
+        
+        Dengan spec: operand target hasil disassemble. Tanpa spec: kandidat
+        pointer ke semua segment text (bukan hanya yang diedit), lihat
+        scf_reloc.scan_relocations.
+        """
+        if self.spec:
+            return self.disassemble(data, source).relocations()
+        return scf_reloc.scan_relocations(data, *segment_bounds(segments))
+    
+    def disassemble(self, data, source: str = None) -> 'scf_disasm.InstructionIndex':
+        """
+        Index instruksi SCF dengan spec parser ini
+        
+        .scfdis di samping file SCF sumber (scf_disasm.py index) dipakai
+        jika hash SCF + spec cocok, selain itu disassemble ulang.
+        """
+        path = None
+        if source and ARCHIVE_SEP not in source:
+            path = os.path.splitext(source)[0] + scf_disasm.EXTENSION
+        return scf_disasm.load_index(data, self.spec, path)
+    
+    def select_edits(self, data, segments, new_texts):
+        """
+        Normalisasi new_texts jadi pasangan (segments, texts) untuk rebuild
+        
+        new_texts berupa list: dipakai per urutan segment seperti biasa.
+        new_texts berupa dict {segment ID: text} (file .tsv sparse): hanya
+        segment yang disebut dan benar-benar berubah yang dikembalikan,
+        dicari langsung dari offset di ID tanpa melihat segment lain.
+        
+        Dengan spec, segment text tidak selalu diawali null: ID dicocokkan
+        dengan batas segment (hasil disassemble) di `segments`.
+        """
+        if not isinstance(new_texts, dict):
+            return segments, new_texts
         
-        # Replace text segments
-        # Work backwards to avoid offset issues
-        segments = parsed_data['text_segments']
+        view = memoryview(data)
+        edits = []
+        bounds = dict(zip(*segment_bounds(segments))) if self.spec else None
         
+        for seg_id, text in new_texts.items():
+            offset = segment_id_offset(seg_id)
+            
+            if bounds is not None:
+                length = bounds.get(offset)
+                if length is None:
+                    print(f"⚠️  Warning: Segment {seg_id} tidak ditemukan, skip...")
+                    continue
+            else:
+                # Segment harus dimulai setelah null dan hash-nya cocok
+                if offset >= len(view) or (offset and view[offset - 1]):
+                    print(f"⚠️  Warning: Segment {seg_id} tidak ditemukan, skip...")
+                    continue
+                
+                end = NULL_BYTE.search(view, offset)
+                length = end.end() - offset if end else len(view) - offset
+            
+            if segment_id(offset, view[offset:offset + length]) != seg_id:
+                print(f"⚠️  Warning: Segment {seg_id} tidak cocok dengan SCF original, skip...")
+                continue
+            
+            # Text yang tidak berubah tidak perlu di-encode ulang
+            if text == str(view[offset:offset + length - 1], self.encoding, 'ignore'):
+                continue
+            
+            edits.append((offset, length, text))
+        
+        edits.sort()
+        return ([{'offset': offset, 'length': length, 'text': text} for offset, length, text in edits],
+                [text for _, _, text in edits])
+    
+    def load_source(self, scf, index: str = None, bounds: bool = True) -> dict:
+        """
+        Baca SCF original + batas segment, tanpa load JSON
+        
+        Args:
+            scf: Path SCF original atau buffer bytes
+            index: Optional .scfidx untuk batas segment. Tanpa index (atau
+                index bukan .scfidx), batas di-scan ulang (lazy, tanpa decode)
+            bounds: False untuk skip batas segment (text_segments kosong)
+        
+        Returns:
+            Struktur seperti parse() dengan text_segments berbasis buffer SCF
+        """
+        source = None
+        if isinstance(scf, (str, os.PathLike)):
+            source = os.path.abspath(scf)
+            with open(scf, 'rb') as f:
+                scf = f.read()
+        
+        if bounds and not (index and scf_index.is_index(index)):
+            return self.parse_buffer(scf, source, lazy=True)
+        
+        parsed_data = {
+            'schema': SCHEMA_VERSION,
+            'source': source,
+            'sha256': hashlib.sha256(scf).hexdigest(),
+            'size': len(scf),
+            'encoding': self.encoding,
+            'text_segments': SegmentTable(scf, encoding=self.encoding)
+        }
+        
+        if bounds:
+            with scf_index.SegmentIndex(index) as seg_index:
+                if seg_index.sha256 != parsed_data['sha256']:
+                    raise ValueError(f"Index {index} bukan untuk SCF ini (hash berbeda)")
+                parsed_data['text_segments'] = SegmentTable(scf, *seg_index.bounds(),
+                                                            encoding=self.encoding)
+        
+        return parsed_data
+    
+    def rebuild_from_source(self, scf, new_texts, fileobj, index: str = None, **options) -> int:
+        """
+        Rebuild langsung dari SCF original + translation, tanpa load JSON
+        
+        Args:
+            scf: Path SCF original atau buffer bytes (mis. entry dari DSK)
+            new_texts: List text (TXT) atau dict ID -> text (.tsv sparse)
+            fileobj: File object output (lihat rebuild_into)
+            index: Optional .scfidx untuk batas segment. Tanpa index (atau
+                index bukan .scfidx), batas segment di-scan ulang dari SCF
+                (lazy, tanpa decode). Translation sparse tidak butuh index
+                (kecuali dengan relocate).
+            **options: mode, relocate dan policy (lihat rebuild)
+        
+        Returns:
+            Jumlah byte yang ditulis
+        """
+        if isinstance(new_texts, dict) and not options.get('relocate') and not self.spec:
+            # ID sparse sudah berisi offset, tidak perlu daftar segment
+            # (dengan spec, ID dicocokkan ke batas segment hasil disassemble)
+            parsed_data = self.load_source(scf, bounds=False)
+        else:
+            parsed_data = self.load_source(scf, index)
+        
+        return self.rebuild_into(parsed_data, new_texts, fileobj, **options)
+    
+    def patch_fixed(self, parsed_data: dict, new_texts: List[str], output_path: str,
+                    source: str = None, **policy) -> int:
+        """
+        Rebuild mode 'fixed' langsung ke file lewat mmap
+        
+        Original ditulis sekali ke output_path (skip jika output_path adalah
+        SCF original itu sendiri), lalu setiap slot text ditimpa di tempat.
+        Ukuran file dijamin tidak berubah.
+        
+        Returns:
+            Ukuran file output
+        """
+        data = self.load_original(parsed_data, source)
+        source = source or parsed_data.get('source')
+        
+        # Source di dalam archive (lihat archive_source) tidak pernah sama dengan output
+        in_place = (source and ARCHIVE_SEP not in source and os.path.exists(source)
+                    and os.path.exists(output_path) and os.path.samefile(source, output_path))
+        if not in_place:
+            with open(output_path, 'wb') as f:
+                f.write(data)
+        
+        if not new_texts or not len(data):
+            return len(data)
+        
+        segments, new_texts = self.select_edits(data, parsed_data['text_segments'], new_texts)
+        offsets, _ = segment_bounds(segments)
+        replacements = self.fit_texts(segments, new_texts, **policy)
+        
+        with open(output_path, 'r+b') as f, mmap.mmap(f.fileno(), 0) as mm:
+            for i, content in replacements.items():
+                mm[offsets[i]:offsets[i] + len(content)] = content
+            mm.flush()
+        
+        return len(data)
+    
+    def fit_fixed(self, text: str, width: int, pad: bytes = b' ', align: str = 'left',
+                  overflow: str = 'truncate') -> bytes:
+        """
+        Encode text dan paskan tepat `width` byte
+        
+        Args:
+            pad: Byte padding (1 byte, default spasi seperti injector_scf.py)
+            align: 'left', 'center' atau 'right'
+            overflow: Jika text lebih panjang dari slot: 'truncate' (potong
+                di batas karakter, tidak pernah membelah karakter double-byte),
+                'error' (raise ValueError) atau 'keep' (pakai text original)
+        
+        Returns:
+            Byte tepat sepanjang width, atau None jika overflow='keep' dan
+            text tidak muat
+        """
+        if len(pad) != 1:
+            raise ValueError(f"Pad harus 1 byte: {pad!r}")
+        if align not in FIXED_ALIGNS:
+            raise ValueError(f"Align tidak dikenal: {align}")
+        if overflow not in FIXED_OVERFLOWS:
+            raise ValueError(f"Overflow policy tidak dikenal: {overflow}")
+        
+        encoded = text.encode(self.encoding)
+        
+        if len(encoded) > width:
+            if overflow == 'error':
+                raise ValueError(f"Text {len(encoded)} byte melebihi slot {width} byte: {text}")
+            if overflow == 'keep':
+                return None
+            
+            # Potong per karakter supaya karakter double-byte tidak terbelah
+            encoded = bytearray()
+            for char in text:
+                char_bytes = char.encode(self.encoding)
+                if len(encoded) + len(char_bytes) > width:
+                    break
+                encoded += char_bytes
+            encoded = bytes(encoded)
+        
+        space = width - len(encoded)
+        if align == 'right':
+            left = space
+        elif align == 'center':
+            left = space // 2
+        else:
+            left = 0
+        
+        return pad * left + encoded + pad * (space - left)
+    
+    def fit_texts(self, segments, new_texts: List[str], **policy) -> Dict[int, bytes]:
+        """
+        fit_fixed() untuk setiap segment, return {index segment: isi slot}
+        
+        Slot adalah isi segment tanpa null terminator. Segment yang gagal
+        di-encode atau tidak muat (overflow='keep') memakai text original.
+        """
         if len(new_texts) != len(segments):
             print(f"⚠️  Warning: Text count mismatch! Expected {len(segments)}, got {len(new_texts)}")
             print(f"   Using min({len(segments)}, {len(new_texts)}) texts")
         
-        # Process in reverse order to maintain offsets
-        for i in range(min(len(segments), len(new_texts)) - 1, -1, -1):
-            seg = segments[i]
-            new_text = new_texts[i]
+        offsets, lengths = segment_bounds(segments)
+        replacements = {}
+        
+        for i in range(min(len(segments), len(new_texts))):
+            try:
+                content = self.fit_fixed(new_texts[i], lengths[i] - 1, **policy)
+            except UnicodeError as e:
+                print(f"❌ Error encoding text at offset {offsets[i]}: {e}")
+                print(f"   Keeping original text")
+                continue
+            
+            if content is None:
+                print(f"⚠️  Text at offset {offsets[i]} tidak muat {lengths[i] - 1} byte, keeping original text")
+                continue
             
-            # Encode new text
+            replacements[i] = content
+        
+        return replacements
+    
+    def encode_texts(self, segments, new_texts: List[str]) -> Dict[int, bytes]:
+        """
+        Encode text baru per segment, return {index segment: byte + null}
+        
+        Segment yang gagal di-encode tidak dimasukkan (text original dipakai).
+        """
+        if len(new_texts) != len(segments):
+            print(f"⚠️  Warning: Text count mismatch! Expected {len(segments)}, got {len(new_texts)}")
+            print(f"   Using min({len(segments)}, {len(new_texts)}) texts")
+        
+        replacements = {}
+        
+        for i in range(min(len(segments), len(new_texts))):
             try:
-                new_bytes = new_text.encode(self.encoding)
-                new_bytes += b'\x00'  # Add null terminator
-                
-                # Replace in data
-                offset = seg['offset']
-                old_length = seg['length']
-                
-                # Remove old bytes
-                del data[offset:offset + old_length]
-                
-                # Insert new bytes
-                for j, byte in enumerate(new_bytes):
-                    data.insert(offset + j, byte)
-                
+                replacements[i] = new_texts[i].encode(self.encoding) + b'\x00'  # Add null terminator
             except Exception as e:
-                print(f"❌ Error encoding text at offset {seg['offset']}: {e}")
+                print(f"❌ Error encoding text at offset {segments[i]['offset']}: {e}")
                 print(f"   Keeping original text")
         
-        return bytes(data)
+        return replacements
     
-    def save_for_translation(self, filepath: str, output_dir: str):
-        """Save files for translation workflow"""
-        parsed = self.parse(filepath)
-        base_name = Path(filepath).stem
+    def save_for_translation(self, filepath: str, output_dir: str, index: bool = False,
+                             stream: bool = False, ids: bool = False, data=None):
+        """
+        Save files for translation workflow
+        
+        Args:
+            index: Juga tulis sidecar biner .scfidx (lihat scf_index.py)
+            stream: Tulis TXT + JSONL langsung dari iter_segments(),
+                tanpa menyimpan hasil parse lengkap di memory
+            ids: Juga tulis .tsv dengan segment ID (translation sparse,
+                boleh hanya berisi baris yang diubah)
+            data: Isi SCF yang sudah ada di memory (mis. view dari
+                SDKArchive.iter_views()), filepath hanya dipakai sebagai
+                source (lihat archive_source)
+        """
+        if stream:
+            if self.spec:
+                raise ValueError("Mode stream tidak mendukung spec opcode")
+            if index or ids or data is not None:
+                raise ValueError("Mode stream tidak bisa menulis .scfidx/.tsv atau parse buffer")
+            return self._stream_for_translation(filepath, output_dir)
+        
+        if data is not None:
+            parsed = self.parse_buffer(data, filepath)
+        else:
+            parsed = self.parse(filepath)
+        base_name = source_name(filepath)
         
         os.makedirs(output_dir, exist_ok=True)
         
         # Save JSON with full structure
         json_path = os.path.join(output_dir, f"{base_name}.json")
         with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(parsed, f, ensure_ascii=False, indent=2)
+            json.dump(parsed, f, ensure_ascii=False, indent=2, default=_json_default)
         
         # Save TXT with texts only
         txt_path = os.path.join(output_dir, f"{base_name}.txt")
@@ -145,21 +907,175 @@ class SCFParserV2:
         
         print(f"   JSON: {json_path}")
         print(f"   TXT:  {txt_path}")
+        
+        if index:
+            index_path = os.path.join(output_dir, f"{base_name}{scf_index.EXTENSION}")
+            scf_index.write_index(index_path, parsed)
+            print(f"   IDX:  {index_path}")
+        
+        if ids:
+            tsv_path = os.path.join(output_dir, f"{base_name}{SPARSE_EXTENSION}")
+            segments = parsed['text_segments']
+            with open(tsv_path, 'w', encoding='utf-8', newline='') as f:
+                for i, text in enumerate(texts):
+                    f.write(f"{segment_id(segments.offsets[i], segments.raw(i))}\t{escape(text)}\n")
+            print(f"   TSV:  {tsv_path}")
+        
         print(f"   Found {len(texts)} text segments")
         
         return json_path, txt_path
     
-    def rebuild_from_files(self, json_path: str, txt_path: str = None) -> bytes:
-        """Rebuild from JSON + optional TXT"""
-        with open(json_path, 'r', encoding='utf-8') as f:
-            parsed_data = json.load(f)
+    def _stream_for_translation(self, filepath: str, output_dir: str):
+        """Tulis TXT + JSONL per segment sambil scan (lihat iter_segments)"""
+        base_name = Path(filepath).stem
+        os.makedirs(output_dir, exist_ok=True)
         
-        new_texts = None
-        if txt_path and os.path.exists(txt_path):
-            with open(txt_path, 'r', encoding='utf-8') as f:
-                new_texts = [line.rstrip('\n') for line in f]
+        header = {
+            'schema': SCHEMA_VERSION,
+            'source': os.path.abspath(filepath),
+            'sha256': file_sha256(filepath),
+            'size': os.path.getsize(filepath),
+            'encoding': self.encoding
+        }
         
-        return self.rebuild(parsed_data, new_texts)
+        jsonl_path = os.path.join(output_dir, f"{base_name}.jsonl")
+        txt_path = os.path.join(output_dir, f"{base_name}.txt")
+        count = 0
+        
+        with open(jsonl_path, 'w', encoding='utf-8') as jf, \
+                open(txt_path, 'w', encoding='utf-8') as tf:
+            jf.write(json.dumps(header, ensure_ascii=False) + '\n')
+            
+            for seg in self.iter_segments(filepath):
+                jf.write(json.dumps(seg, ensure_ascii=False) + '\n')
+                tf.write(seg['text'] + '\n')
+                count += 1
+        
+        print(f"   JSONL: {jsonl_path}")
+        print(f"   TXT:   {txt_path}")
+        print(f"   Found {count} text segments")
+        
+        return jsonl_path, txt_path
+    
+    def rebuild_from_files(self, json_path: str, txt_path: str = None, source: str = None,
+                           **options) -> Union[bytes, bytearray]:
+        """Rebuild from JSON/JSONL (atau .scfidx) + optional TXT"""
+        parsed_data = self.load(json_path)
+        return self.rebuild(parsed_data, read_texts(txt_path), source, **options)
+
+
+def segment_id(offset: int, raw) -> str:
+    """ID stabil segment: offset (hex) + hash byte original segment"""
+    return f"{offset:08x}-{hashlib.blake2b(raw, digest_size=4).hexdigest()}"
+
+
+def segment_id_offset(seg_id: str) -> int:
+    """Ambil offset dari segment ID"""
+    return int(seg_id.split('-', 1)[0], 16)
+
+
+def read_edits(tsv_path: str) -> Dict[str, str]:
+    """
+    Baca translation sparse (.tsv): satu baris per segment "ID<TAB>text"
+    
+    Baris kosong dan baris yang diawali '#' diabaikan. Baris dipisah LF
+    atau CRLF, text di-unescape (lihat scf_tm.unescape).
+    """
+    edits = {}
+    with open(tsv_path, 'r', encoding='utf-8', newline='') as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip('\r\n')
+            if not line or line.startswith('#'):
+                continue
+            seg_id, sep, text = line.partition('\t')
+            if not sep:
+                raise ValueError(f"{tsv_path}:{line_no}: format harus 'ID<TAB>text'")
+            edits[seg_id] = unescape(text)
+    return edits
+
+
+def read_texts(txt_path: str):
+    """
+    Baca translation: TXT (list, satu text per baris) atau .tsv sparse
+    (dict ID -> text, lihat read_edits). None jika file tidak ada
+    """
+    if not txt_path or not os.path.exists(txt_path):
+        return None
+    if txt_path.endswith(SPARSE_EXTENSION):
+        return read_edits(txt_path)
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+def archive_source(archive_path: str, name: str, index_path: str = None) -> str:
+    """
+    Source untuk SCF yang di-parse langsung dari archive (tanpa unpack)
+    
+    Path PFT ikut disimpan, jadi archive dengan nama bebas (bukan *.DSK)
+    tetap bisa dibaca ulang saat rebuild.
+    """
+    archive = os.path.abspath(archive_path)
+    if index_path:
+        archive += f"{ARCHIVE_INDEX_SEP}{os.path.abspath(index_path)}"
+    return f"{archive}{ARCHIVE_SEP}{name}"
+
+
+def source_name(source: str) -> str:
+    """Nama scene dari path SCF atau source archive ('scene.DSK::SCN001' -> 'SCN001')"""
+    if ARCHIVE_SEP in source:
+        return Path(source.rsplit(ARCHIVE_SEP, 1)[1]).stem
+    return Path(source).stem
+
+
+def read_source(source: str) -> bytes:
+    """Byte SCF dari path file atau source archive (lihat archive_source)"""
+    if ARCHIVE_SEP in source and not os.path.exists(source):
+        from sdk_tools import SDKArchive
+        archive_path, name = source.rsplit(ARCHIVE_SEP, 1)
+        # Source lama tanpa path PFT: PFT ditebak dari nama DSK
+        archive_path, _, index_path = archive_path.partition(ARCHIVE_INDEX_SEP)
+        with SDKArchive(archive_path, index_path or None).open() as sdk:
+            return sdk.read_entry(name)
+    
+    with open(source, 'rb') as f:
+        return f.read()
+
+
+@contextmanager
+def open_output(output_path: str):
+    """
+    File output rebuild lewat file sementara di directory yang sama
+    
+    Output baru menggantikan output_path (os.replace) hanya jika rebuild
+    selesai tanpa error, jadi output yang sama dengan SCF original tidak
+    terpotong sebelum original dibaca.
+    """
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            yield f
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def file_sha256(filepath: str, chunk_size: int = CHUNK_SIZE) -> str:
+    """SHA-256 file dibaca per blok (memory tetap kecil)"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def find_index(parsed_dir: str, base_name: str) -> str:
+    """Cari index scene di parsed_dir: .scfidx jika ada, fallback ke .json/.jsonl"""
+    for ext in (scf_index.EXTENSION, '.json', '.jsonl'):
+        path = os.path.join(parsed_dir, f"{base_name}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
 
 
 def main():
@@ -180,29 +1096,110 @@ USAGE:
 
 3. Rebuild:
    python scf_parser_v2.py rebuild input.json translated.txt output.SCF
+   
+   Atau dengan translation sparse (extract --ids, hapus baris yang tidak diubah):
+   python scf_parser_v2.py rebuild input.json translated.tsv output.SCF
 
 4. Batch extract:
-   python scf_parser_v2.py batch-extract scf_folder/ output_dir/
+   python scf_parser_v2.py batch-extract scf_folder/ output_dir/ [--index | --stream] [--cache-dir DIR]
+   
+   Atau langsung dari archive, tanpa unpack SCF ke disk:
+   python scf_parser_v2.py batch-extract-dsk scene.DSK scene.PFT output_dir/ [--index] [--cache-dir DIR]
+
+5. Batch rebuild (pakai .scfidx jika ada, fallback ke .json):
+   python scf_parser_v2.py batch-rebuild parsed_dir/ translated_dir/ output_dir/
+   
+   Atau langsung dari SCF original tanpa load JSON:
+   python scf_parser_v2.py batch-rebuild parsed_dir/ translated_dir/ output_dir/ --scf-dir scf_folder/
+   python scf_parser_v2.py batch-rebuild parsed_dir/ translated_dir/ output_dir/ --archive scene.DSK scene.PFT
+   python scf_parser_v2.py rebuild-src input.SCF translated.txt output.SCF
+
+6. Translation dengan karakter di luar Shift-JIS (é, —, dll):
+   python scf_parser_v2.py --encoding sjis_remap batch-rebuild parsed_dir/ translated_dir/ output_dir/
+   python scf_parser_v2.py --glyph-map glyphs.json batch-rebuild ...   (code point custom font patch)
+
+7. Dengan spec opcode (scf_disasm.py), text + pointer dari disassembler:
+   python scf_parser_v2.py --spec opcodes.json batch-extract scf_folder/ output_dir/
+   python scf_parser_v2.py --spec opcodes.json batch-rebuild parsed_dir/ translated_dir/ output_dir/ --relocate
         """
     )
     
+    parser.add_argument('--encoding', default='shift_jis',
+                        help="Encoding text SCF (default: shift_jis). 'sjis_remap': ganti"
+                             " karakter yang tidak ada di Shift-JIS (lihat scf_codec.py)")
+    parser.add_argument('--glyph-map', help="Konfigurasi JSON codec remap (implies --encoding sjis_remap)")
+    parser.add_argument('--spec', help="Spec opcode JSON (scf_disasm.py): segment text + relocation"
+                                       " dari disassembler, bukan heuristic")
+    
     subparsers = parser.add_subparsers(dest='command')
     
     # Extract
     extract_parser = subparsers.add_parser('extract')
     extract_parser.add_argument('input', help='Input SCF file')
     extract_parser.add_argument('output_dir', help='Output directory')
+    extract_mode = extract_parser.add_mutually_exclusive_group()
+    extract_mode.add_argument('--index', action='store_true', help='Juga tulis sidecar .scfidx')
+    extract_mode.add_argument('--stream', action='store_true', help='Stream TXT + JSONL tanpa parse penuh')
+    extract_parser.add_argument('--ids', action='store_true', help='Juga tulis .tsv dengan segment ID')
     
     # Rebuild
     rebuild_parser = subparsers.add_parser('rebuild')
-    rebuild_parser.add_argument('json', help='JSON file')
-    rebuild_parser.add_argument('txt', nargs='?', help='TXT file (optional)')
+    rebuild_parser.add_argument('json', help='JSON atau .scfidx file')
+    rebuild_parser.add_argument('txt', nargs='?', help='TXT atau .tsv sparse file (optional)')
     rebuild_parser.add_argument('output', help='Output SCF')
+    rebuild_parser.add_argument('--source', help='SCF original (jika sudah dipindah sejak extract)')
+    rebuild_parser.add_argument('--mode', choices=REBUILD_MODES, default='variable',
+                                help="'fixed': panjang byte setiap text tetap (untuk menu)")
+    rebuild_parser.add_argument('--pad', type=lambda v: bytes([int(v, 0)]), default=b' ',
+                                help='Byte padding mode fixed (default: 0x20)')
+    rebuild_parser.add_argument('--align', choices=FIXED_ALIGNS, default='left',
+                                help='Posisi text di slot mode fixed (default: left)')
+    rebuild_parser.add_argument('--overflow', choices=FIXED_OVERFLOWS, default='truncate',
+                                help='Jika text tidak muat di mode fixed (default: truncate)')
+    rebuild_parser.add_argument('--relocate', action='store_true',
+                                help='Patch pointer uint32 ke segment text yang bergeser (lihat scf_reloc.py)')
     
     # Batch extract
     batch_parser = subparsers.add_parser('batch-extract')
     batch_parser.add_argument('input_dir', help='Input directory with SCF files')
     batch_parser.add_argument('output_dir', help='Output directory')
+    batch_mode = batch_parser.add_mutually_exclusive_group()
+    batch_mode.add_argument('--index', action='store_true', help='Juga tulis sidecar .scfidx')
+    batch_mode.add_argument('--stream', action='store_true', help='Stream TXT + JSONL tanpa parse penuh')
+    batch_parser.add_argument('--ids', action='store_true', help='Juga tulis .tsv dengan segment ID')
+    batch_parser.add_argument('--cache-dir', help='Directory cache parse (skip SCF yang tidak berubah)')
+    batch_parser.add_argument('--cache-size', type=int, default=256, help='Batas ukuran cache dalam MB (default: 256)')
+    
+    # Batch extract dari archive (tanpa unpack)
+    batch_dsk_parser = subparsers.add_parser('batch-extract-dsk')
+    batch_dsk_parser.add_argument('archive', help='File .DSK/.SDK')
+    batch_dsk_parser.add_argument('pft', help='File .PFT')
+    batch_dsk_parser.add_argument('output_dir', help='Output directory')
+    batch_dsk_parser.add_argument('--index', action='store_true', help='Juga tulis sidecar .scfidx')
+    batch_dsk_parser.add_argument('--ids', action='store_true', help='Juga tulis .tsv dengan segment ID')
+    batch_dsk_parser.add_argument('--cache-dir', help='Directory cache parse (skip SCF yang tidak berubah)')
+    batch_dsk_parser.add_argument('--cache-size', type=int, default=256, help='Batas ukuran cache dalam MB (default: 256)')
+    
+    # Batch rebuild
+    batch_rebuild_parser = subparsers.add_parser('batch-rebuild')
+    batch_rebuild_parser.add_argument('parsed_dir', help='Directory dengan JSON/JSONL/.scfidx')
+    batch_rebuild_parser.add_argument('txt_dir', help='Directory dengan TXT/.tsv translation')
+    batch_rebuild_parser.add_argument('output_dir', help='Output directory untuk SCF')
+    batch_rebuild_parser.add_argument('--scf-dir', help='Rebuild langsung dari SCF original di directory ini'
+                                      ' (+ .scfidx jika ada), tanpa load JSON')
+    batch_rebuild_parser.add_argument('--archive', nargs=2, metavar=('DSK', 'PFT'),
+                                      help='Seperti --scf-dir, tapi SCF original dibaca langsung dari archive')
+    batch_rebuild_parser.add_argument('--relocate', action='store_true',
+                                      help='Patch pointer uint32 ke segment text yang bergeser')
+    
+    # Rebuild dari SCF original
+    rebuild_src_parser = subparsers.add_parser('rebuild-src')
+    rebuild_src_parser.add_argument('scf', help='SCF original')
+    rebuild_src_parser.add_argument('txt', help='TXT atau .tsv sparse file')
+    rebuild_src_parser.add_argument('output', help='Output SCF')
+    rebuild_src_parser.add_argument('--index', help='Optional .scfidx untuk batas segment')
+    rebuild_src_parser.add_argument('--relocate', action='store_true',
+                                    help='Patch pointer uint32 ke segment text yang bergeser')
     
     args = parser.parse_args()
     
@@ -211,11 +1208,21 @@ USAGE:
         return 0
     
     try:
-        scf = SCFParserV2()
+        cache = None
+        if getattr(args, 'cache_dir', None):
+            from scf_cache import ParseCache
+            cache = ParseCache(args.cache_dir, args.cache_size * 1024 * 1024)
+        
+        encoding = args.encoding
+        if args.glyph_map:
+            encoding = scf_codec.load_config(args.glyph_map)
+        
+        spec = scf_disasm.OpcodeSpec.load(args.spec) if args.spec else None
+        scf = SCFParserV2(encoding=encoding, cache=cache, spec=spec)
         
         if args.command == 'extract':
             print(f"📖 Extracting: {args.input}")
-            scf.save_for_translation(args.input, args.output_dir)
+            scf.save_for_translation(args.input, args.output_dir, args.index, args.stream, args.ids)
             print("✅ Done!")
             
         elif args.command == 'rebuild':
@@ -223,12 +1230,17 @@ USAGE:
             if args.txt:
                 print(f"   With translation: {args.txt}")
             
-            data = scf.rebuild_from_files(args.json, args.txt)
-            
-            with open(args.output, 'wb') as f:
-                f.write(data)
-            
-            print(f"✅ Created: {args.output} ({len(data)} bytes)")
+            if args.mode == 'fixed':
+                size = scf.patch_fixed(scf.load(args.json), read_texts(args.txt), args.output,
+                                       args.source, pad=args.pad, align=args.align,
+                                       overflow=args.overflow)
+                print(f"✅ Created: {args.output} ({size} bytes, ukuran tetap)")
+            else:
+                with open_output(args.output) as f:
+                    size = scf.rebuild_into(scf.load(args.json), read_texts(args.txt), f, args.source,
+                                            relocate=args.relocate)
+                
+                print(f"✅ Created: {args.output} ({size} bytes)")
             
         elif args.command == 'batch-extract':
             scf_files = list(Path(args.input_dir).glob('*.SCF'))
@@ -236,9 +1248,93 @@ USAGE:
             
             for scf_file in scf_files:
                 print(f"\n📖 {scf_file.name}")
-                scf.save_for_translation(str(scf_file), args.output_dir)
+                scf.save_for_translation(str(scf_file), args.output_dir, args.index, args.stream, args.ids)
+            
+            if cache:
+                print(f"\n💾 Cache: {cache.stats()}")
             
             print(f"\n✅ All done! Output: {args.output_dir}")
+            
+        elif args.command == 'batch-extract-dsk':
+            from sdk_tools import SDKArchive
+            
+            with SDKArchive(args.archive, args.pft).open() as sdk:
+                print(f"📋 Found {len(sdk.names())} entries in {args.archive}")
+                
+                for name, view in sdk.iter_views():
+                    print(f"\n📖 {name}.SCF")
+                    scf.save_for_translation(archive_source(args.archive, name, args.pft), args.output_dir,
+                                             args.index, ids=args.ids, data=view)
+            
+            if cache:
+                print(f"\n💾 Cache: {cache.stats()}")
+            
+            print(f"\n✅ All done! Output: {args.output_dir}")
+            
+        elif args.command == 'rebuild-src':
+            print(f"🔨 Rebuilding: {args.scf}")
+            print(f"   With translation: {args.txt}")
+            
+            with open_output(args.output) as f:
+                size = scf.rebuild_from_source(args.scf, read_texts(args.txt), f, args.index,
+                                               relocate=args.relocate)
+            
+            print(f"✅ Created: {args.output} ({size} bytes)")
+            
+        elif args.command == 'batch-rebuild':
+            archive = None
+            if args.archive:
+                from sdk_tools import SDKArchive
+                archive = SDKArchive(*args.archive).open()
+                names = sorted(name for name in archive.names()
+                               if find_index(args.parsed_dir, name))
+            elif args.scf_dir:
+                names = sorted(p.stem for p in Path(args.scf_dir).glob('*.SCF'))
+            else:
+                names = sorted({p.stem for p in Path(args.parsed_dir).iterdir()
+                                if p.suffix in ('.json', '.jsonl', scf_index.EXTENSION)})
+            print(f"📋 Found {len(names)} scenes")
+            
+            os.makedirs(args.output_dir, exist_ok=True)
+            rebuilt = 0
+            
+            for name in names:
+                # .tsv sparse diutamakan, fallback ke TXT per baris
+                txt_path = os.path.join(args.txt_dir, f"{name}{SPARSE_EXTENSION}")
+                if not os.path.exists(txt_path):
+                    txt_path = os.path.join(args.txt_dir, f"{name}.txt")
+                if not os.path.exists(txt_path):
+                    print(f"⚠️  Warning: {name}.txt tidak ditemukan, skip...")
+                    continue
+                
+                output_path = os.path.join(args.output_dir, f"{name}.SCF")
+                
+                if archive or args.scf_dir:
+                    if archive:
+                        scf_source = archive.read_entry(name)
+                    else:
+                        scf_source = os.path.join(args.scf_dir, f"{name}.SCF")
+                    index_path = os.path.join(args.parsed_dir, f"{name}{scf_index.EXTENSION}")
+                    if not os.path.exists(index_path):
+                        index_path = None
+                    
+                    print(f"\n🔨 {name} (SCF original + {Path(txt_path).name})")
+                    with open_output(output_path) as f:
+                        scf.rebuild_from_source(scf_source, read_texts(txt_path), f, index_path,
+                                                relocate=args.relocate)
+                else:
+                    index_path = find_index(args.parsed_dir, name)
+                    print(f"\n🔨 {name} ({Path(index_path).name} + {Path(txt_path).name})")
+                    with open_output(output_path) as f:
+                        scf.rebuild_into(scf.load(index_path), read_texts(txt_path), f,
+                                         relocate=args.relocate)
+                
+                rebuilt += 1
+            
+            if archive:
+                archive.close()
+            
+            print(f"\n✅ Rebuilt {rebuilt}/{len(names)} files. Output: {args.output_dir}")
     
     except Exception as e:
         print(f"❌ Error: {e}")
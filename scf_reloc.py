@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+SCF Reloc - Relocation pointer untuk rebuild dengan panjang text berubah
+
+Jika rebuild membuat segment text lebih panjang/pendek, semua offset
+setelahnya bergeser dan pointer 32-bit di script (mis. offset text atau
+target jump) jadi salah. Modul ini:
+
+1. scan_relocations: cari field little-endian uint32 yang nilainya sama
+   dengan offset awal segment text (kandidat pointer), di luar segment
+   text itu sendiri. Hasilnya tabel relocation urut posisi field.
+2. shift_table: dari segment yang diganti, bangun tabel (akhir segment
+   original, delta kumulatif) untuk lookup posisi baru dengan bisect.
+3. splice_relocated: seperti splice_chunks, tapi span original yang berisi
+   field relocation di-copy dan nilai field-nya di-patch, dalam satu pass.
+
+Catatan: deteksi berbasis nilai, jadi kandidat bisa berisi false positive
+(angka biasa yang kebetulan sama dengan offset text). Target 0 tidak
+pernah dianggap pointer.
+"""
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress
+from typing import Dict, Iterator, Tuple
+
+
+FIELD = struct.Struct('<I')
+
+
+def scan_relocations(data, offsets, lengths, align: int = 1) -> Tuple[array, array]:
+    """
+    Cari kandidat pointer ke awal segment text
+
+    Args:
+        data: Byte SCF original
+        offsets, lengths: Batas semua segment text (urut offset)
+        align: Hanya cek field di posisi kelipatan align (1 = semua posisi)
+
+    Returns:
+        (fields, targets): array posisi field (urut) dan nilai target-nya
+    """
+    if align not in (1, 2, 4):
+        raise ValueError(f"Align harus 1, 2 atau 4: {align}")
+
+    wanted = set(offsets)
+    wanted.discard(0)
+    view = memoryview(data)
+    size = len(view)
+    found = []
+
+    # Baca semua word uint32 sekaligus per residu posisi (mod 4),
+    # lalu saring dengan set lookup di C (map + compress)
+    for start in range(0, min(4, size), align):
+        count = (size - start) // 4
+        words = array('I')
+        words.frombytes(view[start:start + count * 4])
+        if sys.byteorder == 'big':
+            words.byteswap()
+        found.extend(compress(range(start, start + count * 4, 4), map(wanted.__contains__, words)))
+
+    found.sort()
+
+    fields = array('I')
+    targets = array('I')
+    for pos in found:
+        # Field yang menimpa segment text bukan pointer (bagian dari text)
+        i = bisect_right(offsets, pos + 3) - 1
+        if i >= 0 and offsets[i] + lengths[i] > pos:
+            continue
+        fields.append(pos)
+        targets.append(FIELD.unpack_from(view, pos)[0])
+
+    return fields, targets
+
+
+def shift_table(offsets, lengths, replacements: Dict[int, bytes]) -> Tuple[array, array]:
+    """
+    Tabel pergeseran dari segment yang diganti
+
+    Returns (ends, deltas): ends[k] = akhir segment original ke-k yang
+    diganti (urut), deltas[k] = total perubahan ukuran sampai segment itu
+    """
+    ends = array('I')
+    deltas = array('q')
+    total = 0
+
+    for i in sorted(replacements):
+        total += len(replacements[i]) - lengths[i]
+        ends.append(offsets[i] + lengths[i])
+        deltas.append(total)
+
+    return ends, deltas
+
+
+def new_position(pos: int, ends, deltas) -> int:
+    """Posisi baru dari posisi original (di luar segment yang diganti)"""
+    k = bisect_right(ends, pos)
+    return pos + deltas[k - 1] if k else pos
+
+
+def splice_relocated(data, offsets, lengths, replacements: Dict[int, bytes],
+                     fields, targets) -> Iterator:
+    """
+    splice_chunks + patch pointer dalam satu pass maju
+
+    Span original tanpa field relocation di-yield sebagai memoryview
+    (tanpa copy); span yang berisi field di-copy lalu setiap field diisi
+    posisi baru targetnya.
+    """
+    view = memoryview(data)
+    ends, deltas = shift_table(offsets, lengths, replacements)
+
+    def span(start: int, stop: int):
+        lo = bisect_left(fields, start)
+        hi = bisect_left(fields, stop)
+        if lo == hi:
+            return view[start:stop]
+
+        chunk = None
+        for k in range(lo, hi):
+            target = new_position(targets[k], ends, deltas)
+            if target == targets[k]:
+                continue
+            if chunk is None:
+                chunk = bytearray(view[start:stop])
+            FIELD.pack_into(chunk, fields[k] - start, target)
+
+        return view[start:stop] if chunk is None else chunk
+
+    pos = 0
+    for i in sorted(replacements):
+        offset = offsets[i]
+        if offset > pos:
+            yield span(pos, offset)
+        yield replacements[i]
+        pos = offset + lengths[i]
+
+    if pos < len(view):
+        yield span(pos, len(view))
+
+
+def main():
+    """CLI: tampilkan tabel relocation satu SCF"""
+    import argparse
+    import json
+
+    from scf_parser_v2 import SCFParserV2, segment_bounds
+
+    parser = argparse.ArgumentParser(description='SCF Reloc - Scan kandidat pointer ke segment text')
+    parser.add_argument('scf', help='SCF original')
+    parser.add_argument('--index', help='Optional .scfidx untuk batas segment')
+    parser.add_argument('--align', type=int, default=1, choices=(1, 2, 4),
+                        help='Hanya field di posisi kelipatan align (default: 1)')
+    parser.add_argument('--output', help='Tulis tabel relocation ke JSON')
+
+    args = parser.parse_args()
+
+    try:
+        parsed = SCFParserV2().load_source(args.scf, args.index)
+        offsets, lengths = segment_bounds(parsed['text_segments'])
+        fields, targets = scan_relocations(parsed['text_segments'].buffer, offsets, lengths, args.align)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    print(f"📋 {len(offsets)} segment text, {len(fields)} kandidat pointer")
+    for field, target in list(zip(fields, targets))[:20]:
+        print(f"   0x{field:08x} -> 0x{target:08x}")
+    if len(fields) > 20:
+        print(f"   ... {len(fields) - 20} lainnya")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'source': parsed['source'], 'sha256': parsed['sha256'], 'align': args.align,
+                       'relocations': [[field, target] for field, target in zip(fields, targets)]}, f)
+        print(f"✅ Tabel relocation: {args.output}")
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
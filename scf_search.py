@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+SCF Search - Full-text search semua text scene di DSK (SQLite FTS5)
+
+index: load setiap segment text dari DSK (scene, offset, text original,
+       translation) ke database SQLite. Incremental: scene yang isinya dan
+       file translation-nya tidak berubah sejak index terakhir di-skip.
+search: cari text original/translation di seluruh game.
+
+Tokenizer FTS5 'trigram' dipakai karena text Jepang tidak punya spasi
+antar kata, jadi query apa pun dengan panjang >= 3 karakter bisa dicari
+lewat index. Query yang lebih pendek fallback ke LIKE.
+"""
+
+import hashlib
+import os
+import sqlite3
+import sys
+import time
+from typing import List, Tuple
+
+import scf_codec
+import scf_disasm
+from scf_parser_v2 import SCFParserV2, SPARSE_EXTENSION, read_texts, segment_id
+from sdk_tools import SDKArchive
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scenes (
+    name TEXT PRIMARY KEY,
+    sha256 TEXT NOT NULL,
+    translation TEXT NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS segments USING fts5(
+    scene UNINDEXED,
+    offset UNINDEXED,
+    original,
+    translation,
+    tokenize = 'trigram'
+);
+"""
+
+COLUMNS = ('original', 'translation')
+MIN_TRIGRAM = 3
+
+
+def connect(db_path: str) -> sqlite3.Connection:
+    """Buka database index (dibuat jika belum ada)"""
+    db = sqlite3.connect(db_path)
+    db.executescript(SCHEMA)
+    return db
+
+
+def translation_path(translated_dir: str, name: str) -> str:
+    """File translation scene: .tsv sparse diutamakan, fallback ke TXT"""
+    if not translated_dir:
+        return None
+    for ext in (SPARSE_EXTENSION, '.txt'):
+        path = os.path.join(translated_dir, f"{name}{ext}")
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def file_signature(path: str) -> str:
+    """Penanda perubahan file translation (mtime + size), '' jika tidak ada"""
+    if not path:
+        return ''
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def scene_rows(scf: SCFParserV2, name: str, data: bytes, translation: str) -> List[Tuple]:
+    """Row (scene, offset, original, translation) untuk setiap segment text"""
+    segments = scf.parse_buffer(data)['text_segments']
+    new_texts = read_texts(translation)
+
+    if isinstance(new_texts, dict):
+        view = memoryview(data)
+        translations = [new_texts.get(segment_id(offset, view[offset:offset + length]))
+                        for offset, length in zip(segments.offsets, segments.lengths)]
+    else:
+        new_texts = new_texts or []
+        translations = new_texts[:len(segments)] + [None] * (len(segments) - len(new_texts))
+
+    return [(name, offset, text, translated if translated != text else None)
+            for offset, text, translated in zip(segments.offsets, segments.texts, translations)]
+
+
+def build_index(db_path: str, archive: str, index: str = None, translated_dir: str = None,
+                encoding: str = 'shift_jis', spec: scf_disasm.OpcodeSpec = None) -> dict:
+    """
+    Update index database dari DSK (+ translation di translated_dir)
+
+    encoding/spec diteruskan ke SCFParserV2, sama seperti extract. Keduanya
+    ikut disimpan di signature scene, jadi ganti encoding atau spec membuat
+    semua scene di-index ulang.
+
+    Returns statistik: jumlah scene diupdate, di-skip, dihapus, dan segment
+    """
+    db = connect(db_path)
+    known = {name: (sha256, translation) for name, sha256, translation
+             in db.execute("SELECT name, sha256, translation FROM scenes")}
+    stats = {'updated': 0, 'skipped': 0, 'removed': 0, 'segments': 0}
+    scf = SCFParserV2(encoding=encoding, spec=spec)
+    config = f"{encoding}:{spec.sha256 if spec else ''}"
+    seen = set()
+
+    with db, SDKArchive(archive, index).open() as sdk:
+        for name, data in sdk.iter_entries():
+            seen.add(name)
+            sha256 = hashlib.sha256(data).hexdigest()
+            translation = translation_path(translated_dir, name)
+            signature = f"{config}|{file_signature(translation)}"
+
+            if known.get(name) == (sha256, signature):
+                stats['skipped'] += 1
+                continue
+
+            rows = scene_rows(scf, name, data, translation)
+            db.execute("DELETE FROM segments WHERE scene = ?", (name,))
+            db.executemany("INSERT INTO segments (scene, offset, original, translation) VALUES (?, ?, ?, ?)", rows)
+            db.execute("INSERT OR REPLACE INTO scenes (name, sha256, translation) VALUES (?, ?, ?)",
+                       (name, sha256, signature))
+
+            stats['updated'] += 1
+            stats['segments'] += len(rows)
+
+        for name in set(known) - seen:
+            db.execute("DELETE FROM segments WHERE scene = ?", (name,))
+            db.execute("DELETE FROM scenes WHERE name = ?", (name,))
+            stats['removed'] += 1
+
+    db.close()
+    return stats
+
+
+def search(db_path: str, query: str, column: str = None, limit: int = 50) -> List[Tuple]:
+    """
+    Cari query di text original/translation
+
+    Returns list (scene, offset, original, translation), urut scene + offset
+    """
+    if not os.path.exists(db_path):
+        raise FileNotFoundError(f"Database index tidak ditemukan: {db_path} (jalankan 'index' dulu)")
+
+    columns = (column,) if column else COLUMNS
+    db = connect(db_path)
+
+    if len(query) >= MIN_TRIGRAM:
+        # Phrase query; kolom dibatasi lewat filter {kolom}
+        phrase = '"' + query.replace('"', '""') + '"'
+        match = f"{{{' '.join(columns)}}} : {phrase}"
+        sql = ("SELECT scene, offset, original, translation FROM segments "
+               "WHERE segments MATCH ? ORDER BY scene, offset LIMIT ?")
+        params = (match, limit)
+    else:
+        # Trigram tidak bisa index query < 3 karakter
+        pattern = '%' + query.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        where = ' OR '.join(f"{c} LIKE ? ESCAPE '\\'" for c in columns)
+        sql = (f"SELECT scene, offset, original, translation FROM segments "
+               f"WHERE {where} ORDER BY scene, offset LIMIT ?")
+        params = (pattern,) * len(columns) + (limit,)
+
+    rows = db.execute(sql, params).fetchall()
+    db.close()
+    return rows
+
+
+def main():
+    """CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='SCF Search - Full-text search text scene (SQLite FTS5)',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+1. Index semua scene di DSK (+ translation):
+   python scf_search.py index scene.db scene.DSK scene.PFT [--translated translated_dir/]
+   python scf_search.py index scene.db scene.DSK scene.PFT --spec opcodes.json --glyph-map glyphs.json
+
+2. Cari text:
+   python scf_search.py search scene.db "静かに笑った"
+   python scf_search.py search scene.db "smiled" --column translation
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    index_parser = subparsers.add_parser('index')
+    index_parser.add_argument('db', help='Database SQLite')
+    index_parser.add_argument('archive', help='Path ke file .DSK')
+    index_parser.add_argument('index', help='Path ke file .PFT')
+    index_parser.add_argument('--translated', help='Directory TXT/.tsv translation (optional)')
+    index_parser.add_argument('--encoding', default='shift_jis', help='Encoding SCF (default: shift_jis)')
+    index_parser.add_argument('--glyph-map', help='Konfigurasi JSON codec remap (lihat scf_codec.py)')
+    index_parser.add_argument('--spec', help='Spec opcode JSON (scf_disasm.py) untuk segment text')
+
+    search_parser = subparsers.add_parser('search')
+    search_parser.add_argument('db', help='Database SQLite')
+    search_parser.add_argument('query', help='Text yang dicari')
+    search_parser.add_argument('--column', choices=COLUMNS, help='Cari hanya di kolom ini')
+    search_parser.add_argument('--limit', type=int, default=50, help='Maksimal hasil (default: 50)')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    try:
+        if args.command == 'index':
+            encoding = args.encoding
+            if args.glyph_map:
+                encoding = scf_codec.load_config(args.glyph_map)
+            spec = scf_disasm.OpcodeSpec.load(args.spec) if args.spec else None
+
+            start = time.perf_counter()
+            stats = build_index(args.db, args.archive, args.index, args.translated,
+                                encoding, spec)
+            elapsed = time.perf_counter() - start
+
+            print(f"📇 {stats['updated']} scene diupdate ({stats['segments']} segments), "
+                  f"{stats['skipped']} tidak berubah, {stats['removed']} dihapus")
+            print(f"✅ Index: {args.db} ({elapsed:.2f}s)")
+
+        elif args.command == 'search':
+            start = time.perf_counter()
+            rows = search(args.db, args.query, args.column, args.limit)
+            elapsed = time.perf_counter() - start
+
+            for scene, offset, original, translation in rows:
+                print(f"{scene} 0x{offset:08x}  {original}")
+                if translation:
+                    print(f"{'':20}→ {translation}")
+
+            print(f"\n🔍 {len(rows)} hasil ({elapsed * 1000:.1f}ms)")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
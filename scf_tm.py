@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+SCF TM - Translation memory untuk pre-fill translation scene baru
+
+Pasangan (text original, translation) disimpan di file TSV. Lookup:
+- Exact: hash index (dict) text original -> translation
+- Fuzzy: inverted index n-gram karakter -> entry. Kandidat hanya diambil
+  dari n-gram paling jarang (prefix filter, sesuai threshold), entry yang
+  dihitung dibatasi max_scan dan yang diberi skor Dice dibatasi
+  max_candidates. Jadi cost lookup terbatas, juga untuk text dengan kosakata
+  umum yang posting list-nya panjang.
+
+Workflow:
+1. learn: simpan pasangan dari TXT original + TXT yang sudah ditranslate
+2. fill:  TXT yang belum ditranslate di-isi dari exact match, fuzzy match
+          ditulis ke <scene>.suggest.tsv sebagai saran
+"""
+
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+
+NGRAM = 2
+DEFAULT_THRESHOLD = 0.7
+MAX_CANDIDATES = 32
+# Maksimal entry posting list yang dihitung per lookup
+MAX_SCAN = 4096
+SUGGEST_SUFFIX = '.suggest.tsv'
+
+_ESCAPES = {'\\': '\\\\', '\t': '\\t', '\n': '\\n', '\r': '\\r'}
+_UNESCAPES = {'\\': '\\', 't': '\t', 'n': '\n', 'r': '\r'}
+
+
+def escape(text: str) -> str:
+    """Escape tab/newline/CR supaya satu pasangan = satu baris TSV"""
+    if '\\' not in text and '\t' not in text and '\n' not in text and '\r' not in text:
+        return text
+    return ''.join(_ESCAPES.get(c, c) for c in text)
+
+
+def unescape(text: str) -> str:
+    if '\\' not in text:
+        return text
+    out = []
+    chars = iter(text)
+    for c in chars:
+        out.append(_UNESCAPES.get(next(chars, ''), '') if c == '\\' else c)
+    return ''.join(out)
+
+
+def ngrams(text: str, n: int = NGRAM) -> set:
+    """Set n-gram karakter (text lebih pendek dari n jadi satu gram)"""
+    if len(text) <= n:
+        return {text} if text else set()
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+def dice(a: set, b: set) -> float:
+    return 2 * len(a & b) / (len(a) + len(b)) if a or b else 1.0
+
+
+class TranslationMemory:
+    """Translation memory dengan exact hash lookup + fuzzy n-gram lookup"""
+
+    def __init__(self, path: str = None):
+        self.path = path
+        self.sources: List[str] = []
+        self.targets: List[str] = []
+        self.exact: Dict[str, int] = {}
+        self.postings: Dict[str, List[int]] = {}
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self) -> int:
+        return len(self.sources)
+
+    def add(self, source: str, target: str):
+        """Tambah/update pasangan (translation terbaru menang)"""
+        entry = self.exact.get(source)
+        if entry is not None:
+            self.targets[entry] = target
+            return
+
+        entry = self.exact[source] = len(self.sources)
+        self.sources.append(source)
+        self.targets.append(target)
+
+        for gram in ngrams(source):
+            self.postings.setdefault(gram, []).append(entry)
+
+    def get(self, source: str) -> str:
+        """Exact match, atau None"""
+        entry = self.exact.get(source)
+        return None if entry is None else self.targets[entry]
+
+    def fuzzy(self, text: str, threshold: float = DEFAULT_THRESHOLD, limit: int = 1,
+              max_candidates: int = MAX_CANDIDATES, max_scan: int = MAX_SCAN) -> List[Tuple[float, str, str]]:
+        """
+        Cari pasangan paling mirip: list (skor Dice, source, target), skor menurun
+
+        Entry dengan skor >= threshold pasti punya minimal satu n-gram di
+        antara (jumlah gram - overlap minimal + 1) gram paling jarang milik
+        text, jadi hanya posting list gram-gram itu yang dibaca, dari yang
+        paling jarang. Total entry yang dihitung dibatasi max_scan: posting
+        list gram umum (mis. 'です') yang melewati batas hanya dibaca entry
+        terbarunya, jadi cost lookup tetap terbatas walaupun text sangat
+        repetitif (dengan risiko kandidat yang hanya berbagi gram umum
+        terlewat).
+        """
+        query = ngrams(text)
+        if not query:
+            return []
+
+        # Dice >= t  =>  overlap >= t * |query| / (2 - t)
+        min_overlap = max(1, int(threshold * len(query) / (2 - threshold) + 0.999999))
+        prefix = len(query) - min_overlap + 1
+        if prefix <= 0:
+            return []
+
+        postings = sorted((self.postings.get(gram, ()) for gram in query), key=len)
+        counts = Counter()
+        budget = max_scan
+        for posting in postings[:prefix]:
+            if budget <= 0:
+                break
+            counts.update(posting[-budget:])
+            budget -= len(posting)
+
+        results = []
+        for entry, _ in counts.most_common(max_candidates):
+            score = dice(query, ngrams(self.sources[entry]))
+            if score >= threshold:
+                results.append((score, self.sources[entry], self.targets[entry]))
+
+        results.sort(key=lambda r: -r[0])
+        return results[:limit]
+
+    def lookup(self, text: str, threshold: float = DEFAULT_THRESHOLD) -> Tuple[float, str, str]:
+        """Exact match (skor 1.0) atau fuzzy match terbaik, None jika tidak ada"""
+        target = self.get(text)
+        if target is not None:
+            return 1.0, text, target
+        results = self.fuzzy(text, threshold)
+        return results[0] if results else None
+
+    def load(self, path: str):
+        """Load pasangan dari TSV 'source<TAB>target' (escaped)"""
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                source, sep, target = line.rstrip('\n').partition('\t')
+                if sep:
+                    self.add(unescape(source), unescape(target))
+
+    def save(self, path: str = None):
+        """Tulis semua pasangan ke TSV (tmp + replace)"""
+        path = path or self.path
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for source, target in zip(self.sources, self.targets):
+                f.write(f"{escape(source)}\t{escape(target)}\n")
+
+        os.replace(tmp_path, path)
+
+
+def read_lines(txt_path: str) -> List[str]:
+    with open(txt_path, 'r', encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+def learn(tm: TranslationMemory, original_dir: str, translated_dir: str) -> int:
+    """
+    Tambah pasangan dari TXT original + TXT translation dengan nama sama
+
+    Hanya baris yang benar-benar ditranslate (berbeda dari original).
+    Returns jumlah pasangan yang dibaca.
+    """
+    added = 0
+
+    for txt_path in sorted(Path(translated_dir).glob('*.txt')):
+        original_path = Path(original_dir) / txt_path.name
+        if not original_path.exists():
+            continue
+
+        for source, target in zip(read_lines(original_path), read_lines(txt_path)):
+            if source and target and source != target:
+                tm.add(source, target)
+                added += 1
+
+    return added
+
+
+def fill(tm: TranslationMemory, original_dir: str, translated_dir: str,
+         threshold: float = DEFAULT_THRESHOLD) -> Tuple[int, int]:
+    """
+    Pre-fill TXT di translated_dir dari translation memory
+
+    Baris yang masih sama dengan original diganti dengan exact match.
+    Fuzzy match (tidak di-isi otomatis) ditulis ke <scene>.suggest.tsv:
+    "nomor baris<TAB>skor<TAB>source<TAB>translation".
+
+    Returns (jumlah baris di-isi, jumlah saran fuzzy)
+    """
+    filled = suggested = 0
+
+    for txt_path in sorted(Path(translated_dir).glob('*.txt')):
+        original_path = Path(original_dir) / txt_path.name
+        if not original_path.exists():
+            continue
+
+        lines = read_lines(txt_path)
+        suggestions = []
+        changed = False
+
+        for i, source in enumerate(read_lines(original_path)[:len(lines)]):
+            if not source or lines[i] != source:
+                continue
+
+            target = tm.get(source)
+            if target is not None:
+                lines[i] = target
+                changed = True
+                filled += 1
+                continue
+
+            for score, match, target in tm.fuzzy(source, threshold):
+                suggestions.append(f"{i + 1}\t{score:.2f}\t{escape(match)}\t{escape(target)}\n")
+
+        if changed:
+            with open(txt_path, 'w', encoding='utf-8') as f:
+                f.write('\n'.join(lines) + '\n')
+
+        suggest_path = txt_path.with_name(txt_path.stem + SUGGEST_SUFFIX)
+        if suggestions:
+            with open(suggest_path, 'w', encoding='utf-8') as f:
+                f.writelines(suggestions)
+            suggested += len(suggestions)
+        elif suggest_path.exists():
+            suggest_path.unlink()
+
+    return filled, suggested
+
+
+def main():
+    """CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='SCF TM - Translation memory',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+1. Simpan translation yang sudah ada ke memory:
+   python scf_tm.py learn memory.tsv parsed_dir/ translated_dir/
+
+2. Pre-fill TXT scene baru dari memory:
+   python scf_tm.py fill memory.tsv parsed_dir/ translated_dir/ [--threshold 0.7]
+
+3. Cek satu baris:
+   python scf_tm.py lookup memory.tsv "彼女は静かに笑った。"
+        """
+    )
+
+    subparsers = parser.add_subparsers(dest='command')
+
+    learn_parser = subparsers.add_parser('learn')
+    learn_parser.add_argument('tm', help='File translation memory (.tsv)')
+    learn_parser.add_argument('original_dir', help='Directory TXT original (hasil extract)')
+    learn_parser.add_argument('translated_dir', help='Directory TXT yang sudah ditranslate')
+
+    fill_parser = subparsers.add_parser('fill')
+    fill_parser.add_argument('tm', help='File translation memory (.tsv)')
+    fill_parser.add_argument('original_dir', help='Directory TXT original (hasil extract)')
+    fill_parser.add_argument('translated_dir', help='Directory TXT yang akan di-isi')
+    fill_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                             help=f'Skor minimal fuzzy match (default: {DEFAULT_THRESHOLD})')
+
+    lookup_parser = subparsers.add_parser('lookup')
+    lookup_parser.add_argument('tm', help='File translation memory (.tsv)')
+    lookup_parser.add_argument('text', help='Text original')
+    lookup_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                               help=f'Skor minimal fuzzy match (default: {DEFAULT_THRESHOLD})')
+
+    args = parser.parse_args()
+
+    if not args.command:
+        parser.print_help()
+        return 0
+
+    try:
+        tm = TranslationMemory(args.tm)
+        print(f"📚 Translation memory: {len(tm)} pasangan")
+
+        if args.command == 'learn':
+            added = learn(tm, args.original_dir, args.translated_dir)
+            tm.save()
+            print(f"✅ {added} baris dipelajari, total {len(tm)} pasangan")
+
+        elif args.command == 'fill':
+            filled, suggested = fill(tm, args.original_dir, args.translated_dir, args.threshold)
+            print(f"✅ {filled} baris di-isi (exact), {suggested} saran fuzzy (*{SUGGEST_SUFFIX})")
+
+        elif args.command == 'lookup':
+            target = tm.get(args.text)
+            if target is not None:
+                results = [(1.0, args.text, target)]
+            else:
+                results = tm.fuzzy(args.text, args.threshold, limit=5)
+
+            if not results:
+                print("   (tidak ada match)")
+            for score, source, target in results:
+                print(f"   {score:.2f}  {source}  →  {target}")
+
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""
+SCF Validate - Pre-flight check translation sebelum rebuild
+
+Semua baris translation di satu directory dicek sekaligus:
+- encode:  text bisa di-encode ke encoding SCF (default Shift-JIS)
+- null:    text tidak berisi null byte (akan memotong segment di game)
+- length:  panjang byte hasil encode vs panjang segment original
+           (warning; error jika --fixed) atau --budget (error)
+- count:   jumlah baris TXT sama dengan jumlah segment
+
+Per scene semua baris di-encode dalam satu panggilan encode(). Baris
+dipisah '\\n' (0x0A tidak pernah muncul sebagai trail byte Shift-JIS),
+jadi panjang byte per baris didapat dari split hasil encode. Hanya scene
+yang gagal di-encode yang dicek ulang per baris.
+
+Output: report JSON (machine-readable), exit code 1 jika ada error.
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+import scf_codec
+import scf_dedup
+import scf_index
+from scf_parser_v2 import (SCFParserV2, SPARSE_EXTENSION, find_index, read_texts,
+                           segment_id_offset)
+
+
+REPORT_VERSION = 1
+SEVERITIES = ('error', 'warning')
+
+
+def original_segments(parsed_dir: str, name: str, encoding: str) -> Tuple[list, list, List[str]]:
+    """
+    (offsets, lengths, texts) segment original scene
+
+    Dari index scene di parsed_dir (.scfidx/.json/.jsonl). unique.txt hasil
+    scf_dedup.py dari strings.json, tanpa index dari TXT original: offset
+    None dan panjang = text original di-encode + null.
+    """
+    index_path = find_index(parsed_dir, name)
+
+    if index_path:
+        parsed = SCFParserV2.load(index_path)
+        segments = parsed['text_segments']
+        if isinstance(segments, scf_index.SegmentIndex):
+            columns = segments.columns()
+            segments.close()
+            return columns
+        return ([seg['offset'] for seg in segments], [seg['length'] for seg in segments],
+                [seg['text'] for seg in segments])
+
+    if is_unique(parsed_dir, name):
+        # Baseline dari tabel, bukan dari unique.txt yang bisa saja rusak
+        texts = [entry['text'] for entry in scf_dedup.load_table(parsed_dir)['strings']]
+    else:
+        texts = read_texts(os.path.join(parsed_dir, f"{name}.txt"))
+    if texts is None:
+        return None
+    lengths = [len(text.encode(encoding, 'ignore')) + 1 for text in texts]
+    return [None] * len(texts), lengths, texts
+
+
+def is_unique(parsed_dir: str, name: str) -> bool:
+    """True jika name adalah unique.txt dari tabel string unik di parsed_dir"""
+    return (name == Path(scf_dedup.UNIQUE_TXT).stem
+            and os.path.exists(os.path.join(parsed_dir, scf_dedup.TABLE_JSON)))
+
+
+def encode_lines(lines: List[str], encoding: str) -> Tuple[List[int], dict]:
+    """
+    Encode semua baris sekaligus
+
+    Returns (panjang byte per baris, {index baris: karakter yang gagal})
+    """
+    try:
+        encoded = '\n'.join(lines).encode(encoding).split(b'\n')
+        # Baris yang berisi newline sendiri (mis. dari unique.txt) tidak bisa dipisah lagi
+        if len(encoded) == len(lines):
+            return [len(line) for line in encoded], {}
+    except UnicodeEncodeError:
+        pass
+
+    # Jalur lambat hanya untuk scene yang punya baris bermasalah
+    lengths = []
+    failures = {}
+    for i, line in enumerate(lines):
+        try:
+            lengths.append(len(line.encode(encoding)))
+        except UnicodeEncodeError:
+            lengths.append(len(line.encode(encoding, 'replace')))
+            failures[i] = sorted({c for c in line if not _encodable(c, encoding)})
+    return lengths, failures
+
+
+def _encodable(char: str, encoding: str) -> bool:
+    try:
+        char.encode(encoding)
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def validate_scene(name: str, original, translation, encoding: str,
+                   budget: int = None, fixed: bool = False) -> List[dict]:
+    """
+    Validasi translation satu scene
+
+    Args:
+        original: (offsets, lengths, texts) dari original_segments
+        translation: List text (TXT) atau dict ID -> text (.tsv sparse)
+        budget: Batas byte per text (tanpa null), None = tanpa batas
+        fixed: Text lebih panjang dari segment original adalah error
+
+    Returns list issue (dict)
+    """
+    offsets, lengths, texts = original
+    issues = []
+
+    def issue(check, severity, line, detail, seg=None):
+        issues.append({
+            'scene': name,
+            'line': line,
+            'offset': offsets[seg] if seg is not None else None,
+            'check': check,
+            'severity': severity,
+            'detail': detail
+        })
+
+    if isinstance(translation, dict):
+        # .tsv: cocokkan ID ke segment lewat offset
+        by_offset = {offset: i for i, offset in enumerate(offsets)}
+        seg_numbers, line_numbers, lines = [], [], []
+        for entry_no, (seg_id, text) in enumerate(translation.items(), 1):
+            seg = by_offset.get(segment_id_offset(seg_id))
+            if seg is None:
+                issue('count', 'error', entry_no, f"Segment ID {seg_id} tidak ada di scene")
+                continue
+            seg_numbers.append(seg)
+            line_numbers.append(entry_no)
+            lines.append(text)
+    else:
+        if len(translation) != len(texts):
+            issue('count', 'error', None,
+                  f"Jumlah baris {len(translation)} != jumlah segment {len(texts)}")
+        lines = translation[:len(texts)]
+        seg_numbers = range(len(lines))
+        line_numbers = range(1, len(lines) + 1)
+
+    byte_lengths, failures = encode_lines(lines, encoding)
+
+    for i, (seg, line_no, text, size) in enumerate(zip(seg_numbers, line_numbers, lines, byte_lengths)):
+        if i in failures:
+            chars = ''.join(failures[i])
+            issue('encode', 'error', line_no, f"Tidak bisa di-encode ke {encoding}: {chars!r}", seg)
+            continue
+
+        if '\x00' in text:
+            issue('null', 'error', line_no, "Text berisi null byte", seg)
+
+        if text == texts[seg]:
+            continue
+
+        if budget is not None and size > budget:
+            issue('length', 'error', line_no, f"{size} byte > budget {budget} byte", seg)
+        elif size + 1 > lengths[seg]:
+            issue('length', 'error' if fixed else 'warning', line_no,
+                  f"{size} byte > original {lengths[seg] - 1} byte", seg)
+
+    return issues
+
+
+def validate_dir(parsed_dir: str, translated_dir: str, encoding: str = 'shift_jis',
+                 budget: int = None, fixed: bool = False) -> dict:
+    """Validasi semua TXT/.tsv di translated_dir, return report (dict)"""
+    start = time.perf_counter()
+
+    names = sorted({p.stem for p in Path(translated_dir).iterdir()
+                    if p.suffix in ('.txt', SPARSE_EXTENSION) and '.' not in p.stem})
+
+    issues = []
+    lines = 0
+    checked = 0
+
+    for name in names:
+        # .tsv sparse diutamakan, sama seperti batch-rebuild
+        translation_path = os.path.join(translated_dir, f"{name}{SPARSE_EXTENSION}")
+        if not os.path.exists(translation_path):
+            translation_path = os.path.join(translated_dir, f"{name}.txt")
+
+        original = original_segments(parsed_dir, name, encoding)
+        if original is None:
+            issues.append({'scene': name, 'line': None, 'offset': None, 'check': 'count',
+                           'severity': 'warning', 'detail': "Original tidak ditemukan, skip"})
+            continue
+
+        if is_unique(parsed_dir, name):
+            translation = scf_dedup.read_unique(translation_path)
+        else:
+            translation = read_texts(translation_path)
+        issues.extend(validate_scene(name, original, translation, encoding, budget, fixed))
+        lines += len(translation)
+        checked += 1
+
+    summary = {severity: sum(1 for i in issues if i['severity'] == severity) for severity in SEVERITIES}
+    summary.update({'scenes': checked, 'lines': lines,
+                    'seconds': round(time.perf_counter() - start, 4)})
+
+    return {
+        'version': REPORT_VERSION,
+        'encoding': encoding,
+        'budget': budget,
+        'fixed': fixed,
+        'summary': summary,
+        'issues': issues
+    }
+
+
+def main():
+    """CLI"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description='SCF Validate - Pre-flight check translation sebelum rebuild',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Examples:
+   python scf_validate.py parsed_dir/ translated_dir/ --report validate.json
+   python scf_validate.py parsed_dir/ translated_dir/ --fixed       (rebuild mode fixed)
+   python scf_validate.py parsed_dir/ translated_dir/ --budget 40   (maks 40 byte per text)
+        """
+    )
+
+    parser.add_argument('parsed_dir', help='Directory hasil extract (index scene / TXT original)')
+    parser.add_argument('translated_dir', help='Directory TXT/.tsv translation')
+    parser.add_argument('--encoding', default='shift_jis', help='Encoding SCF (default: shift_jis)')
+    parser.add_argument('--glyph-map', help='Konfigurasi JSON codec remap (lihat scf_codec.py)')
+    parser.add_argument('--budget', type=int, help='Batas byte per text (tanpa null terminator)')
+    parser.add_argument('--fixed', action='store_true',
+                        help='Text lebih panjang dari original adalah error (rebuild mode fixed)')
+    parser.add_argument('--report', help='Tulis report JSON ke file (default: stdout)')
+
+    args = parser.parse_args()
+
+    try:
+        encoding = args.encoding
+        if args.glyph_map:
+            encoding = scf_codec.load_config(args.glyph_map)
+
+        report = validate_dir(args.parsed_dir, args.translated_dir, encoding,
+                              args.budget, args.fixed)
+    except Exception as e:
+        print(f"❌ Error: {e}")
+        import traceback
+        traceback.print_exc()
+        return 2
+
+    summary = report['summary']
+
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        # Error ditampilkan lebih dulu, sisanya lihat report
+        shown = sorted(report['issues'], key=lambda item: SEVERITIES.index(item['severity']))
+        for item in shown[:20]:
+            icon = '❌' if item['severity'] == 'error' else '⚠️ '
+            where = f"{item['scene']}:{item['line']}" if item['line'] else item['scene']
+            print(f"{icon} {where} [{item['check']}] {item['detail']}")
+        if len(report['issues']) > 20:
+            print(f"   ... {len(report['issues']) - 20} lainnya di {args.report}")
+
+        print(f"\n📋 {summary['scenes']} scenes, {summary['lines']} baris: "
+              f"{summary['error']} error, {summary['warning']} warning ({summary['seconds']:.3f}s)")
+        print(f"✅ Report: {args.report}")
+    else:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+
+    return 1 if summary['error'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
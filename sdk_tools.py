@@ -9,16 +9,56 @@ Format file:
 - SCNDAT.TBL: Tabel data scene
 """
 
+import io
+import mmap
 import struct
 import os
 import sys
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
 from pathlib import Path
 from typing import List, Tuple, Dict
 
 
+# Thread untuk unpack paralel (I/O bound, tapi tetap dibatasi)
+DEFAULT_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
+def _copy_range(src_fd: int, out, mm, offset: int, size: int):
+    """
+    Copy size byte dari src_fd (mulai offset) ke file out tanpa buffer Python
+
+    copy_file_range (Linux, kernel-side copy) jika tersedia, fallback tulis
+    slice memoryview dari mmap archive.
+    """
+    copied = 0
+    if hasattr(os, 'copy_file_range'):
+        try:
+            while copied < size:
+                n = os.copy_file_range(src_fd, out.fileno(), size - copied, offset + copied)
+                if n == 0:
+                    break
+                copied += n
+        except OSError:
+            # Filesystem/kernel tidak mendukung (EXDEV, ENOSYS, EINVAL, ...)
+            pass
+    
+    if copied < size:
+        with memoryview(mm) as view:
+            out.seek(copied)
+            out.write(view[offset + copied:offset + size])
+
+
 class PFTParser:
     """Parser untuk file .PFT (Scene Index Table)"""
     
+    # Header 16 byte, lalu record 16 byte: nama (8), index/block (4), size (4)
+    HEADER_SIZE = 16
+    RECORD_SIZE = 16
+    SIZE_FIELD = 12
+    
     def __init__(self, filepath: str):
         self.filepath = filepath
         self.entries = []
@@ -86,6 +126,48 @@ class PFTParser:
                 f.write(entry)
 
 
+class EntryView(io.RawIOBase):
+    """File-like read-only (seekable) untuk satu entry di archive"""
+    
+    def __init__(self, archive: 'SDKArchive', name: str, offset: int, size: int):
+        super().__init__()
+        self.archive = archive
+        self.name = name
+        self.offset = offset
+        self.size = size
+        self.pos = 0
+    
+    def readable(self) -> bool:
+        return True
+    
+    def seekable(self) -> bool:
+        return True
+    
+    def tell(self) -> int:
+        return self.pos
+    
+    def seek(self, pos: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            pos += self.pos
+        elif whence == io.SEEK_END:
+            pos += self.size
+        elif whence != io.SEEK_SET:
+            raise ValueError(f"whence tidak valid: {whence}")
+        if pos < 0:
+            raise ValueError(f"Posisi negatif: {pos}")
+        self.pos = pos
+        return pos
+    
+    def readinto(self, buffer) -> int:
+        count = max(0, min(len(buffer), self.size - self.pos))
+        if not count:
+            return 0
+        data = self.archive._pread(count, self.offset + self.pos)
+        buffer[:len(data)] = data
+        self.pos += len(data)
+        return len(data)
+
+
 class SDKArchive:
     """Handler untuk file .SDK/.DSK (Archive berisi .SCF files)"""
     
@@ -96,12 +178,131 @@ class SDKArchive:
         self.archive_path = archive_path
         self.index_path = index_path or archive_path.replace('.DSK', '.PFT').replace('.SDK', '.PFT')
         self.pft = None
+        self.index = None
+        self._file = None
+        self._mmap = None
+        self._lock = threading.Lock()
+    
+    def open(self) -> 'SDKArchive':
+        """
+        Buka archive untuk random access
+        Index nama -> (block, size) dibangun sekali dari PFT
         
-    def unpack(self, output_dir: str):
+        Contoh:
+            with SDKArchive('scene.DSK').open() as sdk:
+                data = sdk.read_entry('SCN001')
+        """
+        self.pft = PFTParser(self.index_path)
+        self.index = {name: (idx, size) for name, idx, size in self.pft.read()}
+        self._file = open(self.archive_path, 'rb')
+        self._mmap = None
+        return self
+    
+    def close(self):
+        if self._mmap is not None:
+            try:
+                self._mmap.close()
+            except BufferError:
+                # Masih ada memoryview dari iter_views() yang dipakai,
+                # mmap ditutup saat view terakhir dilepas
+                pass
+            self._mmap = None
+        if self._file:
+            self._file.close()
+            self._file = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def names(self) -> List[str]:
+        """Nama semua entry (urutan PFT)"""
+        return list(self.index)
+    
+    def _locate(self, name: str) -> Tuple[int, int]:
+        """(offset byte, size) entry; nama boleh dengan atau tanpa .SCF"""
+        if self._file is None:
+            raise ValueError("Archive belum dibuka, panggil open() dulu")
+        
+        entry = self.index.get(name)
+        if entry is None and name.upper().endswith('.SCF'):
+            entry = self.index.get(name[:-4])
+        if entry is None:
+            raise KeyError(f"Entry tidak ada di {self.index_path}: {name}")
+        
+        idx, size = entry
+        return idx * self.BLOCK_SIZE, size
+    
+    def _pread(self, size: int, offset: int) -> bytes:
+        if hasattr(os, 'pread'):
+            return os.pread(self._file.fileno(), size, offset)
+        # Tanpa pread (Windows): seek + read dengan lock
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+    
+    def read_entry(self, name: str) -> bytes:
+        """Byte satu entry, tanpa membaca entry lain"""
+        offset, size = self._locate(name)
+        data = self._pread(size, offset)
+        if len(data) != size:
+            raise ValueError(f"{name} offset out of range (offset=0x{offset:08x}, size={size})")
+        return data
+    
+    def open_entry(self, name: str) -> EntryView:
+        """File-like seekable untuk satu entry (baca sesuai kebutuhan)"""
+        offset, size = self._locate(name)
+        return EntryView(self, name, offset, size)
+    
+    def iter_views(self):
+        """
+        Directory virtual: yield (name, memoryview) setiap entry (urutan PFT)
+        
+        View langsung ke mmap archive (tanpa copy, tanpa file di disk),
+        hanya valid selama archive terbuka. Copy dengan bytes(view) jika
+        data perlu disimpan setelah close().
+        """
+        if self._file is None:
+            raise ValueError("Archive belum dibuka, panggil open() dulu")
+        
+        archive_size = os.fstat(self._file.fileno()).st_size
+        if self._mmap is None and archive_size:
+            self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        view = memoryview(self._mmap) if self._mmap is not None else memoryview(b'')
+        with view:
+            for name, (idx, size) in self.index.items():
+                offset = idx * self.BLOCK_SIZE
+                if offset + size > archive_size:
+                    print(f"[!] Error: {name} offset out of range (block={idx}, offset=0x{offset:08x}, size={size}, archive_size={archive_size})")
+                    continue
+                yield name, view[offset:offset + size]
+        
+    def iter_entries(self):
+        """
+        Yield (name, data) setiap entry sesuai urutan PFT
+        Entry dibaca satu per satu lewat read_entry(), bukan seluruh archive
+        """
+        if self._file is None:
+            raise ValueError("Archive belum dibuka, panggil open() dulu")
+        
+        for name in self.names():
+            try:
+                yield name, self.read_entry(name)
+            except ValueError as e:
+                print(f"[!] Error: {e}")
+    
+    def unpack(self, output_dir: str, workers: int = None):
         """
         Extract semua .SCF files dari archive
         CRITICAL: Index field in PFT is the block number!
         Offset = index × BLOCK_SIZE
+
+        Archive tidak dibaca ke memory: setiap entry di-copy langsung dari
+        file descriptor DSK (copy_file_range, di kernel) atau dari mmap,
+        ditulis paralel oleh thread pool (maks `workers` thread).
         """
         # Baca index file
         self.pft = PFTParser(self.index_path)
@@ -111,35 +312,38 @@ class SDKArchive:
         print(f"[*] Jumlah scene: {len(entries)}")
         print(f"[*] Block size: {self.BLOCK_SIZE} bytes")
         
-        # Baca archive
-        with open(self.archive_path, 'rb') as f:
-            archive_data = f.read()
-        
-        print(f"[*] Ukuran archive: {len(archive_data)} bytes")
+        archive_size = os.path.getsize(self.archive_path)
+        print(f"[*] Ukuran archive: {archive_size} bytes")
         
         # Buat output directory
         os.makedirs(output_dir, exist_ok=True)
         
-        # Extract setiap entry
         # CRITICAL: offset = index × BLOCK_SIZE
-        extracted = 0
-        
+        jobs = []
         for name, idx, size in entries:
-            # Calculate offset using the index field as block number
             offset = idx * self.BLOCK_SIZE
+            if offset + size <= archive_size:
+                jobs.append((name, idx, offset, size))
+            else:
+                print(f"[!] Error: {name} offset out of range (block={idx}, offset=0x{offset:08x}, size={size}, archive_size={archive_size})")
+        
+        extracted = 0
+        
+        with open(self.archive_path, 'rb') as src, \
+                (mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) if archive_size else nullcontext()) as mm:
             
-            # Extract data
-            if offset + size <= len(archive_data):
-                scf_data = archive_data[offset:offset+size]
+            def extract(job):
+                name, idx, offset, size = job
                 output_path = os.path.join(output_dir, f"{name}.SCF")
-                
-                with open(output_path, 'wb') as f:
-                    f.write(scf_data)
-                
-                extracted += 1
-                print(f"[+] Extracted: {name}.SCF (block={idx}, offset=0x{offset:08x}, size={size} bytes)")
-            else:
-                print(f"[!] Error: {name} offset out of range (block={idx}, offset=0x{offset:08x}, size={size}, archive_size={len(archive_data)})")
+                with open(output_path, 'wb') as out:
+                    _copy_range(src.fileno(), out, mm, offset, size)
+                return job
+            
+            with ThreadPoolExecutor(max_workers=workers or DEFAULT_WORKERS) as pool:
+                # map() menjaga urutan PFT untuk log
+                for name, idx, offset, size in pool.map(extract, jobs):
+                    extracted += 1
+                    print(f"[+] Extracted: {name}.SCF (block={idx}, offset=0x{offset:08x}, size={size} bytes)")
         
         print(f"\n[*] Berhasil extract {extracted}/{len(entries)} files ke {output_dir}")
         return extracted
@@ -167,51 +371,52 @@ class SDKArchive:
         print(f"[*] Max block number: {max_block}")
         print(f"[*] Total blocks in archive: {total_blocks}")
         
-        # Buat archive kosong dengan ukuran penuh (all blocks)
-        archive_data = bytearray(total_blocks * self.BLOCK_SIZE)
+        archive_size = total_blocks * self.BLOCK_SIZE
         
-        # Baca semua .SCF files dan tulis ke block yang sesuai
+        # Streaming: setiap entry ditulis langsung ke posisinya di file output
+        # (seek), block yang tidak ditulis jadi sparse hole (dibaca 0x00).
+        # Memory maksimal = ukuran satu SCF, bukan seluruh archive.
         new_entries = []
         
-        for name, orig_idx, orig_size in original_entries:
-            scf_path = os.path.join(input_dir, f"{name}.SCF")
-            
-            if not os.path.exists(scf_path):
-                print(f"[!] Warning: {name}.SCF tidak ditemukan, skip...")
-                continue
-            
-            # Baca file
-            with open(scf_path, 'rb') as f:
-                scf_data = f.read()
-            
-            new_size = len(scf_data)
-            
-            # PENTING: Gunakan index original (block number) untuk menjaga kompatibilitas
-            new_entries.append((name, orig_idx, new_size))
-            
-            # CRITICAL: Write to the correct block position
-            # offset = index × BLOCK_SIZE
-            offset = orig_idx * self.BLOCK_SIZE
-            
-            # Tulis data ke archive (tanpa melampaui block boundary)
-            archive_data[offset:offset+new_size] = scf_data
-            
-            # Sisa block tetap null (0x00)
-            
-            size_diff = ""
-            if new_size != orig_size:
-                diff_val = new_size - orig_size
-                size_diff = f" (diff: {diff_val:+d})"
-            
-            print(f"[+] Packed: {name}.SCF (block={orig_idx}, offset=0x{offset:08x}, size={new_size}{size_diff})")
-        
-        # Tulis archive baru
         print(f"\n[*] Menulis archive: {output_archive}")
-        with open(output_archive, 'wb') as f:
-            f.write(archive_data)
+        with open(output_archive, 'wb') as out:
+            for name, orig_idx, orig_size in original_entries:
+                scf_path = os.path.join(input_dir, f"{name}.SCF")
+                
+                if not os.path.exists(scf_path):
+                    print(f"[!] Warning: {name}.SCF tidak ditemukan, skip...")
+                    continue
+                
+                # Baca file
+                with open(scf_path, 'rb') as f:
+                    scf_data = f.read()
+                
+                new_size = len(scf_data)
+                
+                # PENTING: Gunakan index original (block number) untuk menjaga kompatibilitas
+                new_entries.append((name, orig_idx, new_size))
+                
+                # CRITICAL: Write to the correct block position
+                # offset = index × BLOCK_SIZE
+                offset = orig_idx * self.BLOCK_SIZE
+                out.seek(offset)
+                out.write(scf_data)
+                
+                # Entry terakhir yang membesar boleh melewati total blocks
+                archive_size = max(archive_size, offset + new_size)
+                
+                size_diff = ""
+                if new_size != orig_size:
+                    diff_val = new_size - orig_size
+                    size_diff = f" (diff: {diff_val:+d})"
+                
+                print(f"[+] Packed: {name}.SCF (block={orig_idx}, offset=0x{offset:08x}, size={new_size}{size_diff})")
+            
+            # Sisa block tetap null (0x00): perpanjang file sampai ukuran final
+            out.truncate(archive_size)
         
-        print(f"[*] Ukuran archive: {len(archive_data)} bytes ({len(archive_data) // 1024}KB)")
-        print(f"[*] Total blocks: {len(archive_data) // self.BLOCK_SIZE}")
+        print(f"[*] Ukuran archive: {archive_size} bytes ({archive_size // 1024}KB)")
+        print(f"[*] Total blocks: {archive_size // self.BLOCK_SIZE}")
         
         # Tulis index baru
         print(f"[*] Menulis index: {output_index}")
@@ -223,6 +428,83 @@ class SDKArchive:
         print(f"    - Index:   {output_index}")
         
         return len(new_entries)
+    
+    def patch(self, scf_paths: List[str]) -> Tuple[int, List[str]]:
+        """
+        Patch entry yang berubah langsung di archive + PFT hasil repack
+        
+        Setiap SCF yang masih muat di block span-nya (sampai block entry
+        berikutnya) ditulis ke block itu saja, sisa ukuran lama diisi 0x00,
+        dan hanya field size record PFT-nya yang diupdate. Entry terakhir
+        boleh membesar/mengecil: file dipotong ke ukuran yang sama dengan
+        hasil repack. SCF yang sama dengan isi archive di-skip. Bagian lain
+        file tidak disentuh.
+        
+        Returns:
+            (jumlah entry yang di-patch, nama entry yang tidak muat)
+            Entry yang tidak muat tidak diubah: jalankan repack penuh.
+        """
+        self.pft = PFTParser(self.index_path)
+        entries = self.pft.read()
+        
+        print(f"[*] Membaca index: {self.index_path}")
+        print(f"[*] Jumlah scene: {len(entries)}")
+        
+        records = {name: (i, idx, size) for i, (name, idx, size) in enumerate(entries)}
+        starts = sorted({idx for _, idx, _ in entries})
+        
+        patched = 0
+        unchanged = 0
+        too_big = []
+        
+        with open(self.archive_path, 'r+b') as dsk, open(self.index_path, 'r+b') as pft:
+            for scf_path in scf_paths:
+                name = Path(scf_path).stem
+                if name not in records:
+                    print(f"[!] Warning: {name} tidak ada di {self.index_path}, skip...")
+                    continue
+                
+                i, idx, old_size = records[name]
+                offset = idx * self.BLOCK_SIZE
+                
+                with open(scf_path, 'rb') as f:
+                    scf_data = f.read()
+                new_size = len(scf_data)
+                
+                if new_size == old_size:
+                    dsk.seek(offset)
+                    if dsk.read(old_size) == scf_data:
+                        unchanged += 1
+                        continue
+                
+                # Block span: sampai block entry berikutnya (entry terakhir bebas)
+                k = bisect_right(starts, idx)
+                limit = starts[k] * self.BLOCK_SIZE if k < len(starts) else None
+                if limit is not None and offset + new_size > limit:
+                    print(f"[!] Tidak muat: {name}.SCF (size={new_size}, span={limit - offset} bytes)")
+                    too_big.append(name)
+                    continue
+                
+                dsk.seek(offset)
+                dsk.write(scf_data)
+                if limit is None:
+                    # Entry terakhir: ukuran file sama dengan repack penuh
+                    # (block terakhir penuh, atau akhir entry jika lebih besar)
+                    dsk.truncate(max(offset + new_size, (idx + 1) * self.BLOCK_SIZE))
+                elif new_size < old_size:
+                    dsk.write(bytes(old_size - new_size))
+                
+                pft.seek(PFTParser.HEADER_SIZE + i * PFTParser.RECORD_SIZE + PFTParser.SIZE_FIELD)
+                pft.write(struct.pack('<I', new_size))
+                
+                patched += 1
+                print(f"[+] Patched: {name}.SCF (block={idx}, offset=0x{offset:08x}, size={new_size} (diff: {new_size - old_size:+d}))")
+        
+        print(f"\n[*] Patch selesai! {patched} patched, {unchanged} tidak berubah, {len(too_big)} tidak muat")
+        if too_big:
+            print(f"[!] Entry yang tidak muat di block span-nya butuh repack penuh")
+        
+        return patched, too_big
 
 
 def main():
@@ -241,6 +523,14 @@ Contoh penggunaan:
   # Repack (setelah edit)
   python sdk_tools.py repack scene.DSK scene.PFT edited/ scene_new.DSK scene_new.PFT
   
+  # Ambil satu scene saja (tanpa unpack semua)
+  python sdk_tools.py get scene.DSK scene.PFT SCN001 --output SCN001.SCF
+  python sdk_tools.py get scene.DSK scene.PFT --list
+  
+  # Patch in-place archive hasil repack (hanya SCF yang berubah)
+  python sdk_tools.py patch scene_new.DSK scene_new.PFT edited/SCN001.SCF
+  python sdk_tools.py patch scene_new.DSK scene_new.PFT edited/
+  
   # Atau repack langsung replace original
   python sdk_tools.py repack scene.DSK scene.PFT edited/
 
@@ -258,6 +548,15 @@ PENTING:
     unpack_parser.add_argument('archive', help='Path ke file .DSK/.SDK')
     unpack_parser.add_argument('index', help='Path ke file .PFT')
     unpack_parser.add_argument('output', help='Output directory')
+    unpack_parser.add_argument('--workers', type=int, help=f'Jumlah thread (default: {DEFAULT_WORKERS})')
+    
+    # Get command
+    get_parser = subparsers.add_parser('get', help='Extract satu .SCF dari archive')
+    get_parser.add_argument('archive', help='Path ke file .DSK/.SDK')
+    get_parser.add_argument('index', help='Path ke file .PFT')
+    get_parser.add_argument('name', nargs='?', help='Nama scene (mis. SCN001)')
+    get_parser.add_argument('--output', help='Output file (default: <name>.SCF)')
+    get_parser.add_argument('--list', action='store_true', help='Tampilkan nama semua entry')
     
     # Repack command
     repack_parser = subparsers.add_parser('repack', help='Repack .SCF files ke archive')
@@ -267,6 +566,12 @@ PENTING:
     repack_parser.add_argument('--output-archive', help='Output archive path (default: overwrite original)')
     repack_parser.add_argument('--output-index', help='Output index path (default: overwrite original)')
     
+    # Patch command
+    patch_parser = subparsers.add_parser('patch', help='Patch in-place SCF yang berubah ke archive hasil repack')
+    patch_parser.add_argument('archive', help='Path ke file .DSK/.SDK yang di-patch')
+    patch_parser.add_argument('index', help='Path ke file .PFT yang di-patch')
+    patch_parser.add_argument('inputs', nargs='+', help='File .SCF atau directory dengan .SCF files')
+    
     args = parser.parse_args()
     
     if not args.command:
@@ -276,12 +581,38 @@ PENTING:
     try:
         if args.command == 'unpack':
             sdk = SDKArchive(args.archive, args.index)
-            sdk.unpack(args.output)
+            sdk.unpack(args.output, args.workers)
+            
+        elif args.command == 'get':
+            with SDKArchive(args.archive, args.index).open() as sdk:
+                if args.list or not args.name:
+                    for name in sdk.names():
+                        idx, size = sdk.index[name]
+                        print(f"{name}  block={idx}  size={size}")
+                else:
+                    data = sdk.read_entry(args.name)
+                    output_path = args.output or f"{Path(args.name).stem}.SCF"
+                    with open(output_path, 'wb') as f:
+                        f.write(data)
+                    print(f"[+] Extracted: {output_path} ({len(data)} bytes)")
             
         elif args.command == 'repack':
             sdk = SDKArchive(args.archive, args.index)
             sdk.repack(args.input, args.output_archive, args.output_index)
             
+        elif args.command == 'patch':
+            scf_paths = []
+            for path in args.inputs:
+                if os.path.isdir(path):
+                    scf_paths.extend(sorted(str(p) for p in Path(path).glob('*.SCF')))
+                else:
+                    scf_paths.append(path)
+            
+            sdk = SDKArchive(args.archive, args.index)
+            patched, too_big = sdk.patch(scf_paths)
+            if too_big:
+                return 2
+            
     except Exception as e:
         print(f"\n[!] Error: {e}")
         import traceback
@@ -6,6 +6,8 @@ Run script ini untuk memastikan tools working perfectly!
 
 import os
 import sys
+import json
+import struct
 import subprocess
 import hashlib
 from pathlib import Path
@@ -36,6 +38,20 @@ def run_command(cmd):
     return result.returncode == 0, result.stdout, result.stderr
 
 
+def write_scf(filepath, texts, encoding='shift_jis'):
+    """Tulis SCF sintetis: opcode dummy + satu text null-terminated per segment"""
+    with open(filepath, 'wb') as f:
+        for i, text in enumerate(texts):
+            f.write(bytes([0x10, i + 1, 0x00]))
+            f.write(text.encode(encoding) + b'\x00')
+
+
+def load_texts(json_file):
+    """Text segment dari JSON hasil extract"""
+    with open(json_file, 'r', encoding='utf-8') as f:
+        return [seg['text'] for seg in json.load(f)['text_segments']]
+
+
 def test_sdk_tools(dsk_file, pft_file):
     """Test sdk_tools.py"""
     print_test("SDK Tools - DSK Extract & Repack")
@@ -135,9 +151,564 @@ def test_scf_parser(scf_file):
     original_md5 = get_md5(scf_file)
     rebuilt_md5 = get_md5(rebuilt_file)
     
+    if original_md5 != rebuilt_md5:
+        print(f"  ❌ MD5 MISMATCH!")
+        print(f"     Original: {original_md5}")
+        print(f"     Rebuilt:  {rebuilt_md5}")
+        return False
+    
+    print(f"  ✅ MD5 MATCH! {original_md5}")
+    
+    # Sumber yang berubah setelah extract harus ditolak dengan path-nya
+    print("  4. Rejecting source changed after extract...")
+    import shutil
+    changed_file = test_dir / "changed.SCF"
+    shutil.copy(scf_file, changed_file)
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract {changed_file} {test_dir / 'changed'}"
+    )
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    with open(changed_file, 'ab') as f:
+        f.write(b'\x00')
+    
+    changed_json = test_dir / "changed" / "changed.json"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {changed_json} {test_dir / 'changed' / 'changed.txt'} "
+        f"{test_dir / 'changed_rebuilt.SCF'}"
+    )
+    
+    if success or f"berubah sejak di-parse: {changed_file.resolve()}" not in stdout:
+        print(f"  ❌ Changed source not reported: {stdout}{stderr}")
+        return False
+    
+    print(f"  ✅ Rejected: {changed_file}")
+    print(f"  ✅ SCF PARSER WORKING PERFECTLY!")
+    return True
+
+
+def test_scf_ids(scf_file):
+    """Test scf_parser_v2.py extract --ids + rebuild dari .tsv"""
+    print_test("SCF Parser - Segment ID (.tsv) Round Trip")
+    
+    test_dir = Path("test_scf")
+    test_dir.mkdir(exist_ok=True)
+    
+    # Extract
+    print("  1. Extracting SCF with --ids...")
+    parse_dir = test_dir / "parsed_ids"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract --ids {scf_file} {parse_dir}"
+    )
+    
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    json_file = parse_dir / f"{Path(scf_file).stem}.json"
+    tsv_file = parse_dir / f"{Path(scf_file).stem}.tsv"
+    
+    if not json_file.exists() or not tsv_file.exists():
+        print(f"  ❌ Output files not created")
+        return False
+    
+    print(f"  ✅ Extracted to JSON + TSV")
+    
+    # Rebuild dari .tsv yang tidak diubah
+    print("  2. Rebuilding SCF from TSV...")
+    rebuilt_file = test_dir / "rebuilt_ids.SCF"
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {json_file} {tsv_file} {rebuilt_file}"
+    )
+    
+    if not success:
+        print(f"  ❌ Rebuild failed: {stderr}")
+        return False
+    
+    print(f"  ✅ Rebuilt successfully")
+    
+    # Verify
+    print("  3. Verifying MD5...")
+    original_md5 = get_md5(scf_file)
+    rebuilt_md5 = get_md5(rebuilt_file)
+    
+    if original_md5 != rebuilt_md5:
+        print(f"  ❌ MD5 MISMATCH!")
+        print(f"     Original: {original_md5}")
+        print(f"     Rebuilt:  {rebuilt_md5}")
+        return False
+    
+    print(f"  ✅ MD5 MATCH! {original_md5}")
+    
+    # Segment berisi newline/CR/tab/backslash harus tetap satu baris .tsv
+    print("  4. Round trip with newline, CR, tab and backslash in segments...")
+    special_file = test_dir / "special.SCF"
+    write_scf(special_file, ["瞽\n來", "改行\r\nです", "選択\tはい", "円\\マーク"])
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract --ids {special_file} {parse_dir}"
+    )
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    special_tsv = parse_dir / "special.tsv"
+    with open(special_tsv, 'r', encoding='utf-8', newline='') as f:
+        rows = f.read().split('\n')[:-1]
+    
+    if len(rows) != 4:
+        print(f"  ❌ special.tsv has {len(rows)} lines for 4 segments")
+        return False
+    
+    special_rebuilt = test_dir / "special_rebuilt.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {parse_dir / 'special.json'} {special_tsv} {special_rebuilt}"
+    )
+    if not success:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    if get_md5(special_rebuilt) != get_md5(special_file):
+        print(f"  ❌ MD5 MISMATCH for special.SCF")
+        return False
+    
+    # Edit satu baris: escape \n di .tsv jadi newline di SCF
+    seg_id = rows[0].split('\t', 1)[0]
+    with open(special_tsv, 'w', encoding='utf-8') as f:
+        f.write(f"{seg_id}\t盲\\n目\n")
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {parse_dir / 'special.json'} {special_tsv} {special_rebuilt}"
+    )
+    if not success:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    with open(special_rebuilt, 'rb') as f:
+        if "盲\n目".encode('shift_jis') + b'\x00' not in f.read():
+            print(f"  ❌ Edited text with newline not written")
+            return False
+    
+    print(f"  ✅ Special characters round trip")
+    print(f"  ✅ SEGMENT ID ROUND TRIP WORKING PERFECTLY!")
+    return True
+
+
+def test_scf_fixed(scf_file):
+    """Test scf_parser_v2.py rebuild --mode fixed"""
+    print_test("SCF Parser - Fixed-Width Rebuild")
+    
+    test_dir = Path("test_scf")
+    parse_dir = test_dir / "parsed"
+    json_file = parse_dir / f"{Path(scf_file).stem}.json"
+    txt_file = parse_dir / f"{Path(scf_file).stem}.txt"
+    
+    if not json_file.exists() or not txt_file.exists():
+        print(f"  ❌ Parsed files not found (run SCF Parser test first)")
+        return False
+    
+    # Rebuild tanpa perubahan text
+    print("  1. Rebuilding SCF (fixed, unchanged text)...")
+    rebuilt_file = test_dir / "rebuilt_fixed.SCF"
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild --mode fixed {json_file} {txt_file} {rebuilt_file}"
+    )
+    
+    if not success:
+        print(f"  ❌ Rebuild failed: {stderr}")
+        return False
+    
+    original_md5 = get_md5(scf_file)
+    rebuilt_md5 = get_md5(rebuilt_file)
+    
+    if original_md5 != rebuilt_md5:
+        print(f"  ❌ MD5 MISMATCH!")
+        print(f"     Original: {original_md5}")
+        print(f"     Rebuilt:  {rebuilt_md5}")
+        return False
+    
+    print(f"  ✅ MD5 MATCH! {original_md5}")
+    
+    # Rebuild dengan text baru, ukuran file harus tetap
+    print("  2. Rebuilding SCF (fixed, translated text)...")
+    with open(txt_file, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    lines[0] = "Test"
+    
+    translated_file = test_dir / "translated.txt"
+    with open(translated_file, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    
+    fixed_file = test_dir / "fixed.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild --mode fixed {json_file} {translated_file} {fixed_file}"
+    )
+    
+    if not success:
+        print(f"  ❌ Rebuild failed: {stderr}")
+        return False
+    
+    original_size = Path(scf_file).stat().st_size
+    fixed_size = fixed_file.stat().st_size
+    
+    if get_md5(fixed_file) == original_md5:
+        print(f"  ❌ Translated text not written")
+        return False
+    
+    if original_size == fixed_size:
+        print(f"  ✅ Size unchanged: {fixed_size} bytes")
+        print(f"  ✅ FIXED-WIDTH REBUILD WORKING PERFECTLY!")
+        return True
+    else:
+        print(f"  ❌ SIZE MISMATCH!")
+        print(f"     Original: {original_size}")
+        print(f"     Fixed:    {fixed_size}")
+        return False
+
+
+def test_sdk_patch(dsk_file, pft_file, scf_file):
+    """Test sdk_tools.py patch (hasil harus sama dengan repack penuh)"""
+    print_test("SDK Tools - Patch vs Full Repack")
+    
+    import shutil
+    from sdk_tools import PFTParser
+    test_dir = Path("test_sdk")
+    fixed_file = Path("test_scf") / "fixed.SCF"
+    
+    if not fixed_file.exists():
+        print(f"  ❌ Fixed SCF not found (run Fixed-Width Rebuild test first)")
+        return False
+    
+    # Entry terakhir (block tertinggi) dipotong setengah: file archive
+    # hasil patch harus ikut mengecil seperti hasil repack
+    last_name = max(PFTParser(pft_file).read(), key=lambda entry: entry[1])[0]
+    with open(test_dir / "extracted" / f"{last_name}.SCF", 'rb') as f:
+        last_data = f.read()
+    shrunk_file = test_dir / "shrunk.SCF"
+    with open(shrunk_file, 'wb') as f:
+        f.write(last_data[:len(last_data) // 2])
+    
+    cases = [
+        ("fixed-width SCF", Path(scf_file).stem, fixed_file),
+        ("last entry shrunk", last_name, shrunk_file),
+    ]
+    
+    for step, (label, name, new_file) in enumerate(cases, 1):
+        print(f"  {step}. Patch vs repack: {label} ({name})...")
+        
+        # Directory extract dengan satu SCF yang diganti
+        modified_dir = test_dir / "modified"
+        if modified_dir.exists():
+            shutil.rmtree(modified_dir)
+        shutil.copytree(test_dir / "extracted", modified_dir)
+        shutil.copy(new_file, modified_dir / f"{name}.SCF")
+        
+        full_dsk = test_dir / "full.DSK"
+        full_pft = test_dir / "full.PFT"
+        
+        success, stdout, stderr = run_command(
+            f"python3 sdk_tools.py repack {dsk_file} {pft_file} {modified_dir} "
+            f"--output-archive {full_dsk} --output-index {full_pft}"
+        )
+        
+        if not success:
+            print(f"  ❌ Repack failed: {stderr}")
+            return False
+        
+        # Patch copy archive original dengan SCF yang sama
+        patched_dsk = test_dir / "patched.DSK"
+        patched_pft = test_dir / "patched.PFT"
+        shutil.copy(dsk_file, patched_dsk)
+        shutil.copy(pft_file, patched_pft)
+        
+        patch_file = test_dir / f"{name}.SCF"
+        shutil.copy(new_file, patch_file)
+        
+        success, stdout, stderr = run_command(
+            f"python3 sdk_tools.py patch {patched_dsk} {patched_pft} {patch_file}"
+        )
+        
+        if not success:
+            print(f"  ❌ Patch failed: {stderr}")
+            return False
+        
+        full_md5 = get_md5(full_dsk)
+        patched_md5 = get_md5(patched_dsk)
+        
+        if full_md5 != patched_md5 or get_md5(full_pft) != get_md5(patched_pft):
+            print(f"  ❌ MD5 MISMATCH!")
+            print(f"     Repack:  {full_md5} ({full_dsk.stat().st_size} bytes)")
+            print(f"     Patched: {patched_md5} ({patched_dsk.stat().st_size} bytes)")
+            return False
+        
+        print(f"  ✅ MD5 MATCH! {full_md5}")
+    
+    print(f"  ✅ SDK PATCH WORKING PERFECTLY!")
+    return True
+
+
+def test_cache(scf_file):
+    """Test batch-extract --cache-dir: run kedua hit semua, output identik"""
+    print_test("SCF Parser - Parse Cache")
+    
+    test_dir = Path("test_cache")
+    input_dir = Path(scf_file).parent
+    scf_count = len(list(input_dir.glob('*.SCF')))
+    cache_dir = test_dir / "cache"
+    
+    outputs = []
+    for run, expected in enumerate([f"0 hit, {scf_count} miss", f"{scf_count} hit, 0 miss"], 1):
+        print(f"  {run}. batch-extract --cache-dir (run {run})...")
+        output_dir = test_dir / f"run{run}"
+        success, stdout, stderr = run_command(
+            f"python3 scf_parser_v2.py batch-extract {input_dir} {output_dir} --cache-dir {cache_dir}"
+        )
+        if not success or f"Cache: {expected}" not in stdout:
+            print(f"  ❌ Expected '{expected}': {stdout[-300:]}{stderr}")
+            return False
+        print(f"  ✅ Cache: {expected}")
+        outputs.append(output_dir)
+    
+    print(f"  3. Comparing outputs...")
+    for first in sorted(outputs[0].iterdir()):
+        second = outputs[1] / first.name
+        if not second.exists() or get_md5(first) != get_md5(second):
+            print(f"  ❌ Output differs: {first.name}")
+            return False
+    
+    print(f"  ✅ {len(list(outputs[0].iterdir()))} files identical")
+    
+    print(f"  4. Rebuilding from cached parse...")
+    name = Path(scf_file).stem
+    rebuilt_file = test_dir / "rebuilt.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {outputs[1] / f'{name}.json'} "
+        f"{outputs[1] / f'{name}.txt'} {rebuilt_file}"
+    )
+    if not success or get_md5(rebuilt_file) != get_md5(scf_file):
+        print(f"  ❌ Rebuild from cached parse mismatch: {stderr}")
+        return False
+    
+    print(f"  ✅ MD5 MATCH! {get_md5(scf_file)}")
+    print(f"  ✅ PARSE CACHE WORKING PERFECTLY!")
+    return True
+
+
+def test_scf_index(scf_file):
+    """Test extract --index: rebuild dari .scfidx sama dengan dari JSON"""
+    print_test("SCF Parser - Segment Index (.scfidx)")
+    
+    test_dir = Path("test_index")
+    parse_dir = test_dir / "parsed"
+    name = Path(scf_file).stem
+    
+    print("  1. Extracting SCF with --index...")
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract {scf_file} {parse_dir} --index"
+    )
+    index_file = parse_dir / f"{name}.scfidx"
+    if not success or not index_file.exists():
+        print(f"  ❌ Extract failed: {stdout}{stderr}")
+        return False
+    
+    print(f"  ✅ {index_file.name} ({index_file.stat().st_size} bytes)")
+    
+    # Text diubah supaya rebuild benar-benar memakai batas segment dari index
+    txt_file = parse_dir / f"{name}.txt"
+    with open(txt_file, 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    lines[0] = "Teks baru dari index"
+    translated = test_dir / "translated.txt"
+    with open(translated, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines))
+    
+    cases = [
+        ("unchanged text", txt_file, scf_file),
+        ("translated text", translated, None),
+    ]
+    
+    for step, (label, txt, expected) in enumerate(cases, 2):
+        print(f"  {step}. Rebuilding from .scfidx vs JSON ({label})...")
+        from_index = test_dir / "from_index.SCF"
+        from_json = test_dir / "from_json.SCF"
+        for source, output in ((index_file, from_index), (parse_dir / f"{name}.json", from_json)):
+            success, stdout, stderr = run_command(
+                f"python3 scf_parser_v2.py rebuild {source} {txt} {output}"
+            )
+            if not success:
+                print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+                return False
+        
+        index_md5 = get_md5(from_index)
+        if index_md5 != get_md5(from_json) or (expected and index_md5 != get_md5(expected)):
+            print(f"  ❌ MD5 MISMATCH!")
+            print(f"     .scfidx: {index_md5}")
+            print(f"     JSON:    {get_md5(from_json)}")
+            return False
+        
+        print(f"  ✅ MD5 MATCH! {index_md5}")
+    
+    print(f"  ✅ SEGMENT INDEX WORKING PERFECTLY!")
+    return True
+
+
+def test_scf_stream(scf_file):
+    """Test extract --stream: TXT sama dengan extract biasa, rebuild dari JSONL"""
+    print_test("SCF Parser - Streaming Extract (JSONL)")
+    
+    test_dir = Path("test_stream")
+    name = Path(scf_file).stem
+    
+    print("  1. Extracting SCF with and without --stream...")
+    for options, output_dir in (("--stream", test_dir / "stream"), ("", test_dir / "full")):
+        success, stdout, stderr = run_command(
+            f"python3 scf_parser_v2.py extract {scf_file} {output_dir} {options}"
+        )
+        if not success:
+            print(f"  ❌ Extract failed: {stdout}{stderr}")
+            return False
+    
+    jsonl_file = test_dir / "stream" / f"{name}.jsonl"
+    stream_txt = test_dir / "stream" / f"{name}.txt"
+    if not jsonl_file.exists() or get_md5(stream_txt) != get_md5(test_dir / "full" / f"{name}.txt"):
+        print(f"  ❌ Streamed TXT differs from full extract")
+        return False
+    
+    with open(jsonl_file, 'r', encoding='utf-8') as f:
+        f.readline()  # Header
+        streamed = [json.loads(line)['text'] for line in f]
+    if streamed != load_texts(test_dir / "full" / f"{name}.json"):
+        print(f"  ❌ JSONL segments differ from JSON")
+        return False
+    
+    print(f"  ✅ {len(streamed)} segments, TXT + segments identical")
+    
+    print("  2. Rebuilding from JSONL...")
+    rebuilt_file = test_dir / "rebuilt.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {jsonl_file} {stream_txt} {rebuilt_file}"
+    )
+    if not success:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    original_md5 = get_md5(scf_file)
+    rebuilt_md5 = get_md5(rebuilt_file)
+    
     if original_md5 == rebuilt_md5:
         print(f"  ✅ MD5 MATCH! {original_md5}")
-        print(f"  ✅ SCF PARSER WORKING PERFECTLY!")
+        print(f"  ✅ STREAMING EXTRACT WORKING PERFECTLY!")
+        return True
+    else:
+        print(f"  ❌ MD5 MISMATCH!")
+        print(f"     Original: {original_md5}")
+        print(f"     Rebuilt:  {rebuilt_md5}")
+        return False
+
+
+def test_scf_inplace(scf_file):
+    """Test rebuild / rebuild-src dengan output = SCF original"""
+    print_test("SCF Parser - In-Place Rebuild")
+    
+    import shutil
+    test_dir = Path("test_scf")
+    test_dir.mkdir(exist_ok=True)
+    
+    inplace_file = test_dir / "inplace.SCF"
+    shutil.copy(scf_file, inplace_file)
+    original_md5 = get_md5(scf_file)
+    
+    print("  1. Extracting SCF...")
+    parse_dir = test_dir / "parsed_inplace"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract {inplace_file} {parse_dir}"
+    )
+    
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    json_file = parse_dir / "inplace.json"
+    txt_file = parse_dir / "inplace.txt"
+    
+    # Output sama dengan source yang tercatat di JSON / argumen SCF
+    commands = [
+        ("rebuild", f"python3 scf_parser_v2.py rebuild {json_file} {txt_file} {inplace_file}"),
+        ("rebuild-src", f"python3 scf_parser_v2.py rebuild-src {inplace_file} {txt_file} {inplace_file}"),
+    ]
+    
+    for step, (name, cmd) in enumerate(commands, 2):
+        print(f"  {step}. Running {name} in place...")
+        success, stdout, stderr = run_command(cmd)
+        
+        if not success:
+            print(f"  ❌ {name} failed: {stdout}{stderr}")
+            return False
+        
+        rebuilt_md5 = get_md5(inplace_file)
+        if rebuilt_md5 != original_md5:
+            print(f"  ❌ MD5 MISMATCH!")
+            print(f"     Original: {original_md5}")
+            print(f"     Rebuilt:  {rebuilt_md5}")
+            return False
+        
+        print(f"  ✅ MD5 MATCH! {original_md5}")
+    
+    leftovers = list(test_dir.glob("*.tmp"))
+    if leftovers:
+        print(f"  ❌ Temporary files left behind: {leftovers}")
+        return False
+    
+    print(f"  ✅ IN-PLACE REBUILD WORKING PERFECTLY!")
+    return True
+
+
+def test_scf_batch_inplace(scf_file):
+    """Test batch-rebuild --scf-dir dengan output directory = SCF original"""
+    print_test("SCF Parser - Batch Rebuild In Place")
+    
+    import shutil
+    test_dir = Path("test_scf")
+    scf_dir = test_dir / "batch_scf"
+    parse_dir = test_dir / "parsed_batch"
+    txt_dir = test_dir / "translated_batch"
+    for d in (scf_dir, txt_dir):
+        d.mkdir(parents=True, exist_ok=True)
+    
+    name = Path(scf_file).name
+    shutil.copy(scf_file, scf_dir / name)
+    original_md5 = get_md5(scf_file)
+    
+    print("  1. Extracting SCF with --index...")
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py batch-extract {scf_dir} {parse_dir} --index"
+    )
+    
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    shutil.copy(parse_dir / f"{Path(scf_file).stem}.txt", txt_dir)
+    
+    print("  2. Running batch-rebuild --scf-dir into the same directory...")
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py batch-rebuild {parse_dir} {txt_dir} {scf_dir} --scf-dir {scf_dir}"
+    )
+    
+    if not success:
+        print(f"  ❌ Batch rebuild failed: {stdout}{stderr}")
+        return False
+    
+    print("  3. Verifying MD5...")
+    rebuilt_md5 = get_md5(scf_dir / name)
+    
+    if rebuilt_md5 == original_md5:
+        print(f"  ✅ MD5 MATCH! {original_md5}")
+        print(f"  ✅ BATCH REBUILD IN PLACE WORKING PERFECTLY!")
         return True
     else:
         print(f"  ❌ MD5 MISMATCH!")
@@ -146,6 +717,493 @@ def test_scf_parser(scf_file):
         return False
 
 
+def test_search(dsk_file, pft_file, scf_file):
+    """Test scf_search.py index + search (dengan/tanpa --spec)"""
+    print_test("SCF Search - Index & Search")
+    
+    test_dir = Path("test_search")
+    parse_dir = test_dir / "parsed"
+    translated_dir = test_dir / "translated"
+    translated_dir.mkdir(parents=True, exist_ok=True)
+    db_file = test_dir / "scene.db"
+    name = Path(scf_file).stem
+    
+    success, stdout, stderr = run_command(f"python3 scf_parser_v2.py extract {scf_file} {parse_dir}")
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    texts = load_texts(parse_dir / f"{name}.json")
+    texts[0] = "Halo pencarian"
+    with open(translated_dir / f"{name}.txt", 'w', encoding='utf-8') as f:
+        f.write('\n'.join(texts))
+    
+    print("  1. Indexing DSK + translation...")
+    success, stdout, stderr = run_command(
+        f"python3 scf_search.py index {db_file} {dsk_file} {pft_file} --translated {translated_dir}"
+    )
+    if not success:
+        print(f"  ❌ Index failed: {stdout}{stderr}")
+        return False
+    
+    print("  2. Searching translation...")
+    success, stdout, stderr = run_command(
+        f"python3 scf_search.py search {db_file} pencarian --column translation"
+    )
+    if not success or f"{name} 0x" not in stdout or "→ Halo pencarian" not in stdout:
+        print(f"  ❌ Translation not found: {stdout}{stderr}")
+        return False
+    
+    print(f"  ✅ Found in {name}")
+    
+    # Spec tanpa opcode text: tidak ada segment, scene harus di-index ulang
+    print("  3. Re-indexing with --spec...")
+    spec_file = test_dir / "empty_spec.json"
+    with open(spec_file, 'w', encoding='utf-8') as f:
+        json.dump({"opcode_size": 1, "opcodes": {}}, f)
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_search.py index {db_file} {dsk_file} {pft_file} "
+        f"--translated {translated_dir} --spec {spec_file}"
+    )
+    if not success or "(0 segments), 0 tidak berubah" not in stdout:
+        print(f"  ❌ Spec not applied: {stdout}{stderr}")
+        return False
+    
+    success, stdout, stderr = run_command(f"python3 scf_search.py search {db_file} pencarian")
+    if not success or "0 hasil" not in stdout:
+        print(f"  ❌ Stale segments after --spec: {stdout}{stderr}")
+        return False
+    
+    print(f"  ✅ --spec re-indexed all scenes")
+    print(f"  ✅ SCF SEARCH WORKING PERFECTLY!")
+    return True
+
+
+def test_dedup():
+    """Test scf_dedup.py + scf_validate.py dengan string berisi newline/tab"""
+    print_test("SCF Dedup - Unique Strings Round Trip")
+    
+    import shutil
+    test_dir = Path("test_dedup")
+    scf_dir = test_dir / "scf"
+    scf_dir.mkdir(parents=True, exist_ok=True)
+    
+    scenes = {
+        "A": ["こんにちは", "瞽\n來", "選択\tはい", "さようなら"],
+        "B": ["瞽\n來", "こんにちは", "終わり"],
+    }
+    for name, texts in scenes.items():
+        write_scf(scf_dir / f"{name}.SCF", texts)
+    
+    print("  1. Building unique string table...")
+    parse_dir = test_dir / "parsed"
+    dedup_dir = test_dir / "dedup"
+    for cmd in (f"python3 scf_parser_v2.py batch-extract {scf_dir} {parse_dir} --index",
+                f"python3 scf_dedup.py build {parse_dir} {dedup_dir}"):
+        success, stdout, stderr = run_command(cmd)
+        if not success:
+            print(f"  ❌ Command failed: {cmd}\n{stdout}{stderr}")
+            return False
+    
+    with open(dedup_dir / "strings.json", 'r', encoding='utf-8') as f:
+        strings = [entry['text'] for entry in json.load(f)['strings']]
+    with open(dedup_dir / "unique.txt", 'r', encoding='utf-8') as f:
+        lines = f.read().split('\n')[:-1]
+    
+    if len(lines) != len(strings):
+        print(f"  ❌ unique.txt has {len(lines)} lines for {len(strings)} strings")
+        return False
+    
+    print(f"  ✅ {len(strings)} unique strings, one line each")
+    
+    # Translate string pertama dan string dengan tab, sisanya tetap
+    print("  2. Validating + rebuilding translation...")
+    translated_dir = test_dir / "translated"
+    translated_dir.mkdir(exist_ok=True)
+    lines[strings.index("こんにちは")] = "Halo"
+    lines[strings.index("選択\tはい")] = "Pilih\\tYa"
+    with open(translated_dir / "unique.txt", 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    
+    rebuilt_dir = test_dir / "rebuilt"
+    for cmd in (f"python3 scf_validate.py {dedup_dir} {translated_dir}",
+                f"python3 scf_dedup.py rebuild {dedup_dir} {translated_dir / 'unique.txt'} "
+                f"{scf_dir} {rebuilt_dir} --parsed-dir {parse_dir}",
+                f"python3 scf_parser_v2.py batch-extract {rebuilt_dir} {test_dir / 'check'}"):
+        success, stdout, stderr = run_command(cmd)
+        if not success:
+            print(f"  ❌ Command failed: {cmd}\n{stdout}{stderr}")
+            return False
+    
+    expected = {
+        "A": ["Halo", "瞽\n來", "Pilih\tYa", "さようなら"],
+        "B": ["瞽\n來", "Halo", "終わり"],
+    }
+    for name, texts in expected.items():
+        rebuilt = load_texts(test_dir / "check" / f"{name}.json")
+        # Text ASCII tidak lolos klasifikasi Jepang saat extract ulang
+        japanese = [text for text in texts if not text.isascii()]
+        if rebuilt != japanese:
+            print(f"  ❌ {name}: expected {japanese}, got {rebuilt}")
+            return False
+    
+    print(f"  ✅ Translations landed on the right strings")
+    
+    # Baris hilang harus ditolak, bukan menggeser translation
+    print("  3. Rejecting unique.txt with a missing line...")
+    with open(translated_dir / "unique.txt", 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines[1:]) + '\n')
+    
+    validate_ok, _, _ = run_command(f"python3 scf_validate.py {dedup_dir} {translated_dir}")
+    rebuild_ok, _, _ = run_command(
+        f"python3 scf_dedup.py rebuild {dedup_dir} {translated_dir / 'unique.txt'} "
+        f"{scf_dir} {test_dir / 'rebuilt_bad'} --parsed-dir {parse_dir}"
+    )
+    
+    if validate_ok or rebuild_ok:
+        print(f"  ❌ Missing line not detected (validate ok: {validate_ok}, rebuild ok: {rebuild_ok})")
+        return False
+    
+    print(f"  ✅ Line count mismatch rejected")
+    print(f"  ✅ DEDUP WORKING PERFECTLY!")
+    return True
+
+
+def test_codec():
+    """Test --glyph-map: code point override + glyph fallback di satu text"""
+    print_test("SCF Codec - Glyph Remap")
+    
+    test_dir = Path("test_codec")
+    test_dir.mkdir(exist_ok=True)
+    
+    scf_file = test_dir / "codec.SCF"
+    write_scf(scf_file, ["こんにちは", "さようなら"])
+    
+    # '~' ada di Shift-JIS tapi sengaja diganti code point font patch
+    glyph_map = test_dir / "glyphs.json"
+    with open(glyph_map, 'w', encoding='utf-8') as f:
+        json.dump({"code_points": {"~": "8160"}}, f)
+    
+    print("  1. Extracting SCF...")
+    parse_dir = test_dir / "parsed"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract {scf_file} {parse_dir}"
+    )
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    translated = test_dir / "translated.txt"
+    cases = [
+        ("café~", b"cafe\x81\x60"),   # override + huruf beraksen
+        ("naïve — ok", "naive ― ok".encode('shift_jis')),
+    ]
+    with open(translated, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(text for text, _ in cases) + '\n')
+    
+    print("  2. Rebuilding with --glyph-map...")
+    rebuilt = test_dir / "rebuilt.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py --glyph-map {glyph_map} rebuild "
+        f"{parse_dir / 'codec.json'} {translated} {rebuilt}"
+    )
+    if not success or "Error encoding" in stdout:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    with open(rebuilt, 'rb') as f:
+        data = f.read()
+    
+    for text, expected in cases:
+        if expected + b'\x00' not in data:
+            print(f"  ❌ {text!r} not encoded as {expected!r}")
+            return False
+        print(f"  ✅ {text!r} -> {expected!r}")
+    
+    print(f"  ✅ GLYPH REMAP WORKING PERFECTLY!")
+    return True
+
+
+def test_reloc():
+    """Test rebuild --relocate: pointer ke segment text ikut digeser"""
+    print_test("SCF Reloc - Pointer Relocation")
+    
+    test_dir = Path("test_reloc")
+    test_dir.mkdir(exist_ok=True)
+    
+    # Opcode 0x30 + pointer uint32 ke awal segment terakhir
+    texts = ["こんにちは", "さようなら", "ありがとう"]
+    data = bytearray(b'\x30' + bytes(4))
+    starts = []
+    for i, text in enumerate(texts):
+        data += bytes([0x10, i + 1, 0x00])
+        starts.append(len(data))
+        data += text.encode('shift_jis') + b'\x00'
+    struct.pack_into('<I', data, 1, starts[-1])
+    
+    scf_file = test_dir / "reloc.SCF"
+    with open(scf_file, 'wb') as f:
+        f.write(data)
+    
+    print("  1. Scanning relocation candidates...")
+    success, stdout, stderr = run_command(f"python3 scf_reloc.py {scf_file}")
+    if not success or f"0x00000001 -> 0x{starts[-1]:08x}" not in stdout:
+        print(f"  ❌ Pointer not found: {stdout}{stderr}")
+        return False
+    
+    print(f"  ✅ Pointer at 0x00000001 -> 0x{starts[-1]:08x}")
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py extract {scf_file} {test_dir / 'parsed'}"
+    )
+    if not success:
+        print(f"  ❌ Extract failed: {stderr}")
+        return False
+    
+    translated = test_dir / "translated.txt"
+    with open(translated, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(["Halo semuanya, apa kabar?"] + texts[1:]))
+    
+    print("  2. Rebuilding longer text with --relocate...")
+    rebuilt = test_dir / "rebuilt.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py rebuild {test_dir / 'parsed' / 'reloc.json'} {translated} "
+        f"{rebuilt} --relocate"
+    )
+    if not success:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    with open(rebuilt, 'rb') as f:
+        out = f.read()
+    
+    target = struct.unpack_from('<I', out, 1)[0]
+    expected = out.index("ありがとう".encode('shift_jis'))
+    
+    if target != expected or target == starts[-1]:
+        print(f"  ❌ Pointer not relocated: 0x{target:08x} (expected 0x{expected:08x})")
+        return False
+    
+    print(f"  ✅ Pointer relocated: 0x{starts[-1]:08x} -> 0x{target:08x}")
+    print(f"  ✅ SCF RELOC WORKING PERFECTLY!")
+    return True
+
+
+def test_disasm_spec():
+    """Test --spec: segment ID + relocation dari disassembler"""
+    print_test("SCF Disasm - Opcode Spec Extract & Rebuild")
+    
+    test_dir = Path("test_disasm")
+    test_dir.mkdir(exist_ok=True)
+    
+    spec_file = test_dir / "opcodes.json"
+    with open(spec_file, 'w', encoding='utf-8') as f:
+        json.dump({"opcode_size": 1, "opcodes": {
+            "0x01": {"name": "msg", "operands": ["u8", "cstr:text"]},
+            "0x10": {"name": "jump", "operands": ["u32:target"]},
+        }}, f)
+    
+    # msg(1, text) msg(2, text) jump(text kedua): text tidak diawali null
+    scf_file = test_dir / "spec.SCF"
+    data = bytearray()
+    starts = []
+    for i, text in enumerate(["こんにちは", "さようなら"]):
+        data += bytes([0x01, i + 1])
+        starts.append(len(data))
+        data += text.encode('shift_jis') + b'\x00'
+    jump_field = len(data) + 1
+    data += b'\x10' + struct.pack('<I', starts[1])
+    with open(scf_file, 'wb') as f:
+        f.write(data)
+    
+    print("  1. Indexing + extracting SCF with --spec --ids...")
+    parse_dir = test_dir / "parsed"
+    for cmd in (f"python3 scf_disasm.py index {scf_file} --spec {spec_file}",
+                f"python3 scf_parser_v2.py --spec {spec_file} extract --ids {scf_file} {parse_dir}"):
+        success, stdout, stderr = run_command(cmd)
+        if not success:
+            print(f"  ❌ Command failed: {cmd}\n{stdout}{stderr}")
+            return False
+    
+    if load_texts(parse_dir / "spec.json") != ["こんにちは", "さようなら"]:
+        print(f"  ❌ Unexpected segments: {load_texts(parse_dir / 'spec.json')}")
+        return False
+    
+    print(f"  ✅ 2 text operands extracted")
+    
+    print("  2. Rebuilding from unchanged TSV...")
+    tsv_file = parse_dir / "spec.tsv"
+    rebuilt = test_dir / "rebuilt.SCF"
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py --spec {spec_file} rebuild {parse_dir / 'spec.json'} {tsv_file} {rebuilt}"
+    )
+    if not success or "tidak ditemukan" in stdout:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    if get_md5(rebuilt) != get_md5(scf_file):
+        print(f"  ❌ MD5 MISMATCH!")
+        return False
+    
+    print(f"  ✅ MD5 MATCH! {get_md5(scf_file)}")
+    
+    # Text pertama lebih panjang: target jump harus ikut bergeser
+    print("  3. Rebuilding longer text with --relocate...")
+    with open(tsv_file, 'r', encoding='utf-8') as f:
+        seg_id = f.readline().split('\t', 1)[0]
+    with open(tsv_file, 'w', encoding='utf-8') as f:
+        f.write(f"{seg_id}\tこんにちは、世界\n")
+    
+    success, stdout, stderr = run_command(
+        f"python3 scf_parser_v2.py --spec {spec_file} rebuild {parse_dir / 'spec.json'} {tsv_file} "
+        f"{rebuilt} --relocate"
+    )
+    if not success:
+        print(f"  ❌ Rebuild failed: {stdout}{stderr}")
+        return False
+    
+    with open(rebuilt, 'rb') as f:
+        out = f.read()
+    
+    shift = len("、世界".encode('shift_jis'))
+    target = struct.unpack_from('<I', out, jump_field + shift)[0]
+    if target != starts[1] + shift or out[target:target + 2] != "さ".encode('shift_jis'):
+        print(f"  ❌ Jump target not relocated: 0x{target:x}")
+        return False
+    
+    print(f"  ✅ Jump target relocated to 0x{target:x}")
+    print(f"  ✅ OPCODE SPEC WORKING PERFECTLY!")
+    return True
+
+
+def test_validate():
+    """Test scf_validate.py: encode, count, length dan exit code"""
+    print_test("SCF Validate - Pre-flight Check")
+    
+    test_dir = Path("test_validate")
+    parse_dir = test_dir / "parsed"
+    translated_dir = test_dir / "translated"
+    translated_dir.mkdir(parents=True, exist_ok=True)
+    
+    scenes = {"A": ["こんにちは", "さようなら", "はい"], "B": ["おはよう", "またね"]}
+    for name, texts in scenes.items():
+        write_scf(test_dir / f"{name}.SCF", texts)
+        success, stdout, stderr = run_command(
+            f"python3 scf_parser_v2.py extract {test_dir / f'{name}.SCF'} {parse_dir}"
+        )
+        if not success:
+            print(f"  ❌ Extract failed: {stderr}")
+            return False
+    
+    def write_translation(name, lines):
+        with open(translated_dir / f"{name}.txt", 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines))
+    
+    def validate(options=""):
+        report_file = test_dir / "report.json"
+        result = subprocess.run(
+            f"python3 scf_validate.py {parse_dir} {translated_dir} --report {report_file} {options}",
+            shell=True, capture_output=True, text=True
+        )
+        with open(report_file, 'r', encoding='utf-8') as f:
+            issues = json.load(f)['issues']
+        found = {(i['scene'], i['line'], i['check'], i['severity']) for i in issues}
+        return result.returncode, found
+    
+    # Baris 2 lebih panjang, baris 3 tidak bisa di-encode, B kurang satu baris
+    write_translation("A", ["Halo", "Selamat tinggal semuanya", "Ya 😀"])
+    write_translation("B", ["Pagi"])
+    
+    cases = [
+        ("default", "", {("A", 2, 'length', 'warning'), ("A", 3, 'encode', 'error'),
+                         ("B", None, 'count', 'error')}),
+        ("--fixed", "--fixed", {("A", 2, 'length', 'error'), ("A", 3, 'encode', 'error'),
+                                ("B", None, 'count', 'error')}),
+    ]
+    
+    for step, (label, options, expected) in enumerate(cases, 1):
+        print(f"  {step}. Validating broken translation ({label})...")
+        code, found = validate(options)
+        if code != 1 or found != expected:
+            print(f"  ❌ Unexpected result: exit {code}, {sorted(found, key=str)}")
+            return False
+        print(f"  ✅ exit 1, {len(found)} issues as expected")
+    
+    print(f"  {len(cases) + 1}. Validating fixed translation...")
+    write_translation("A", ["Halo", "Dah", "Ya"])
+    write_translation("B", ["Pagi", "Sampai jumpa"])
+    code, found = validate()
+    if code != 0 or any(severity == 'error' for *_, severity in found):
+        print(f"  ❌ Unexpected result: exit {code}, {sorted(found, key=str)}")
+        return False
+    
+    print(f"  ✅ exit 0, {len(found)} warnings")
+    print(f"  ✅ SCF VALIDATE WORKING PERFECTLY!")
+    return True
+
+
+def test_tm():
+    """Test scf_tm.py learn + fill (exact dan fuzzy)"""
+    print_test("SCF TM - Learn & Fill")
+    
+    test_dir = Path("test_tm")
+    original_dir = test_dir / "original"
+    translated_dir = test_dir / "translated"
+    for d in (original_dir, translated_dir):
+        d.mkdir(parents=True, exist_ok=True)
+    
+    def write_lines(path, lines):
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+    
+    def read_lines(path):
+        with open(path, 'r', encoding='utf-8') as f:
+            return f.read().split('\n')[:-1]
+    
+    write_lines(original_dir / "A.txt", ["今日はいい天気ですね。", "彼女は静かに笑った。", "ＣＧモード"])
+    write_lines(translated_dir / "A.txt", ["Cuacanya bagus hari ini.", "Dia tersenyum\tpelan.", "ＣＧモード"])
+    
+    print("  1. Learning translated scene...")
+    memory = test_dir / "memory.tsv"
+    success, stdout, stderr = run_command(f"python3 scf_tm.py learn {memory} {original_dir} {translated_dir}")
+    if not success:
+        print(f"  ❌ Learn failed: {stdout}{stderr}")
+        return False
+    
+    # Baris yang tidak ditranslate tidak masuk memory
+    if len(read_lines(memory)) != 2:
+        print(f"  ❌ Expected 2 pairs in memory, got {read_lines(memory)}")
+        return False
+    
+    print(f"  ✅ 2 pairs learned")
+    
+    print("  2. Filling new scene...")
+    new_lines = ["彼女は静かに笑った。", "今日はいい天気だね。", "さようなら"]
+    write_lines(original_dir / "B.txt", new_lines)
+    write_lines(translated_dir / "B.txt", new_lines)
+    success, stdout, stderr = run_command(f"python3 scf_tm.py fill {memory} {original_dir} {translated_dir}")
+    if not success:
+        print(f"  ❌ Fill failed: {stdout}{stderr}")
+        return False
+    
+    filled = read_lines(translated_dir / "B.txt")
+    if filled != ["Dia tersenyum\tpelan.", "今日はいい天気だね。", "さようなら"]:
+        print(f"  ❌ Unexpected fill result: {filled}")
+        return False
+    
+    print(f"  ✅ Exact match filled")
+    
+    suggest = translated_dir / "B.suggest.tsv"
+    if not suggest.exists() or not read_lines(suggest)[0].startswith("2\t"):
+        print(f"  ❌ Fuzzy suggestion for line 2 missing")
+        return False
+    
+    print(f"  ✅ Fuzzy suggestion: {read_lines(suggest)[0]}")
+    print(f"  ✅ TRANSLATION MEMORY WORKING PERFECTLY!")
+    return True
+
+
 def test_workflow(dsk_file, pft_file):
     """Test workflow.py"""
     print_test("Workflow - Full Pipeline")
@@ -191,6 +1249,14 @@ def test_workflow(dsk_file, pft_file):
     
     print(f"  ✅ {len(txt_files)} TXT files ready for translation")
     
+    # Rebuild memakai batas segment yang sama dengan TXT
+    idx_files = list((workspace / "parsed").glob("*.scfidx"))
+    if len(idx_files) != len(txt_files):
+        print(f"  ❌ Expected {len(txt_files)} .scfidx files, found {len(idx_files)}")
+        return False
+    
+    print(f"  ✅ {len(idx_files)} .scfidx files for rebuild")
+    
     print("  2. Running rebuild...")
     success, stdout, stderr = run_command(
         f"python3 workflow.py rebuild {dsk_file} {pft_file} --workspace {workspace}"
@@ -229,7 +1295,7 @@ def test_workflow(dsk_file, pft_file):
 def cleanup():
     """Cleanup test directories"""
     import shutil
-    for d in ["test_sdk", "test_scf", "test_workflow"]:
+    for d in ["test_sdk", "test_scf", "test_dedup", "test_codec", "test_reloc", "test_disasm", "test_validate", "test_tm", "test_search", "test_cache", "test_index", "test_stream", "test_workflow"]:
         if Path(d).exists():
             shutil.rmtree(d)
 
@@ -282,16 +1348,39 @@ def main():
     # Test 1: SDK Tools
     results.append(("SDK Tools", test_sdk_tools(dsk_file, pft_file)))
     
-    # Test 2: SCF Parser
+    # Test 2: SCF Parser (+ segment ID, rebuild in place)
     # Use first extracted SCF for testing
     scf_file = "test_sdk/extracted/SCN003.SCF"
+    scf_tests = [
+        ("SCF Parser", lambda: test_scf_parser(scf_file)),
+        ("SCF Segment IDs", lambda: test_scf_ids(scf_file)),
+        ("SCF Fixed-Width", lambda: test_scf_fixed(scf_file)),
+        ("SCF Segment Index", lambda: test_scf_index(scf_file)),
+        ("SCF Streaming Extract", lambda: test_scf_stream(scf_file)),
+        ("SDK Patch", lambda: test_sdk_patch(dsk_file, pft_file, scf_file)),
+        ("SCF In-Place Rebuild", lambda: test_scf_inplace(scf_file)),
+        ("SCF Batch Rebuild In Place", lambda: test_scf_batch_inplace(scf_file)),
+        ("SCF Parse Cache", lambda: test_cache(scf_file)),
+        ("SCF Search", lambda: test_search(dsk_file, pft_file, scf_file)),
+    ]
+    
     if Path(scf_file).exists():
-        results.append(("SCF Parser", test_scf_parser(scf_file)))
+        for name, test in scf_tests:
+            results.append((name, test()))
     else:
         print("\n⚠️  Warning: Cannot test SCF Parser (no SCF file)")
-        results.append(("SCF Parser", None))
+        for name, _ in scf_tests:
+            results.append((name, None))
+    
+    # Test 3: Stage lain dengan SCF sintetis
+    results.append(("SCF Dedup", test_dedup()))
+    results.append(("SCF Codec", test_codec()))
+    results.append(("SCF Reloc", test_reloc()))
+    results.append(("SCF Disasm Spec", test_disasm_spec()))
+    results.append(("SCF Validate", test_validate()))
+    results.append(("SCF TM", test_tm()))
     
-    # Test 3: Workflow
+    # Test 4: Workflow
     results.append(("Workflow", test_workflow(dsk_file, pft_file)))
     
     # Summary
@@ -6,7 +6,7 @@ Workflow:
 1. Extract scene.DSK → SCF files
 2. Parse SCF files → JSON + TXT (untuk translate)
 3. Edit TXT files dengan translation
-4. Rebuild SCF files dari JSON + TXT
+4. Rebuild SCF files dari SCF original + TXT
 5. Repack SCF files → scene.DSK baru
 
 All-in-one solution!
@@ -55,12 +55,18 @@ def run_command(cmd):
 class TranslationWorkflow:
     """Main workflow manager"""
     
-    def __init__(self, workspace="translation_workspace"):
+    def __init__(self, workspace="translation_workspace", spec=None):
         self.workspace = Path(workspace)
+        # Spec opcode (scf_disasm.py) untuk extract + rebuild, None = heuristic
+        self.spec = spec
+        self.parser_cmd = "python3 scf_parser_v2.py" + (f" --spec {spec}" if spec else "")
         self.extracted_dir = self.workspace / "extracted_scf"
         self.parsed_dir = self.workspace / "parsed"
         self.translated_dir = self.workspace / "translated"
         self.rebuilt_dir = self.workspace / "rebuilt_scf"
+        self.cache_dir = self.workspace / "cache"
+        self.dedup_dir = self.workspace / "dedup"
+        self.memory_file = self.workspace / "memory.tsv"
         
     def setup_workspace(self):
         """Create workspace directories"""
@@ -80,18 +86,28 @@ class TranslationWorkflow:
         
         print("\n📁 Workspace structure:")
         print(f"   {self.workspace}/")
-        print(f"   ├── extracted_scf/    (SCF files dari DSK)")
+        print(f"   ├── extracted_scf/    (SCF files dari DSK, hanya dengan --unpack)")
         print(f"   ├── parsed/           (JSON + TXT untuk translate)")
         print(f"   ├── translated/       (TXT yang sudah ditranslate)")
         print(f"   └── rebuilt_scf/      (SCF files hasil rebuild)")
     
-    def extract_dsk(self, dsk_file, pft_file):
-        """Extract DSK archive"""
+    def extract_dsk(self, dsk_file, pft_file, unpack=False):
+        """
+        Extract DSK archive
+        
+        Default SCF tidak ditulis ke disk: parse_scf_files membaca entry
+        langsung dari DSK (mmap). unpack=True: extract ke extracted_scf/.
+        """
         print_step(1, "Extract DSK Archive")
         
         if not check_files(dsk_file, pft_file):
             return False
         
+        if not unpack:
+            print(f"📦 Archive dibaca langsung saat parse: {dsk_file}")
+            print(f"   (tanpa extract SCF ke disk, pakai --unpack untuk extracted_scf/)")
+            return True
+        
         print(f"📦 Extracting: {dsk_file}")
         cmd = f"python3 sdk_tools.py unpack {dsk_file} {pft_file} {self.extracted_dir}"
         
@@ -102,36 +118,63 @@ class TranslationWorkflow:
         print(f"✅ Extracted {len(scf_files)} SCF files to: {self.extracted_dir}")
         return True
     
-    def parse_scf_files(self):
-        """Parse all SCF files"""
-        print_step(2, "Parse SCF Files untuk Translation")
-        
-        scf_files = list(self.extracted_dir.glob('*.SCF'))
-        if not scf_files:
-            print("❌ Error: Tidak ada file SCF ditemukan")
-            return False
+    def parse_scf_files(self, dedup=False, archive=None):
+        """
+        Parse all SCF files
         
-        print(f"📋 Processing {len(scf_files)} files...")
+        dedup=True: juga build tabel string unik lintas scene (scf_dedup.py)
+        archive: (dsk, pft) untuk parse entry langsung dari DSK, tanpa
+        extracted_scf/
+        """
+        print_step(2, "Parse SCF Files untuk Translation")
         
-        cmd = f"python3 scf_parser.py batch-extract {self.extracted_dir} {self.parsed_dir}"
+        # Cache parse: SCF yang tidak berubah sejak run sebelumnya tidak di-parse ulang.
+        # .scfidx dipakai saat rebuild, jadi batas segment sama persis dengan TXT
+        if archive:
+            dsk_file, pft_file = archive
+            print(f"📋 Processing entries dari {dsk_file}...")
+            cmd = f"{self.parser_cmd} batch-extract-dsk {dsk_file} {pft_file} {self.parsed_dir} --index --cache-dir {self.cache_dir}"
+        else:
+            scf_files = list(self.extracted_dir.glob('*.SCF'))
+            if not scf_files:
+                print("❌ Error: Tidak ada file SCF ditemukan")
+                return False
+            
+            print(f"📋 Processing {len(scf_files)} files...")
+            cmd = f"{self.parser_cmd} batch-extract {self.extracted_dir} {self.parsed_dir} --index --cache-dir {self.cache_dir}"
         if not run_command(cmd):
             return False
         
         txt_files = list(self.parsed_dir.glob('*.txt'))
         print(f"\n✅ Parsed {len(txt_files)} files")
+        
+        if dedup:
+            cmd = f"python3 scf_dedup.py build {self.parsed_dir} {self.dedup_dir}"
+            if not run_command(cmd):
+                return False
+            print(f"✅ Tabel string unik: {self.dedup_dir}")
+
         print(f"📁 Output: {self.parsed_dir}")
         print(f"\n💡 Files yang dibuat:")
         print(f"   - *.json : Binary structure (JANGAN EDIT!)")
+        print(f"   - *.scfidx : Batas segment untuk rebuild (JANGAN EDIT!)")
         print(f"   - *.txt  : Text untuk translate")
         
         return True
     
-    def prepare_for_translation(self):
-        """Copy TXT files to translation folder"""
+    def prepare_for_translation(self, dedup=False):
+        """
+        Copy TXT files to translation folder
+        
+        dedup=True: hanya copy unique.txt (setiap string unik sekali)
+        """
         print_step(3, "Prepare Files untuk Translation")
         
-        txt_files = list(self.parsed_dir.glob('*.txt'))
-        if not txt_files:
+        if dedup:
+            txt_files = [self.dedup_dir / "unique.txt"]
+        else:
+            txt_files = list(self.parsed_dir.glob('*.txt'))
+        if not txt_files or not all(f.exists() for f in txt_files):
             print("❌ Error: Tidak ada file TXT ditemukan")
             return False
         
@@ -142,6 +185,15 @@ class TranslationWorkflow:
             shutil.copy2(txt_file, dst)
         
         print(f"✅ Files copied to: {self.translated_dir}")
+        
+        # Pre-fill dari translation memory hasil rebuild sebelumnya
+        if self.memory_file.exists():
+            original_dir = self.dedup_dir if dedup else self.parsed_dir
+            cmd = f"python3 scf_tm.py fill {self.memory_file} {original_dir} {self.translated_dir}"
+            if run_command(cmd):
+                print(f"📚 Pre-filled dari translation memory: {self.memory_file}")
+                print(f"   Saran fuzzy: *.suggest.tsv")
+        
         print(f"\n🌍 SEKARANG WAKTUNYA TRANSLATE!")
         print(f"   1. Buka folder: {self.translated_dir}")
         print(f"   2. Edit file *.txt dengan translation")
@@ -150,41 +202,118 @@ class TranslationWorkflow:
         
         return True
     
-    def rebuild_scf_files(self):
-        """Rebuild SCF files from JSON + translated TXT"""
+    def validate_translation(self):
+        """Pre-flight check translation (encode, null byte, panjang byte)"""
+        print_step("3b", "Validate Translation")
+        
+        import subprocess
+        
+        original_dir = self.parsed_dir
+        if (self.translated_dir / "unique.txt").exists():
+            original_dir = self.dedup_dir
+        
+        report = self.workspace / "validate.json"
+        cmd = f"python3 scf_validate.py {original_dir} {self.translated_dir} --report {report}"
+        result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+        print(result.stdout.rstrip())
+        
+        if result.returncode == 2:
+            print(f"❌ Error running command:")
+            print(f"   {cmd}")
+            print(f"   {result.stderr}")
+        
+        return result.returncode == 0
+    
+    def rebuild_scf_files(self, from_source=True, relocate=False, archive=None):
+        """
+        Rebuild SCF files dari translated TXT
+        
+        Default: langsung dari SCF original di extracted_scf/ (atau dari
+        archive (dsk, pft) jika extracted_scf/ kosong) + .scfidx jika ada,
+        tanpa load JSON. from_source=False: rebuild dari JSON di parsed/.
+        Jika translated/unique.txt ada (extract --dedup), rebuild lewat tabel
+        string unik. relocate=True: patch pointer ke segment text yang bergeser.
+        """
         print_step(4, "Rebuild SCF Files")
         
+        unique_txt = self.translated_dir / "unique.txt"
+        if unique_txt.exists() and (self.dedup_dir / "strings.json").exists():
+            return self.rebuild_dedup(unique_txt, relocate, archive)
+        
+        scf_files = list(self.extracted_dir.glob('*.SCF'))
         json_files = list(self.parsed_dir.glob('*.json'))
-        if not json_files:
-            print("❌ Error: Tidak ada file JSON ditemukan")
+        
+        # Extract tanpa --unpack: SCF original dibaca langsung dari archive
+        use_archive = bool(from_source and not scf_files and archive)
+        
+        if from_source and not scf_files and not use_archive:
+            print("⚠️  Warning: SCF original tidak ditemukan, rebuild dari JSON")
+            from_source = False
+        
+        sources = scf_files if from_source and not use_archive else json_files
+        if not sources:
+            print("❌ Error: Tidak ada file SCF/JSON ditemukan")
             return False
         
-        print(f"🔨 Rebuilding {len(json_files)} files...")
+        print(f"🔨 Rebuilding {len(sources)} files...")
         
-        rebuilt_count = 0
-        for json_file in json_files:
-            base_name = json_file.stem
-            txt_file = self.translated_dir / f"{base_name}.txt"
-            output_file = self.rebuilt_dir / f"{base_name}.SCF"
-            
-            # Check if translation exists
-            if not txt_file.exists():
-                print(f"⚠️  Warning: {txt_file.name} tidak ditemukan, skip...")
-                continue
-            
-            cmd = f"python3 scf_parser.py rebuild {json_file} {txt_file} {output_file}"
-            if run_command(cmd):
-                rebuilt_count += 1
-            else:
-                print(f"❌ Failed to rebuild: {base_name}")
+        cmd = f"{self.parser_cmd} batch-rebuild {self.parsed_dir} {self.translated_dir} {self.rebuilt_dir}"
+        if use_archive:
+            cmd += f" --archive {archive[0]} {archive[1]}"
+        elif from_source:
+            cmd += f" --scf-dir {self.extracted_dir}"
+        if relocate:
+            cmd += " --relocate"
         
-        print(f"\n✅ Rebuilt {rebuilt_count}/{len(json_files)} files")
+        if not run_command(cmd):
+            print(f"❌ Failed to rebuild")
+            return False
+        
+        rebuilt_count = len(list(self.rebuilt_dir.glob('*.SCF')))
+        print(f"\n✅ Rebuilt {rebuilt_count}/{len(sources)} files")
         print(f"📁 Output: {self.rebuilt_dir}")
         
         return rebuilt_count > 0
     
-    def repack_dsk(self, original_dsk, original_pft, output_dsk=None, output_pft=None):
-        """Repack DSK archive"""
+    def rebuild_dedup(self, unique_txt, relocate=False, archive=None):
+        """Rebuild semua SCF dari unique.txt + tabel string unik"""
+        print(f"🔨 Rebuilding dari {unique_txt.name} (tabel string unik)...")
+        
+        cmd = (f"python3 scf_dedup.py rebuild {self.dedup_dir} {unique_txt} "
+               f"{self.extracted_dir} {self.rebuilt_dir} --parsed-dir {self.parsed_dir}")
+        if archive and not list(self.extracted_dir.glob('*.SCF')):
+            cmd += f" --archive {archive[0]} {archive[1]}"
+        if self.spec:
+            cmd += f" --spec {self.spec}"
+        if relocate:
+            cmd += " --relocate"
+        if not run_command(cmd):
+            print(f"❌ Failed to rebuild")
+            return False
+        
+        rebuilt_count = len(list(self.rebuilt_dir.glob('*.SCF')))
+        print(f"\n✅ Rebuilt {rebuilt_count} files")
+        print(f"📁 Output: {self.rebuilt_dir}")
+        
+        return rebuilt_count > 0
+    
+    def update_memory(self):
+        """Simpan translation di translated/ ke translation memory"""
+        original_dir = self.parsed_dir
+        if (self.translated_dir / "unique.txt").exists():
+            original_dir = self.dedup_dir
+        
+        cmd = f"python3 scf_tm.py learn {self.memory_file} {original_dir} {self.translated_dir}"
+        if run_command(cmd):
+            print(f"📚 Translation memory updated: {self.memory_file}")
+    
+    def repack_dsk(self, original_dsk, original_pft, output_dsk=None, output_pft=None, patch=False):
+        """
+        Repack DSK archive
+        
+        patch=True: jika output DSK/PFT sudah ada, patch in-place hanya SCF
+        yang berubah (sdk_tools.py patch); repack penuh jika ada yang tidak muat.
+        """
         print_step(5, "Repack DSK Archive")
         
         if not check_files(original_dsk, original_pft):
@@ -196,6 +325,27 @@ class TranslationWorkflow:
         if not output_pft:
             output_pft = self.workspace / "scene_translated.PFT"
         
+        if patch and Path(output_dsk).exists() and Path(output_pft).exists():
+            import subprocess
+            
+            print(f"🩹 Patching in-place: {output_dsk}")
+            cmd = f"python3 sdk_tools.py patch {output_dsk} {output_pft} {self.rebuilt_dir}"
+            result = subprocess.run(cmd, shell=True, capture_output=True, text=True)
+            
+            if result.returncode == 0:
+                print(result.stdout.strip().splitlines()[-1])
+                print(f"\n✅ Patch complete!")
+                print(f"📁 Output files:")
+                print(f"   - {output_dsk}")
+                print(f"   - {output_pft}")
+                return True
+            
+            if result.returncode == 2:
+                print(f"⚠️  Warning: Ada SCF yang tidak muat di block span-nya, repack penuh")
+            else:
+                print(f"⚠️  Warning: Patch gagal, repack penuh")
+                print(f"   {result.stderr}")
+        
         print(f"📦 Repacking to: {output_dsk}")
         
         cmd = f"python3 sdk_tools.py repack {original_dsk} {original_pft} {self.rebuilt_dir} --output-archive {output_dsk} --output-index {output_pft}"
@@ -241,13 +391,16 @@ WORKFLOW LENGKAP:
 
 2. TRANSLATE - Edit file TXT di folder translated/
 
-3. REBUILD - Rebuild SCF dan repack DSK:
+3. VALIDATE - Cek translation sebelum rebuild (optional, juga otomatis saat rebuild):
+   python workflow.py validate scene.DSK scene.PFT
+
+4. REBUILD - Rebuild SCF dan repack DSK:
    python workflow.py rebuild scene.DSK scene.PFT
 
-4. VERIFY - Verify hasil (optional):
+5. VERIFY - Verify hasil (optional):
    python workflow.py verify scene_translated.DSK scene_translated.PFT
 
-5. Test di game!
+6. Test di game!
 
 QUICK START:
    python workflow.py quick scene.DSK scene.PFT
@@ -255,27 +408,42 @@ QUICK START:
         """
     )
     
-    parser.add_argument('command', choices=['extract', 'rebuild', 'verify', 'quick'],
+    parser.add_argument('command', choices=['extract', 'validate', 'rebuild', 'verify', 'quick'],
                        help='Command to run')
     parser.add_argument('dsk', help='DSK file path')
     parser.add_argument('pft', help='PFT file path')
     parser.add_argument('--workspace', default='translation_workspace',
                        help='Workspace directory (default: translation_workspace)')
+    parser.add_argument('--from-json', action='store_true',
+                       help='Rebuild dari JSON di parsed/ (default: dari SCF original)')
+    parser.add_argument('--relocate', action='store_true',
+                       help='Rebuild: patch pointer uint32 ke segment text yang bergeser (scf_reloc.py)')
+    parser.add_argument('--skip-validate', action='store_true',
+                       help='Rebuild walaupun validasi translation menemukan error')
+    parser.add_argument('--dedup', action='store_true',
+                       help='Extract: translate string unik lintas scene (translated/unique.txt)')
+    parser.add_argument('--patch', action='store_true',
+                       help='Rebuild: patch in-place DSK hasil rebuild sebelumnya (hanya SCF yang berubah)')
+    parser.add_argument('--spec',
+                       help='Spec opcode JSON (scf_disasm.py): text + pointer dari disassembler')
+    parser.add_argument('--unpack', action='store_true',
+                       help='Extract: tulis SCF ke extracted_scf/ (default: parse langsung dari DSK)')
     
     args = parser.parse_args()
     
     print_header("Shuumatsu no Sugoshikata - Translation Workflow")
     
-    wf = TranslationWorkflow(workspace=args.workspace)
+    wf = TranslationWorkflow(workspace=args.workspace, spec=args.spec)
     
     try:
         if args.command == 'extract' or args.command == 'quick':
             wf.setup_workspace()
-            if not wf.extract_dsk(args.dsk, args.pft):
+            if not wf.extract_dsk(args.dsk, args.pft, unpack=args.unpack):
                 return 1
-            if not wf.parse_scf_files():
+            archive = None if args.unpack else (args.dsk, args.pft)
+            if not wf.parse_scf_files(dedup=args.dedup, archive=archive):
                 return 1
-            if not wf.prepare_for_translation():
+            if not wf.prepare_for_translation(dedup=args.dedup):
                 return 1
             
             print_header("EXTRACT SELESAI!")
@@ -285,10 +453,24 @@ QUICK START:
             print("   3. Save dengan UTF-8 encoding")
             print(f"   4. Run: python workflow.py rebuild {args.dsk} {args.pft}")
             
+        elif args.command == 'validate':
+            if not wf.validate_translation():
+                return 1
+            
+            print_header("VALIDATE SELESAI!")
+            
         elif args.command == 'rebuild':
-            if not wf.rebuild_scf_files():
+            if not wf.validate_translation():
+                if not args.skip_validate:
+                    print(f"\n❌ Translation punya error, perbaiki dulu (lihat {wf.workspace}/validate.json)")
+                    print(f"   atau jalankan ulang dengan --skip-validate")
+                    return 1
+                print(f"\n⚠️  Warning: Lanjut rebuild walaupun ada error (--skip-validate)")
+            if not wf.rebuild_scf_files(from_source=not args.from_json, relocate=args.relocate,
+                                        archive=(args.dsk, args.pft)):
                 return 1
-            if not wf.repack_dsk(args.dsk, args.pft):
+            wf.update_memory()
+            if not wf.repack_dsk(args.dsk, args.pft, patch=args.patch):
                 return 1
             
             print_header("REBUILD SELESAI!")